@@ -0,0 +1,62 @@
+"""
+Throughput benchmark for parsing ingredient sentences.
+
+Parses the ingredient lines of a batch of synthetic recipes one sentence at a
+time, as converting recipes used to, and then with
+`IngredientCache.parse_many` against an empty cache, and reports sentences
+per second for each.
+
+Usage:
+    uv run python -m benchmarks.ingredients [--sentences 5000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from ingredient_parser import parse_ingredient
+
+from benchmarks.synthetic import ingredient_sentences
+from sous.ingredient_cache import DEFAULT_BATCH_SIZE, IngredientCache
+
+
+def per_sentence(sentences: list[str]) -> float:
+    start = time.perf_counter()
+    for sentence in sentences:
+        parse_ingredient(sentence)
+    return time.perf_counter() - start
+
+
+def batched(sentences: list[str], batch_size: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        cache = IngredientCache(os.path.join(directory, "ingredients.sqlite3"))
+        start = time.perf_counter()
+        cache.parse_many(sentences, batch_size=batch_size)
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sentences", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    sentences = ingredient_sentences(args.sentences)
+    print(f"{len(sentences)} sentences, {len(set(sentences))} distinct")
+
+    # Load the parser's model up front, so neither run pays for it.
+    parse_ingredient(sentences[0])
+
+    results = {
+        "per sentence": per_sentence(sentences),
+        "batched": batched(sentences, args.batch_size),
+    }
+    for label, elapsed in results.items():
+        print(f"{label:>12}: {len(sentences) / elapsed:10.0f} sentences/s")
+
+    print(f"Batching is {results['per sentence'] / results['batched']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
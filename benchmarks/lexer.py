@@ -0,0 +1,103 @@
+"""
+Worst-case benchmark for the single-pass line lexer.
+
+Times `Lexer.parse_line` against the original regex cascade on pathological
+lines of doubling length and exits non-zero if the lexer stops scaling
+linearly.
+
+Usage:
+    uv run python -m benchmarks.lexer
+"""
+
+import sys
+import time
+from collections.abc import Callable
+from itertools import pairwise
+
+from sous.attribute import Attribute
+from sous.comment import Comment
+from sous.header import Header
+from sous.ingredient import Ingredient
+from sous.lexer import Lexer, Node
+from sous.prose import Prose
+
+SIZES = [2_000, 4_000, 8_000, 16_000]
+
+# Doubling the input should roughly double the time. Allow generous headroom
+# for timer noise before calling it super-linear.
+MAX_GROWTH_PER_DOUBLING = 3.0
+
+PATHOLOGICAL_LINES: dict[str, Callable[[int], str]] = {
+    "open braces": lambda n: "{" * n,
+    "open brackets": lambda n: "x" + "[" * n,
+    "unterminated inline definitions": lambda n: "x" + "{}[" * (n // 3),
+    "braces then brackets": lambda n: "x" + "{" * (n // 2) + "}" + "[" * (n // 2),
+    "block definition without id": lambda n: "{}" + "[" * n,
+    "header without space": lambda n: "#" * n,
+    "attribute without value": lambda n: "@" + "a" * n,
+}
+
+
+def parse_with_regexes(line: str) -> Node:
+    header = Header.RE.match(line)
+    if header:
+        return Header(len(header.group("level")), header.group("name"))
+
+    attribute = Attribute.RE.match(line)
+    if attribute:
+        return Attribute(attribute.group("name"), attribute.group("value"))
+
+    comment = Comment.RE.match(line)
+    if comment:
+        return Comment(comment.group("comment"))
+
+    block_ingredient_def = Ingredient.parse_block_definition(line)
+    if block_ingredient_def:
+        return block_ingredient_def
+
+    return Prose(line, Ingredient.parse_inline_definitions(line))
+
+
+def measure(parse: Callable[[str], Node], line: str) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        parse(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    failures: list[str] = []
+
+    for name, make_line in PATHOLOGICAL_LINES.items():
+        print(f"{name}:")
+
+        lexer_times: list[float] = []
+        for size in SIZES:
+            line = make_line(size)
+            lexer_time = measure(Lexer.parse_line, line)
+            regex_time = measure(parse_with_regexes, line)
+            lexer_times.append(lexer_time)
+            print(
+                f"  {size:>7} chars  lexer {lexer_time * 1000:9.3f} ms"
+                f"  regex {regex_time * 1000:9.3f} ms"
+            )
+
+        for previous, current in pairwise(lexer_times):
+            # Ignore timings that are too small to measure reliably.
+            if current > 1e-4 and current / max(previous, 1e-6) > (
+                MAX_GROWTH_PER_DOUBLING
+            ):
+                failures.append(name)
+                break
+
+    if failures:
+        print(f"\nSuper-linear lexer time on: {', '.join(failures)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Memory benchmark for fully parsed cookbooks.
+
+Writes a synthetic cookbook, loads it with and without a shared `Interner`,
+and reports the memory retained per recipe by each.
+
+Usage:
+    uv run python -m benchmarks.memory [--recipes 100000]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_cookbook
+from sous.cookbook import Cookbook
+
+
+def measure(directory: str, intern: bool) -> tuple[int, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    cookbook = Cookbook((directory,), (), intern=intern)
+    for recipe in cookbook.recipes:
+        _ = recipe.document.paragraphs
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(cookbook.recipes), retained, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--recipes", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Writing {args.recipes} synthetic recipes...")
+        write_cookbook(directory, args.recipes)
+
+        results = {}
+        for intern in (False, True):
+            count, retained, elapsed = measure(directory, intern)
+            results[intern] = retained / count
+            label = "interned" if intern else "plain"
+            print(
+                f"{label:>9}: {retained / 2**20:8.1f} MiB total, "
+                f"{retained / count:8.0f} bytes/recipe ({elapsed:.1f}s with tracing)"
+            )
+
+        print(f"Interning saves {1 - results[True] / results[False]:.0%} per recipe")
+
+
+if __name__ == "__main__":
+    main()
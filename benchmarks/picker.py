@@ -0,0 +1,79 @@
+"""
+Keystroke latency benchmark for the recipe picker.
+
+Indexes a large synthetic cookbook's names, ingredients and authors, then
+types (and deletes) a few queries one character at a time, timing how long
+the picker takes to filter and rank the results after each keystroke. Exits
+non-zero if the slowest keystroke exceeds the budget, one frame at 60 Hz by
+default.
+
+Usage:
+    uv run python -m benchmarks.picker [--recipes 50000] [--budget-ms 16]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.synthetic import INGREDIENTS, WORDS
+from sous.document import Document
+from sous.recipe import Recipe
+from sous.recipe_picker import RecipePicker
+
+QUERIES = ["chickpea", "chiken soup", "garlic", "roast tomato", "b"]
+
+
+def cookbook(count: int) -> tuple[list[Recipe], list[list[str]]]:
+    rng = random.Random(0)
+    recipes: list[Recipe] = []
+    terms: list[list[str]] = []
+    for index in range(count):
+        name = " ".join(
+            [rng.choice(WORDS).capitalize(), *rng.sample(INGREDIENTS, 2), str(index)]
+        )
+        document = Document.from_string(f"# {name}\n")
+        recipes.append(Recipe(f"{index}.sous", document=document))
+        terms.append(
+            [*rng.sample(INGREDIENTS, rng.randint(6, 15)), f"cook {rng.randrange(200)}"]
+        )
+    return recipes, terms
+
+
+def keystrokes(query: str) -> list[str]:
+    """Return the query as it is typed, and then deleted again."""
+    typed = [query[:length] for length in range(1, len(query) + 1)]
+    return typed + typed[-2::-1] + [""]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--recipes", type=int, default=50_000)
+    parser.add_argument("--budget-ms", type=float, default=16.0)
+    args = parser.parse_args()
+
+    recipes, terms = cookbook(args.recipes)
+    start = time.perf_counter()
+    picker = RecipePicker(recipes, terms)
+    print(f"index {args.recipes} recipes: {time.perf_counter() - start:.2f} s")
+
+    latencies: list[float] = []
+    for query in QUERIES:
+        for typed in keystrokes(query):
+            start = time.perf_counter()
+            picker.filter(typed)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[(len(latencies) - 1) * 99 // 100]
+    print(
+        f"{len(latencies)} keystrokes: p50 {p50:.2f} ms, p99 {p99:.2f} ms, "
+        f"max {latencies[-1]:.2f} ms (budget {args.budget_ms:.0f} ms)"
+    )
+    if latencies[-1] > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
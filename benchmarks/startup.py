@@ -0,0 +1,70 @@
+"""
+Startup benchmark for the command line interface.
+
+Runs `sous shop --help` under `python -X importtime` several times, and exits
+non-zero if importing `sous.cli` takes longer than the budget, or if it
+imports any of the scraping and NLP stack that only some commands need.
+
+Usage:
+    uv run python -m benchmarks.startup [--budget-ms 100]
+"""
+
+import argparse
+import subprocess
+import sys
+
+COMMAND = "from sous.cli import cli; cli(['shop', '--help'])"
+
+# Only the commands that scrape or parse ingredients should import these.
+HEAVY_MODULES = ["requests", "recipe_scrapers", "ingredient_parser", "simple_term_menu"]
+
+
+def import_times() -> dict[str, tuple[int, int]]:
+    """Return each imported module's (self, cumulative) import time in µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", COMMAND],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if own.strip().isdigit():
+            times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # The fastest run is the least disturbed by everything else on the machine.
+    runs = [import_times() for _ in range(args.runs)]
+    best = min(runs, key=lambda times: times["sous.cli"][1])
+    elapsed_ms = best["sous.cli"][1] / 1000
+
+    print(f"import sous.cli: {elapsed_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (own, _) in slowest[:10]:
+        print(f"  {own / 1000:6.1f} ms  {name}")
+
+    failed = False
+    heavy = [name for name in HEAVY_MODULES if name in best]
+    if heavy:
+        print(f"Imported by `sous shop --help`: {', '.join(heavy)}")
+        failed = True
+    if elapsed_ms > args.budget_ms:
+        print("Over budget")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
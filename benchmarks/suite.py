@@ -0,0 +1,284 @@
+"""
+Speed benchmarks for parsing, loading, shopping lists and conversion.
+
+Writes a synthetic cookbook, times each stage against it (the best of
+`--repeat` runs), and writes the results as JSON. Given a `--baseline` from an
+earlier run, compares each stage against it and exits non-zero if any is more
+than `--max-slowdown` times slower.
+
+Usage:
+    uv run python -m benchmarks.suite [--recipes 1000] [--output results.json]
+    uv run python -m benchmarks.suite --baseline results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.synthetic import (
+    recipe,
+    scraped_recipe_json,
+    write_cookbook,
+    write_shopping_list_config,
+)
+from sous.cookbook import Cookbook
+from sous.document import Document
+from sous.ingredient_cache import IngredientCache
+from sous.scraped_recipe import ScrapedRecipe
+from sous.shopping_list import ShoppingList
+from sous.shopping_list_config import ShoppingListConfig
+
+RESULTS_VERSION = 1
+
+# The number of recipes whose ingredients go into the shopping list, and of
+# scraped recipes rendered to .sous, whatever the size of the cookbook.
+SHOPPING_LIST_RECIPES = 500
+SCRAPED_RECIPES = 500
+
+
+def measure(
+    run: Callable[[Any], int],
+    repeat: int,
+    setup: Callable[[], Any] = lambda: None,
+) -> dict[str, float]:
+    """
+    Time `run(setup())` `repeat` times, and return the fastest, with the number
+    of items that `run` says it processed.
+    """
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        items = run(state)
+        best = min(best, time.perf_counter() - start)
+
+    return {"seconds": best, "items": items, "per_second": items / best}
+
+
+class Suite:
+    def __init__(self, directory: str, recipes: int, repeat: int) -> None:
+        self.directory = directory
+        self.recipes = recipes
+        self.repeat = repeat
+
+        self.cookbook_path = os.path.join(directory, "cookbook")
+        self.cache_path = os.path.join(directory, "cache")
+        self.config_path = os.path.join(directory, "config.toml")
+
+    def run(self) -> dict[str, dict[str, Any]]:
+        write_cookbook(self.cookbook_path, self.recipes)
+        write_shopping_list_config(self.config_path)
+
+        benchmarks: dict[str, Callable[[], dict[str, Any]]] = {
+            "document_parse": self.document_parse,
+            "cookbook_load": self.cookbook_load,
+            "cookbook_load_cached": self.cookbook_load_cached,
+            "cookbook_load_full": self.cookbook_load_full,
+            "cookbook_load_full_cached": self.cookbook_load_full_cached,
+            "shopping_list_build": self.shopping_list_build,
+            "shopping_list_format": self.shopping_list_format,
+            "scraped_recipe_to_sous": self.scraped_recipe_to_sous,
+        }
+
+        results: dict[str, dict[str, Any]] = {}
+        for name, benchmark in benchmarks.items():
+            try:
+                results[name] = benchmark()
+            except ImportError as e:
+                # An optional dependency (such as the NLP models that scraped
+                # recipes are converted with) that isn't installed.
+                results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+            print(f"{name:>24}: {self.describe(results[name])}", file=sys.stderr)
+        return results
+
+    @staticmethod
+    def describe(result: dict[str, Any]) -> str:
+        if not result:
+            return "not run"
+        if "skipped" in result:
+            return f"skipped ({result['skipped']})"
+        return (
+            f"{result['seconds'] * 1000:9.1f} ms, {result['per_second']:10.0f} items/s"
+        )
+
+    def document_parse(self) -> dict[str, float]:
+        rng = random.Random(0)
+        texts = [recipe(rng, index) for index in range(min(self.recipes, 10_000))]
+
+        def parse(_: None) -> int:
+            for text in texts:
+                _ = Document("recipe.sous", text).paragraphs
+            return len(texts)
+
+        return measure(parse, self.repeat)
+
+    def cookbook_load(self) -> dict[str, float]:
+        return measure(self._load_names, self.repeat)
+
+    def cookbook_load_cached(self) -> dict[str, float]:
+        self._load_names(self.cache_path)  # Fill the cache
+        return measure(self._load_names, self.repeat, lambda: self.cache_path)
+
+    def cookbook_load_full(self) -> dict[str, float]:
+        return measure(self._load_full, self.repeat)
+
+    def cookbook_load_full_cached(self) -> dict[str, float]:
+        self._load_full(self.cache_path)  # Fill the cache
+        return measure(self._load_full, self.repeat, lambda: self.cache_path)
+
+    def shopping_list_build(self) -> dict[str, float]:
+        ingredients = self._ingredients()
+        config = ShoppingListConfig(self.config_path)
+
+        def build(_: None) -> int:
+            ShoppingList(ingredients, ShoppingList.FORMAT_EXPANDED, config)
+            return len(ingredients)
+
+        return measure(build, self.repeat)
+
+    def shopping_list_format(self) -> dict[str, float]:
+        ingredients = self._ingredients()
+        config = ShoppingListConfig(self.config_path)
+
+        def setup() -> ShoppingList:
+            return ShoppingList(ingredients, ShoppingList.FORMAT_EXPANDED, config)
+
+        def format(shopping_list: ShoppingList) -> int:
+            str(shopping_list)
+            return len(shopping_list.items)
+
+        return measure(format, self.repeat, setup)
+
+    def scraped_recipe_to_sous(self) -> dict[str, float]:
+        rng = random.Random(0)
+        cache = IngredientCache(os.path.join(self.cache_path, "ingredients.sqlite3"))
+        recipes = [
+            ScrapedRecipe(scraped_recipe_json(rng, index), cache)
+            for index in range(SCRAPED_RECIPES)
+        ]
+
+        # Only rendering is timed; benchmarks.ingredients times parsing.
+        ScrapedRecipe.parse_ingredients(recipes)
+
+        def render(_: None) -> int:
+            for scraped_recipe in recipes:
+                scraped_recipe.to_sous()
+            return len(recipes)
+
+        return measure(render, self.repeat)
+
+    def _load_names(self, cache_directory: str | None) -> int:
+        # Like `sous shop`, which lists every recipe by name.
+        cookbook = Cookbook(
+            (self.cookbook_path,),
+            (),
+            Document.PROJECTION_NAME,
+            cache_directory=cache_directory,
+        )
+        return len(cookbook.recipes_by_name)
+
+    def _load_full(self, cache_directory: str | None) -> int:
+        # Like `sous serve`, which keeps whole recipes around.
+        cookbook = Cookbook((self.cookbook_path,), (), cache_directory=cache_directory)
+        return len(cookbook.recipes_by_name)
+
+    def _ingredients(self) -> list[Any]:
+        cookbook = Cookbook((self.cookbook_path,), ())
+        return [
+            ingredient
+            for recipe in cookbook.recipes[:SHOPPING_LIST_RECIPES]
+            for ingredient in recipe.ingredients
+        ]
+
+
+def environment() -> dict[str, str | None]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except OSError, subprocess.CalledProcessError:
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": commit,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    max_slowdown: float,
+) -> bool:
+    """
+    Print each benchmark's time relative to the baseline; False if any is too
+    slow, or has a baseline time but no time now.
+    """
+    ok = True
+    for name in [*results, *(name for name in baseline if name not in results)]:
+        result = results.get(name, {})
+        before = baseline.get(name, {})
+        if "seconds" not in before:
+            continue
+        if "seconds" not in result:
+            print(f"{name:>24}: {Suite.describe(result)}  MISSING", file=sys.stderr)
+            ok = False
+            continue
+
+        ratio = result["seconds"] / before["seconds"]
+        verdict = "SLOWER" if ratio > max_slowdown else "ok"
+        print(f"{name:>24}: {ratio:5.2f}x baseline  {verdict}", file=sys.stderr)
+        ok = ok and ratio <= max_slowdown
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--recipes", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Path to write the results to")
+    parser.add_argument("--baseline", help="Path to results to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=1.25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Writing {args.recipes} synthetic recipes...", file=sys.stderr)
+        benchmarks = Suite(directory, args.recipes, args.repeat).run()
+
+    results = {
+        "version": RESULTS_VERSION,
+        "environment": environment(),
+        "parameters": {"recipes": args.recipes, "repeat": args.repeat},
+        "benchmarks": benchmarks,
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        if baseline.get("parameters") != results["parameters"]:
+            print(
+                "warning: the baseline was run with other parameters", file=sys.stderr
+            )
+        if not compare(benchmarks, baseline["benchmarks"], args.max_slowdown):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Deterministic generator of synthetic .sous recipes and cookbooks, and of the
+inputs that go with them: scraped recipe JSON and shopping list configs.
+
+The same seed always produces the same recipes, so timings and memory use
+can be compared between runs and between commits.
+"""
+
+import json
+import os
+import random
+from typing import Any
+
+INGREDIENTS = [
+    f"{adjective}{noun}"
+    for noun in [
+        "garlic",
+        "onion",
+        "shallot",
+        "olive oil",
+        "butter",
+        "kosher salt",
+        "black pepper",
+        "lemon",
+        "lime",
+        "cilantro",
+        "parsley",
+        "chickpeas",
+        "black beans",
+        "tofu",
+        "chicken thighs",
+        "ground pork",
+        "rice",
+        "flour",
+        "sugar",
+        "eggs",
+        "milk",
+        "cream",
+        "tomatoes",
+        "broccoli crowns",
+        "carrots",
+        "celery",
+        "ginger",
+        "scallions",
+        "soy sauce",
+        "fish sauce",
+        "cumin",
+        "coriander",
+        "paprika",
+        "red pepper flakes",
+        "chicken stock",
+        "vinegar",
+        "honey",
+        "potatoes",
+        "spinach",
+        "mushrooms",
+    ]
+    for adjective in ["", "fresh ", "dried ", "smoked ", "toasted "]
+]
+
+QUANTITIES = [
+    "",
+    "1",
+    "2",
+    "3",
+    "1/2",
+    "1 1/2",
+    "1 cup",
+    "2 cups",
+    "1/2 cup",
+    "1 tablespoon",
+    "2 tablespoons",
+    "1 teaspoon",
+    "1/2 teaspoon",
+    "3 cloves",
+    "1 pound",
+    "1 - 2",
+]
+
+SECTIONS = ["For the sauce", "For the topping", "To serve", "For the marinade"]
+
+DESCRIPTORS = ["", "", "", "large", "extra virgin", "finely grated", "ripe"]
+
+PREPARATIONS = ["", "", "minced", "chopped", "sliced thin", "at room temperature"]
+
+WORDS = (
+    "add stir simmer until the and with a to of heat pan bowl over medium low "
+    "high minutes season taste cook bake roast toss serve warm golden tender "
+    "fragrant reduce whisk combine transfer cover rest slice"
+).split()
+
+
+def recipe(rng: random.Random, index: int) -> str:
+    """Return the contents of one synthetic recipe."""
+    lines = [f"# Recipe {index} with {rng.choice(INGREDIENTS)}", ""]
+
+    lines.append(f"@author Cook {rng.randrange(200)}")
+    lines.append(f"@yield {rng.randint(1, 8)} servings")
+    if rng.random() < 0.5:
+        lines.append(f"@total-time {rng.randint(10, 180)} minutes")
+    lines.append("@syntax 1")
+    lines.append("")
+
+    ingredients = rng.sample(INGREDIENTS, rng.randint(6, 15))
+    # Some recipes split their ingredients into sections.
+    section_at = rng.randrange(3, len(ingredients)) if rng.random() < 0.3 else None
+    for position, ingredient in enumerate(ingredients):
+        if position == section_at:
+            lines.extend(["", f"## {rng.choice(SECTIONS)}", ""])
+        descriptors = rng.choice(DESCRIPTORS)
+        preparation = rng.choice(PREPARATIONS)
+        line = f"{{{rng.choice(QUANTITIES)}}}"
+        line += f" {descriptors} " if descriptors else ""
+        line += f"[{ingredient}]"
+        line += f", {preparation}" if preparation else ""
+        lines.append(line)
+    if rng.random() < 0.3:
+        lines.append("% Adapted from a family recipe")
+    lines.append("")
+
+    for _ in range(rng.randint(3, 8)):
+        words = rng.choices(WORDS, k=rng.randint(12, 40))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words)), f"[{rng.choice(ingredients)}]")
+        if rng.random() < 0.3:
+            inline = f"{{{rng.choice(QUANTITIES)}}}[{rng.choice(INGREDIENTS)}]"
+            words.insert(rng.randrange(len(words)), inline)
+        lines.append(" ".join(words).capitalize() + ".")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def ingredient_sentence(rng: random.Random) -> str:
+    """Return one synthetic ingredient line, as a recipe site would write it."""
+    words = [
+        rng.choice(QUANTITIES),
+        rng.choice(DESCRIPTORS),
+        rng.choice(INGREDIENTS),
+    ]
+    sentence = " ".join(word for word in words if word)
+    preparation = rng.choice(PREPARATIONS)
+    return f"{sentence}, {preparation}" if preparation else sentence
+
+
+def ingredient_sentences(count: int, seed: int = 0) -> list[str]:
+    """
+    Return `count` synthetic ingredient lines. Like real recipes, a few lines
+    ("1 teaspoon kosher salt") are very common and most are rare: they are
+    drawn from `count // 10` distinct lines with Zipf-distributed frequency.
+    """
+    rng = random.Random(seed)
+    distinct = [ingredient_sentence(rng) for _ in range(max(1, count // 10))]
+    weights = [1 / rank for rank in range(1, len(distinct) + 1)]
+    return rng.choices(distinct, weights, k=count)
+
+
+def scraped_recipe_json(rng: random.Random, index: int) -> dict[str, Any]:
+    """Return one synthetic recipe, as `recipe_scrapers` would scrape it."""
+    return {
+        "title": f"Recipe {index} with {rng.choice(INGREDIENTS)}",
+        "description": " ".join(rng.choices(WORDS, k=rng.randint(0, 30))),
+        "author": f"Cook {rng.randrange(200)}",
+        "canonical_url": f"https://example.com/recipes/{index}",
+        "yields": f"{rng.randint(1, 8)} servings",
+        "total_time": rng.randint(10, 180),
+        "ingredients": [ingredient_sentence(rng) for _ in range(rng.randint(6, 15))],
+        "instructions_list": [
+            " ".join(rng.choices(WORDS, k=rng.randint(12, 40))).capitalize() + "."
+            for _ in range(rng.randint(3, 8))
+        ],
+    }
+
+
+def write_shopping_list_config(
+    path: str, categories: int = 40, items_per_category: int = 100, seed: int = 0
+) -> None:
+    """
+    Write a shopping list config with `categories` categories that file every
+    synthetic ingredient, among many other items and aliases.
+    """
+    rng = random.Random(seed)
+    ingredients = list(INGREDIENTS)
+    rng.shuffle(ingredients)
+
+    tables: list[str] = []
+    for category in range(categories):
+        items = ingredients[category::categories] + [
+            f"item {category}-{index}" for index in range(items_per_category)
+        ]
+        aliases = [f"alias {category}-{index}" for index in range(items_per_category)]
+        tables.append(
+            f"[category-{category}]\n"
+            f"items = {json.dumps(items)}\n"
+            f"aliases = {json.dumps(aliases)}\n"
+        )
+
+    with open(path, "w") as fh:
+        fh.write("\n".join(tables))
+
+
+def write_cookbook(
+    directory: str, count: int, seed: int = 0, per_directory: int = 1000
+) -> list[str]:
+    """
+    Write `count` synthetic recipes under `directory`, `per_directory` to a
+    subdirectory, and return their paths.
+    """
+    rng = random.Random(seed)
+    paths: list[str] = []
+
+    for index in range(count):
+        subdirectory = os.path.join(directory, f"{index // per_directory:04d}")
+        if index % per_directory == 0:
+            os.makedirs(subdirectory, exist_ok=True)
+
+        path = os.path.join(subdirectory, f"recipe-{index:07d}.sous")
+        with open(path, "w") as fh:
+            fh.write(recipe(rng, index))
+        paths.append(path)
+
+    return paths
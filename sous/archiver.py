@@ -0,0 +1,217 @@
+import os
+import pathlib
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+from sous.dump_store import DumpStore
+from sous.scraped_recipe import ScrapedRecipe
+from sous.utils import Text
+
+JSON_FILE_EXTENSION = ".json"
+MAX_BATCH_SIZE = 64
+
+
+def _warm_up() -> None:
+    # Runs once in each worker, so that the ingredient parser's model is loaded
+    # before the first recipe rather than during it.
+    from ingredient_parser import parse_ingredient
+
+    try:
+        parse_ingredient("1 cup flour")
+    except Exception:
+        pass  # Reported against each file instead, by _convert
+
+
+# The dump stores opened by this process, by path.
+_stores: dict[str, DumpStore] = {}
+
+
+def _load(source: str, store_path: str | None) -> ScrapedRecipe:
+    if store_path is None:
+        return ScrapedRecipe.load(source)
+
+    store = _stores.get(store_path)
+    if store is None:
+        store = _stores[store_path] = DumpStore(store_path)
+    recipe_json = store.get(source)
+    if recipe_json is None:
+        raise KeyError(f"Not in the dump store: {source}")
+    return ScrapedRecipe(recipe_json)
+
+
+def _convert_batch(
+    tasks: list[tuple[str, str]], store_path: str | None = None
+) -> list[str | None]:
+    """
+    Convert a batch of JSON files, or of recipes in the dump store at
+    `store_path`, and return why each one failed, if it did. Their
+    ingredients are parsed together, which is cheaper than one by one.
+    """
+    recipes: dict[str, ScrapedRecipe] = {}
+    errors: dict[str, str] = {}
+    for source, _ in tasks:
+        try:
+            recipes[source] = _load(source, store_path)
+        except Exception as e:
+            errors[source] = f"{type(e).__name__}: {e}"
+
+    ScrapedRecipe.parse_ingredients(recipes.values())
+
+    return [
+        errors[source] if source in errors else _convert(recipes[source], sous_path)
+        for source, sous_path in tasks
+    ]
+
+
+def _convert(recipe: ScrapedRecipe, sous_path: str) -> str | None:
+    """Convert one recipe, and return why it failed, if it did."""
+    try:
+        sous = recipe.to_sous()
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+    # Write atomically, so that an interrupted run never leaves behind a
+    # partial file that looks newer than its JSON.
+    tmp_path = f"{sous_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as fh:
+        fh.write(sous)
+    os.replace(tmp_path, sous_path)
+    return None
+
+
+@dataclass
+class ArchiveReport:
+    converted: int = 0
+    skipped: int = 0
+    failures: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class Archiver:
+    """
+    Converts a directory of dumped recipe JSON files, or a `DumpStore`, to
+    .sous files.
+
+    Files whose .sous output is already newer than their JSON are skipped, so
+    an interrupted run picks up where it left off. With `jobs` other than 1,
+    files are converted by that many worker processes (or one per CPU if
+    `jobs` is 0), since parsing ingredients is CPU-bound. A file that fails to
+    convert is recorded in the report rather than stopping the run.
+    """
+
+    def __init__(
+        self, dump_directory_path: str, output_directory_path: str, jobs: int = 1
+    ) -> None:
+        self.dump_directory_path = dump_directory_path
+        self.output_directory_path = output_directory_path
+        self.jobs = jobs
+        self.store_path = (
+            dump_directory_path if DumpStore.exists(dump_directory_path) else None
+        )
+
+    def tasks(self) -> tuple[list[tuple[str, str]], int]:
+        """
+        Return the (JSON path, .sous path) of every file to convert, or the
+        (id, .sous path) of every recipe in a dump store, and the number that
+        are already up to date.
+        """
+        if self.store_path is not None:
+            return self._store_tasks(self.store_path)
+
+        tasks: list[tuple[str, str]] = []
+        skipped = 0
+
+        for dirpath, _, filenames in os.walk(self.dump_directory_path):
+            for name in filenames:
+                if not name.endswith(JSON_FILE_EXTENSION):
+                    continue
+
+                json_path = os.path.join(dirpath, name)
+                sous_path = os.path.join(
+                    self.output_directory_path, f"{pathlib.Path(name).stem}.sous"
+                )
+                try:
+                    up_to_date = (
+                        os.stat(sous_path).st_mtime_ns >= os.stat(json_path).st_mtime_ns
+                    )
+                except FileNotFoundError:
+                    up_to_date = False
+
+                if up_to_date:
+                    skipped += 1
+                else:
+                    tasks.append((json_path, sous_path))
+
+        return tasks, skipped
+
+    def _store_tasks(self, store_path: str) -> tuple[list[tuple[str, str]], int]:
+        tasks: list[tuple[str, str]] = []
+        skipped = 0
+
+        # In the order they are stored, so that each batch reads few chunks.
+        with DumpStore(store_path) as store:
+            entries = store.entries()
+        for recipe_id, title, added_at in entries:
+            sous_path = os.path.join(
+                self.output_directory_path,
+                f"{Text.kebab_case(title or recipe_id)}.sous",
+            )
+            try:
+                up_to_date = os.stat(sous_path).st_mtime >= added_at
+            except FileNotFoundError:
+                up_to_date = False
+
+            if up_to_date:
+                skipped += 1
+            else:
+                tasks.append((recipe_id, sous_path))
+
+        return tasks, skipped
+
+    def run(
+        self, on_progress: Callable[[int, int], None] | None = None
+    ) -> ArchiveReport:
+        """
+        Convert every file that isn't up to date, calling `on_progress` with
+        the number of files done so far and the number to do, before the first
+        file and after each one.
+        """
+        start = time.perf_counter()
+        tasks, skipped = self.tasks()
+        report = ArchiveReport(skipped=skipped)
+        os.makedirs(self.output_directory_path, exist_ok=True)
+        if on_progress is not None:
+            on_progress(0, len(tasks))
+
+        for done, (task, error) in enumerate(zip(tasks, self._map(tasks), strict=True)):
+            if error is None:
+                report.converted += 1
+            else:
+                report.failures[task[0]] = error
+            if on_progress is not None:
+                on_progress(done + 1, len(tasks))
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _map(self, tasks: list[tuple[str, str]]) -> Iterator[str | None]:
+        workers = self.jobs if self.jobs > 0 else os.cpu_count() or 1
+        if workers == 1 or len(tasks) < 2:
+            for start in range(0, len(tasks), MAX_BATCH_SIZE):
+                yield from _convert_batch(
+                    tasks[start : start + MAX_BATCH_SIZE], self.store_path
+                )
+            return
+
+        # Batches amortize parsing and shipping work to a worker, but are kept
+        # small enough to spread evenly and keep progress updates frequent.
+        size = max(1, min(MAX_BATCH_SIZE, len(tasks) // (workers * 4)))
+        batches = [tasks[start : start + size] for start in range(0, len(tasks), size)]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_up) as pool:
+            convert = partial(_convert_batch, store_path=self.store_path)
+            for errors in pool.map(convert, batches):
+                yield from errors
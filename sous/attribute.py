@@ -2,7 +2,7 @@ import re
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Attribute:
     name: str
     value: str
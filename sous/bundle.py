@@ -0,0 +1,191 @@
+import io
+import marshal
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+
+from sous.document import Document
+from sous.interner import Interner
+from sous.recipe import Recipe
+
+BUNDLE_FILE_EXTENSION = ".souspack"
+
+
+class BundledDocument(Document):
+    """A document that is decoded from a slice of a bundle only when parsed."""
+
+    def __init__(
+        self,
+        filepath: str,
+        buffer: memoryview,
+        projection: str = Document.PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> None:
+        super().__init__(filepath, projection=projection, interner=interner)
+        self._buffer = buffer
+
+    def project(self, projection: str) -> "BundledDocument":
+        return BundledDocument(self.filepath, self._buffer, projection, self.interner)
+
+    def _open(self) -> AbstractContextManager[Iterable[str]]:
+        return nullcontext(io.StringIO(str(self._buffer, "utf-8"), newline=None))
+
+
+@dataclass(slots=True)
+class BundleEntry:
+    bundle: "Bundle"
+    name: str
+    path: str
+    mtime_ns: int
+    offset: int
+    length: int
+
+    @property
+    def filepath(self) -> str:
+        return os.path.join(self.bundle.path, self.path)
+
+    def document(
+        self,
+        projection: str = Document.PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> BundledDocument:
+        buffer = self.bundle.buffer[self.offset : self.offset + self.length]
+        return BundledDocument(self.filepath, buffer, projection, interner)
+
+    def recipe(
+        self,
+        projection: str = Document.PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> Recipe:
+        recipe = Recipe(self.filepath, document=self.document(projection, interner))
+        # The name was recorded when the bundle was packed, so listing a
+        # bundle's recipes never has to decode them.
+        recipe.name = self.name
+        return recipe
+
+
+class Bundle:
+    """
+    A read-only cookbook packed into a single file by `Bundle.write`.
+
+    The file holds a fixed-size header, the raw contents of every recipe back
+    to back, and an index of (name, path, mtime, offset, length) for each of
+    them. Opening a bundle memory-maps the file and reads only the index;
+    recipes are sliced out of the mapping without copying and parsed only
+    when their contents are needed.
+    """
+
+    MAGIC = b"SOUSPACK"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIQQ")  # magic, version, index offset, index length
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        with open(path, "rb") as fh:
+            stat = os.fstat(fh.fileno())
+            self.stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.buffer = memoryview(self._mmap)
+
+        if len(self.buffer) < self.HEADER.size:
+            raise ValueError(f"Not a sous bundle: '{path}'")
+        magic, version, index_offset, index_length = self.HEADER.unpack_from(
+            self.buffer
+        )
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Not a sous bundle (or an unsupported version): '{path}'")
+
+        self.entries = [
+            BundleEntry(self, *fields)
+            for fields in marshal.loads(
+                self.buffer[index_offset : index_offset + index_length]
+            )
+        ]
+
+    def __iter__(self) -> Iterator[BundleEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def names(self) -> list[str]:
+        return [entry.name for entry in self.entries]
+
+    @staticmethod
+    def is_bundle(path: str) -> bool:
+        return path.endswith(BUNDLE_FILE_EXTENSION) and os.path.isfile(path)
+
+    @classmethod
+    def write(cls, output_path: str, cookbook_paths: Iterable[str]) -> int:
+        """
+        Pack every named recipe under `cookbook_paths` into a bundle at
+        `output_path`, and return the number of recipes packed.
+        """
+        # Imported here because the cookbook itself knows how to open bundles.
+        from sous.cookbook import Cookbook
+
+        index: list[tuple[str, str, int, int, int]] = []
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+
+        with open(tmp_path, "wb") as out:
+            out.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, 0))
+
+            cookbook_paths = list(cookbook_paths)
+            roots = cls._roots(cookbook_paths)
+            for cookbook_path, root in zip(cookbook_paths, roots, strict=True):
+                for filepath in Cookbook.discover(cookbook_path):
+                    with open(filepath, "rb") as fh:
+                        stat = os.fstat(fh.fileno())
+                        data = fh.read()
+
+                    name = Recipe(
+                        filepath,
+                        document=Document.from_bytes(
+                            data, filepath, projection=Document.PROJECTION_NAME
+                        ),
+                    ).name
+                    if not name:
+                        sys.stderr.write(
+                            f"Ignoring recipe with no name at {filepath}\n"
+                        )
+                        continue
+
+                    path = os.path.join(root, os.path.relpath(filepath, cookbook_path))
+                    index.append((name, path, stat.st_mtime_ns, out.tell(), len(data)))
+                    out.write(data)
+
+            index_offset = out.tell()
+            index_data = marshal.dumps(index)
+            out.write(index_data)
+
+            out.seek(0)
+            out.write(
+                cls.HEADER.pack(cls.MAGIC, cls.VERSION, index_offset, len(index_data))
+            )
+
+        os.replace(tmp_path, output_path)
+        return len(index)
+
+    @staticmethod
+    def _roots(cookbook_paths: list[str]) -> list[str]:
+        """
+        Name the directory each cookbook's recipes are packed under after the
+        cookbook's own, numbering the ones that share a name ("recipes",
+        "recipes-2"), so that their paths don't collide.
+        """
+        names = [os.path.basename(os.path.normpath(p)) for p in cookbook_paths]
+        taken = set(names)
+        roots: list[str] = []
+        for name in names:
+            root, number = name, 1
+            while root in roots or (root != name and root in taken):
+                number += 1
+                root = f"{name}-{number}"
+            roots.append(root)
+        return roots
@@ -1,26 +1,65 @@
+import json
 import os
-import pathlib
 import sys
 import time
+from typing import TYPE_CHECKING, Any
 
 import click
 
+from sous.bundle import BUNDLE_FILE_EXTENSION, Bundle
 from sous.cookbook import Cookbook
-from sous.downloader import Downloader
+from sous.document import Document
+from sous.meal_plan import MealPlan
+from sous.recipe_cache import RecipeCache, default_cache_directory
+from sous.search_index import SearchIndex, SearchQueryError
 from sous.shopping_list import ShoppingList
 from sous.shopping_list_config import ShoppingListConfig
+from sous.timings import Timings
 from sous.utils import Text
 
+# Commands import the scraping and NLP stack (requests, recipe_scrapers,
+# ingredient_parser) themselves, so that the others, and --help, start fast.
+if TYPE_CHECKING:
+    from sous.downloader import Downloader
+
 CONTEXT_SETTINGS: dict[str, list[str]] = dict(help_option_names=["-h", "--help"])
 
 
 @click.group(context_settings=CONTEXT_SETTINGS)
-def cli() -> None:
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    help="Print the time spent in each phase, and counts of the work done",
+)
+@click.option(
+    "--trace",
+    "trace_path",
+    type=click.Path(dir_okay=False),
+    help="Write the phases as a Chrome trace (for chrome://tracing or Perfetto)",
+)
+@click.pass_context
+def cli(ctx: click.Context, timings: bool, trace_path: str | None) -> None:
     """a kitchen assistant"""
-    pass
+    if not timings and not trace_path:
+        return
+
+    from sous import lexer, quantity, search_index
+    from sous.ingredient import Ingredient
+
+    Timings.enable((lexer, quantity, search_index, Ingredient))
+
+    def report() -> None:
+        if timings:
+            click.echo(Timings.summary(), err=True)
+        if trace_path:
+            Timings.write_trace(trace_path)
+
+    ctx.call_on_close(report)
 
 
 JSON_FILE_EXTENSION = ".json"
+DUMP_CLAIM_SIZE_PER_JOB = 16
 
 
 @cli.command(name="import", context_settings=CONTEXT_SETTINGS)
@@ -33,8 +72,24 @@ JSON_FILE_EXTENSION = ".json"
     default=False,
     help="Whether or not to cache the intermediate JSON representation of the recipe.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Download every page instead of revalidating the download cache",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    default=False,
+    help="Only use pages from the download cache, without using the network",
+)
 def import_recipe(
-    source: str, destination: str | None, cache_intermediate_json: bool
+    source: str,
+    destination: str | None,
+    cache_intermediate_json: bool,
+    no_cache: bool,
+    offline: bool,
 ) -> None:
     """
     Create a .sous file from the recipe at the given source URL
@@ -43,8 +98,12 @@ def import_recipe(
 
     DESTINATION path to the output file (including the .sous extension)
     """
+    from sous.http_cache import OfflineCacheMiss
 
-    scraped_recipe = Downloader().download(source)
+    try:
+        scraped_recipe = _downloader(no_cache, offline).download(source)
+    except OfflineCacheMiss as e:
+        raise click.ClickException(str(e)) from e
 
     if destination and cache_intermediate_json:
         basename, extension = os.path.splitext(destination)
@@ -53,44 +112,282 @@ def import_recipe(
     print(scraped_recipe.to_sous(destination))
 
 
-@cli.command(name="dump", context_settings=CONTEXT_SETTINGS)
+class DefaultCommandGroup(click.Group):
+    """A group that runs `default_command` when not given a command's name."""
+
+    def __init__(self, *args: Any, default_command: str, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if (
+            args
+            and args[0] not in self.commands
+            and args[0] not in ctx.help_option_names
+        ):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@cli.group(
+    cls=DefaultCommandGroup,
+    default_command="run",
+    context_settings=CONTEXT_SETTINGS,
+)
+def dump() -> None:
+    """Dump JSON files for recipes, resumably (runs 'run' by default)"""
+    pass
+
+
+@dump.command(name="run", context_settings=CONTEXT_SETTINGS)
 @click.argument("url-file")
 @click.argument("output-directory-path")
-def dump_recipes(url_file: str, output_directory_path: str) -> None:
-    """Dump JSON files for all the recipes in the given file of URLs"""
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=8,
+    help=(
+        "Number of downloads to run at once; requests to the same site are "
+        "always made one at a time, honoring its crawl delay (default: 8)"
+    ),
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=3,
+    help="Number of times to retry a download that failed temporarily (default: 3)",
+)
+@click.option(
+    "--retry-failed",
+    is_flag=True,
+    default=False,
+    help="Try the recipes that failed in earlier runs again",
+)
+@click.option(
+    "--store",
+    "use_store",
+    is_flag=True,
+    default=False,
+    help=(
+        "Write recipes into a compressed store in the output directory instead "
+        "of one JSON file each (implied if the directory already has one)"
+    ),
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Download every page instead of revalidating the download cache",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    default=False,
+    help="Only use pages from the download cache, without using the network",
+)
+def dump_recipes(
+    url_file: str,
+    output_directory_path: str,
+    jobs: int,
+    retries: int,
+    retry_failed: bool,
+    use_store: bool,
+    no_cache: bool,
+    offline: bool,
+) -> None:
+    """
+    Dump JSON files for all the recipes in the given file of URLs
 
-    downloader = Downloader()
+    Progress is kept in a journal in the output directory, so an interrupted
+    dump resumes where it left off, skipping recipes that are already done.
+    Several dumps, on one machine or many, can share an output directory and
+    split the work between them.
+    """
+    from sous.crawler import Crawler
+    from sous.dump_journal import DumpJournal
+    from sous.dump_store import DumpStore
+
+    downloader = _downloader(no_cache, offline)
+    crawler = Crawler(
+        downloader.download,
+        downloader.delay_for,
+        workers=jobs,
+        retries=retries,
+        is_transient=downloader.is_transient,
+    )
 
     with open(url_file) as fh:
-        for line in fh:
-            url = line.strip()
-            if not url:
-                continue
-
-            scraped_recipe = downloader.download(url)
-            scraped_recipe.save(
-                f"{output_directory_path}/{Text.kebab_case(scraped_recipe.title)}.json"
-            )
+        urls = [url for url in (line.strip() for line in fh) if url]
+
+    os.makedirs(output_directory_path, exist_ok=True)
+    journal = DumpJournal(DumpJournal.path_for(output_directory_path))
+    journal.add(urls)
+    if retry_failed:
+        journal.retry_failed()
+
+    store = None
+    if use_store or DumpStore.exists(output_directory_path):
+        store = DumpStore(output_directory_path)
+    # Recipes added to the store but not yet written to disk, which are only
+    # marked done once they are.
+    unwritten: list[tuple[str, int]] = []
+
+    def complete_written() -> None:
+        for url, attempts in unwritten:
+            journal.complete(url, DumpStore.output_path(url), attempts)
+        unwritten.clear()
+
+    failures = 0
+    try:
+        # Claiming a few URLs per worker at a time leaves the rest to other
+        # dumps.
+        while claimed := journal.claim(jobs * DUMP_CLAIM_SIZE_PER_JOB):
+            for result in crawler.run(claimed):
+                if result.error is not None:
+                    failures += 1
+                    click.echo(f"error: {result.url}: {result.error}", err=True)
+                    journal.fail(result.url, str(result.error), result.attempts)
+                    continue
+
+                scraped_recipe = result.result
+                if store is not None:
+                    unwritten.append((result.url, result.attempts))
+                    if store.add(result.url, scraped_recipe.recipe_json):
+                        complete_written()
+                    else:
+                        # Not done until its chunk is written, which may take
+                        # longer than the lease on a slow, polite crawl.
+                        journal.renew()
+                    continue
+
+                output_path = (
+                    f"{output_directory_path}/"
+                    f"{Text.kebab_case(scraped_recipe.title)}.json"
+                )
+                scraped_recipe.save(output_path)
+                journal.complete(result.url, output_path, result.attempts)
+
+            if store is not None:
+                store.flush()
+                complete_written()
+    finally:
+        if store is not None:
+            store.close()
+            complete_written()
+        # Whatever this dump claimed but didn't finish, if it was interrupted,
+        # is left to the next one rather than to its lease lapsing.
+        journal.release()
+        status = journal.status()
+        journal.close()
+
+    if failures:
+        click.echo(f"Failed to download {Text.pluralize('recipe', failures)}", err=True)
+    if status.claimed or status.pending:
+        click.echo(
+            f"{Text.pluralize('recipe', status.claimed + status.pending)} not "
+            "finished, and claimed by other dumps; run again if they stopped",
+            err=True,
+        )
+    if failures or status.claimed or status.pending:
+        sys.exit(1)
+
+
+@dump.command(name="status", context_settings=CONTEXT_SETTINGS)
+@click.argument("output-directory-path", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--failures",
+    "show_failures",
+    is_flag=True,
+    default=False,
+    help="List every recipe that failed, with its error",
+)
+def dump_status(output_directory_path: str, show_failures: bool) -> None:
+    """Show the progress of the dump into the given directory"""
+    from sous.dump_journal import THROUGHPUT_WINDOW_SECONDS, DumpJournal
+
+    path = DumpJournal.path_for(output_directory_path)
+    if not os.path.exists(path):
+        raise click.ClickException(f"No dump journal in {output_directory_path}")
+
+    journal = DumpJournal(path)
+    status = journal.status()
+
+    finished = status.done + status.failed
+    click.echo(
+        f"{finished} of {Text.pluralize('recipe', status.total)} finished "
+        f"({finished / max(status.total, 1):.0%}): {status.done} done, "
+        f"{status.failed} failed, {status.claimed} in progress, "
+        f"{status.pending} pending"
+    )
+
+    throughput = (
+        f"{status.throughput * 60:.1f} recipes/min over the last "
+        f"{THROUGHPUT_WINDOW_SECONDS // 60} minutes"
+    )
+    left = status.pending + status.claimed
+    if status.throughput and left:
+        throughput += f", about {left / status.throughput / 60:.0f} min left"
+    click.echo(f"{Text.pluralize('worker', status.workers)}, {throughput}")
 
-            if downloader.delay:
-                time.sleep(int(downloader.delay))
+    if show_failures:
+        for url, error in journal.failures():
+            click.echo(f"error: {url}: {error}")
+    journal.close()
+
+
+def _downloader(no_cache: bool, offline: bool) -> "Downloader":
+    from sous.downloader import Downloader
+    from sous.http_cache import HttpCache
+
+    if no_cache and offline:
+        raise click.UsageError("--offline can't be used with --no-cache")
+    return Downloader(http_cache=None if no_cache else HttpCache(offline=offline))
 
 
 @cli.command(context_settings=CONTEXT_SETTINGS)
 @click.argument("dump_directory_path")
 @click.argument("output_directory_path")
-def archive(dump_directory_path: str, output_directory_path: str) -> None:
-    """Convert recipe JSON files to .sous files in bulk"""
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of worker processes converting recipes (0: one per CPU, default: 1)",
+)
+def archive(dump_directory_path: str, output_directory_path: str, jobs: int) -> None:
+    """
+    Convert recipe JSON files, or a dump store, to .sous files in bulk
 
-    downloader = Downloader()
+    Recipes whose .sous file is newer than their JSON file are skipped, so an
+    interrupted run can be resumed by running it again.
+    """
+    from sous.archiver import Archiver
 
-    for dirpath, _, filenames in os.walk(dump_directory_path):
-        for name in filenames:
-            json_file_path = os.path.join("/", dirpath, name)
-            sous_file_path = f"{output_directory_path}/{pathlib.Path(name).stem}.sous"
+    archiver = Archiver(dump_directory_path, output_directory_path, jobs)
 
-            scraped_recipe = downloader.download(json_file_path)
-            scraped_recipe.to_sous(sous_file_path)
+    with click.progressbar(length=0, label="Converting", file=sys.stderr) as progress:
+        start = time.perf_counter()
+
+        def on_progress(done: int, total: int) -> None:
+            progress.length = total
+            rate = done / max(time.perf_counter() - start, 1e-9)
+            progress.label = f"Converting ({rate:.1f} recipes/s)"
+            progress.update(done - progress.pos)
+
+        report = archiver.run(on_progress)
+
+    for json_file_path, error in report.failures.items():
+        click.echo(f"error: {json_file_path}: {error}", err=True)
+
+    click.echo(
+        f"Converted {Text.pluralize('recipe', report.converted)} "
+        f"in {report.elapsed:.1f}s, skipped {report.skipped} up to date, "
+        f"{len(report.failures)} failed",
+        err=True,
+    )
+    if report.failures:
+        sys.exit(1)
 
 
 @cli.command(context_settings=CONTEXT_SETTINGS)
@@ -100,7 +397,10 @@ def archive(dump_directory_path: str, output_directory_path: str) -> None:
     "cookbook_paths",
     default=(),
     multiple=True,
-    help="Path to a directory containing .sous files",
+    help=(
+        "Path to a directory containing .sous files, "
+        f"or a {BUNDLE_FILE_EXTENSION} bundle"
+    ),
 )
 @click.option(
     "--recipe",
@@ -128,37 +428,418 @@ def archive(dump_directory_path: str, output_directory_path: str) -> None:
     default=None,
     help="Path to a TOML file that defines shopping list item grouping and ordering",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Parse every recipe from scratch instead of using the parsed-recipe cache",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of workers used to load recipes (0: one per CPU, default: 1)",
+)
+@click.option(
+    "--pool",
+    type=click.Choice(Cookbook.POOLS, case_sensitive=False),
+    default=Cookbook.POOL_PROCESS,
+    help=(
+        "Kind of worker pool used when --jobs is not 1; threads suit cookbooks "
+        f"on network filesystems (default: {Cookbook.POOL_PROCESS})"
+    ),
+)
+@click.option(
+    "--plan",
+    "-p",
+    "plan_paths",
+    type=click.Path(exists=True, dir_okay=False),
+    default=(),
+    multiple=True,
+    help=(
+        "Path to a TOML meal plan to build a shopping list from without the "
+        "menus; may be given many times to build one list per plan"
+    ),
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_directory_path",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory to write one shopping list per plan to, instead of stdout",
+)
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    default=False,
+    help="Write shopping lists built from plans as JSON",
+)
 def shop(
     cookbook_paths: tuple[str],
     recipe_paths: tuple[str],
     format: str,
     config: str | None,
+    no_cache: bool,
+    jobs: int,
+    pool: str,
+    plan_paths: tuple[str],
+    output_directory_path: str | None,
+    as_json: bool,
 ) -> None:
     """Build a shopping list from a collection of recipes"""
     if not len(cookbook_paths) and not len(recipe_paths):
         click.echo("Please provide either the --cookbook flag or the --recipe flag.")
         sys.exit(1)
 
-    cookbook = Cookbook(cookbook_paths, recipe_paths)
+    # Only names are loaded; ingredients are read on selection.
+    cookbook = Cookbook(
+        cookbook_paths,
+        recipe_paths,
+        Document.PROJECTION_NAME,
+        cache_directory=None if no_cache else default_cache_directory(),
+        jobs=jobs,
+        pool=pool,
+    )
     shopping_list_config = ShoppingListConfig(config) if config else None
-    shopping_list = ShoppingList.build(cookbook, format, shopping_list_config)
 
-    if len(shopping_list.items):
-        if shopping_list_config:
-            uncategorized = sorted(
-                item.name
-                for item in shopping_list.items
-                if shopping_list_config.category_for(item.name) is None
-            )
-            for name in uncategorized:
-                click.echo(
-                    f"warning: '{name}' is not in the config file",
-                    err=True,
-                )
+    if plan_paths:
+        _shop_plans(
+            cookbook,
+            plan_paths,
+            format,
+            shopping_list_config,
+            output_directory_path,
+            as_json,
+        )
+        return
+
+    # The recipe picker matches ingredients and attributes through the search
+    # index, which it reads in the background. The index is kept with the
+    # cache so that only changed recipes are read in full.
+    index_path: str | None = None
+    if not no_cache:
+        index_path = SearchIndex.path_for(
+            default_cache_directory(), cookbook_paths, recipe_paths
+        )
+
+    shopping_list = ShoppingList.build(
+        cookbook, format, shopping_list_config, index_path
+    )
 
+    if len(shopping_list.items):
+        _warn_uncategorized([shopping_list], shopping_list_config)
         click.echo(f"\n{str(shopping_list)}\n")
         click.echo("Happy shopping! 🛍️")
 
 
+def _shop_plans(
+    cookbook: Cookbook,
+    plan_paths: tuple[str],
+    format: str,
+    config: ShoppingListConfig | None,
+    output_directory_path: str | None,
+    as_json: bool,
+) -> None:
+    if output_directory_path is not None:
+        # Each plan's list is named after the plan, so plans with the same file
+        # name in different directories would overwrite each other's.
+        plans_by_name: dict[str, str] = {}
+        for plan_path in plan_paths:
+            name = MealPlan.name_for(plan_path)
+            if name in plans_by_name:
+                raise click.ClickException(
+                    f"Meal plans {plans_by_name[name]} and {plan_path} would both "
+                    f"be written to '{name}' in {output_directory_path}"
+                )
+            plans_by_name[name] = plan_path
+
+    # The cookbook is loaded, and its names indexed, once for every plan.
+    shopping_lists: list[ShoppingList] = []
+    for plan_path in plan_paths:
+        try:
+            plan = MealPlan(plan_path)
+            shopping_list = ShoppingList.from_plan(
+                plan, cookbook.recipes_by_name, format, config
+            )
+        except ValueError as e:
+            raise click.ClickException(str(e)) from e
+        shopping_lists.append(shopping_list)
+
+        if as_json:
+            output = json.dumps({"plan": plan_path, **shopping_list.to_dict()})
+        else:
+            output = str(shopping_list)
+
+        if output_directory_path is not None:
+            os.makedirs(output_directory_path, exist_ok=True)
+            extension = JSON_FILE_EXTENSION if as_json else ".txt"
+            path = os.path.join(output_directory_path, plan.name + extension)
+            with open(path, "w") as fh:
+                fh.write(output + "\n")
+        elif as_json or len(plan_paths) == 1:
+            click.echo(output)
+        else:
+            click.echo(f"{plan_path}:\n{output}\n")
+
+    _warn_uncategorized(shopping_lists, config)
+
+
+def _warn_uncategorized(
+    shopping_lists: list[ShoppingList], config: ShoppingListConfig | None
+) -> None:
+    if not config:
+        return
+
+    uncategorized = sorted(
+        {
+            name
+            for shopping_list in shopping_lists
+            for name in shopping_list.uncategorized()
+        }
+    )
+    for name in uncategorized:
+        click.echo(
+            f"warning: '{name}' is not in the config file",
+            err=True,
+        )
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
+@click.argument("query")
+@click.option(
+    "--cookbook",
+    "-c",
+    "cookbook_paths",
+    default=(),
+    multiple=True,
+    help="Path to a directory containing .sous files",
+)
+@click.option(
+    "--recipe",
+    "-r",
+    "recipe_paths",
+    default=(),
+    multiple=True,
+    help="Path to a .sous file",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Parse and index every recipe from scratch instead of using the cache",
+)
+def search(
+    query: str,
+    cookbook_paths: tuple[str],
+    recipe_paths: tuple[str],
+    no_cache: bool,
+) -> None:
+    """
+    Find recipes by ingredient, name, attribute or text
+
+    QUERY words to match, e.g. 'i:chickpeas garlic -cilantro'. Terms are ANDed
+    unless separated by OR, and can be negated with NOT or '-', grouped with
+    parentheses, scoped with a field (ingredient:, i:, name:, or any attribute
+    such as author:), quoted to match a multi-word ingredient, and suffixed
+    with '*' to match a prefix.
+    """
+    if not len(cookbook_paths) and not len(recipe_paths):
+        click.echo("Please provide either the --cookbook flag or the --recipe flag.")
+        sys.exit(1)
+
+    cache_directory = None if no_cache else default_cache_directory()
+    cookbook = Cookbook(
+        cookbook_paths,
+        recipe_paths,
+        Document.PROJECTION_NAME,
+        cache_directory=cache_directory,
+    )
+
+    if cache_directory:
+        index_path = SearchIndex.path_for(cache_directory, cookbook_paths, recipe_paths)
+        cookbook.use_search_index(SearchIndex.load(index_path))
+        cookbook.search_index.save(index_path)
+
+    try:
+        recipes = cookbook.search(query)
+    except SearchQueryError as e:
+        raise click.UsageError(str(e)) from e
+
+    for recipe in recipes:
+        click.echo(recipe.name)
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
+@click.argument("output")
+@click.option(
+    "--cookbook",
+    "-c",
+    "cookbook_paths",
+    required=True,
+    multiple=True,
+    help="Path to a directory containing .sous files",
+)
+def pack(output: str, cookbook_paths: tuple[str]) -> None:
+    """
+    Pack cookbooks into a single bundle file
+
+    OUTPUT path to the bundle (including the .souspack extension), which can
+    then be passed to --cookbook like a directory
+    """
+    count = Bundle.write(output, cookbook_paths)
+    click.echo(f"Packed {Text.pluralize('recipe', count)} into {output}")
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
+@click.option(
+    "--cookbook",
+    "-c",
+    "cookbook_paths",
+    default=(),
+    multiple=True,
+    help=(
+        "Path to a directory containing .sous files, "
+        f"or a {BUNDLE_FILE_EXTENSION} bundle"
+    ),
+)
+@click.option(
+    "--recipe",
+    "-r",
+    "recipe_paths",
+    default=(),
+    multiple=True,
+    help="Path to a .sous file",
+)
+@click.option(
+    "--config",
+    type=click.Path(exists=True),
+    default=None,
+    help="Path to a TOML file that defines shopping list item grouping and ordering",
+)
+@click.option("--host", default="127.0.0.1", help="Address to listen on")
+@click.option("--port", type=click.IntRange(0, 65535), default=8080)
+@click.option(
+    "--reload-interval",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    help="Seconds between checks for changed recipes (0: never, default: 1)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Parse every recipe from scratch instead of using the parsed-recipe cache",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of workers used to load recipes (0: one per CPU, default: 1)",
+)
+@click.option("--quiet", "-q", is_flag=True, default=False, help="Don't log requests")
+def serve(
+    cookbook_paths: tuple[str],
+    recipe_paths: tuple[str],
+    config: str | None,
+    host: str,
+    port: int,
+    reload_interval: float,
+    no_cache: bool,
+    jobs: int,
+    quiet: bool,
+) -> None:
+    """
+    Serve recipes and shopping lists as JSON over HTTP
+
+    Keeps the cookbook in memory, re-parsing only the recipes that change, and
+    answers GET /recipes, GET /recipes/<name>, POST /shopping-list, GET /health
+    and GET /metrics.
+    """
+    from sous.server import CookbookServer
+
+    if not len(cookbook_paths) and not len(recipe_paths):
+        click.echo("Please provide either the --cookbook flag or the --recipe flag.")
+        sys.exit(1)
+
+    cookbook = Cookbook(
+        cookbook_paths,
+        recipe_paths,
+        cache_directory=None if no_cache else default_cache_directory(),
+        jobs=jobs,
+        intern=True,
+    )
+    server = CookbookServer(
+        cookbook,
+        host,
+        port,
+        ShoppingListConfig(config) if config else None,
+        reload_interval,
+        quiet,
+    )
+    click.echo(
+        f"Serving {Text.pluralize('recipe', len(cookbook.recipes))} at {server.url}",
+        err=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@cli.group(context_settings=CONTEXT_SETTINGS)
+def cache() -> None:
+    """Manage the parsed-recipe cache"""
+    pass
+
+
+@cache.command(name="stats", context_settings=CONTEXT_SETTINGS)
+def cache_stats() -> None:
+    """Show the cached cookbooks, downloads and parsed ingredients"""
+    from sous.http_cache import HttpCache
+    from sous.ingredient_cache import IngredientCache
+
+    for stats in RecipeCache.stats():
+        status = " (stale)" if stats["stale"] else ""
+        click.echo(
+            f"{stats['root']}: {Text.pluralize('recipe', stats['recipes'])}, "
+            f"{stats['bytes']} bytes{status}"
+        )
+
+    http_stats = HttpCache.stats()
+    click.echo(
+        f"downloads: {Text.pluralize('page', http_stats['pages'])}, "
+        f"{http_stats['bytes']} bytes"
+    )
+
+    ingredient_stats = IngredientCache.stats()
+    click.echo(
+        f"ingredients: {Text.pluralize('sentence', ingredient_stats['sentences'])}, "
+        f"{ingredient_stats['bytes']} bytes"
+    )
+
+
+@cache.command(name="clear", context_settings=CONTEXT_SETTINGS)
+def cache_clear() -> None:
+    """Delete all cached cookbooks, search indexes, downloads and ingredients"""
+    from sous.http_cache import HttpCache
+    from sous.ingredient_cache import IngredientCache
+    from sous.robots import RobotsCache
+
+    removed = (
+        RecipeCache.clear()
+        + SearchIndex.clear(default_cache_directory())
+        + HttpCache.clear()
+        + RobotsCache.clear()
+        + IngredientCache.clear()
+    )
+    click.echo(f"Removed {Text.pluralize('cache file', removed)}")
+
+
 if __name__ == "__main__":
     cli()
@@ -1,26 +1,443 @@
+import logging
 import os
 import sys
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, cast
 
+from sous.bundle import Bundle, BundleEntry
+from sous.document import Document
+from sous.interner import Interner
 from sous.recipe import Recipe
+from sous.recipe_cache import EncodedParagraphs, RecipeCache
+from sous.search_index import SearchIndex
+from sous.timings import Timings
 
 SOUS_FILE_EXTENSION = ".sous"
 
+logger = logging.getLogger(__name__)
+
+
+def _load_recipe(
+    filepath: str, projection: str, interner: Interner | None = None
+) -> Recipe:
+    # Runs in a worker: do all of the reading and parsing there, so that only
+    # the parsed result is handed back.
+    recipe = Recipe(filepath, projection, interner=interner)
+    _ = recipe.document.paragraphs
+    _ = recipe.name
+    return recipe
+
+
+@dataclass
+class CookbookChanges:
+    """The recipes that changed in a call to `Cookbook.refresh()`."""
+
+    added: list[Recipe] = field(default_factory=list)
+    removed: list[Recipe] = field(default_factory=list)
+    modified: list[Recipe] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
 
 class Cookbook:
-    def __init__(self, cookbook_paths: tuple[str], recipe_paths: tuple[str]) -> None:
-        collated_recipe_paths: list[str] = [p for p in recipe_paths]
-
-        for cookbook_path in cookbook_paths:
-            for root, _, files in os.walk(cookbook_path):
-                for file in files:
-                    _, extension = os.path.splitext(file)
-                    if extension == SOUS_FILE_EXTENSION:
-                        collated_recipe_paths.append(os.path.join(root, file))
-
-        self.recipes = []
-        for filepath in collated_recipe_paths:
-            recipe = Recipe(filepath)
-            if recipe.name:
-                self.recipes.append(recipe)
+    POOL_PROCESS = "process"
+    POOL_THREAD = "thread"
+    POOLS = [POOL_PROCESS, POOL_THREAD]
+
+    def __init__(
+        self,
+        cookbook_paths: tuple[str],
+        recipe_paths: tuple[str],
+        projection: str = Document.PROJECTION_FULL,
+        cache_directory: str | None = None,
+        jobs: int = 1,
+        pool: str = POOL_PROCESS,
+        intern: bool = False,
+    ) -> None:
+        """
+        Load every .sous file under `cookbook_paths`, plus `recipe_paths`.
+
+        A cookbook path may also be a bundle written by `Bundle.write`, which
+        is memory-mapped rather than walked, and whose recipes are only parsed
+        once their contents are needed.
+
+        When `cache_directory` is given, recipes under each cookbook path are
+        loaded through a `RecipeCache` stored in that directory, so that only
+        files that changed since the last load are parsed.
+
+        When `jobs` is not 1, files are read and parsed by that many workers
+        (or one per CPU if `jobs` is 0). A process pool suits CPU-bound
+        parsing, while a thread pool suits slow, network-mounted cookbooks.
+        Recipes are always returned, and files without a name are always
+        reported, in the same order as a serial load.
+
+        When `intern` is set, repeated values in the parsed nodes of all
+        recipes are shared through one `Interner`, which makes large cookbooks
+        considerably smaller in memory.
+        """
+        if pool not in self.POOLS:
+            raise ValueError(f"Invalid worker pool: '{pool}'")
+
+        self.cookbook_paths = cookbook_paths
+        self.recipe_paths = recipe_paths
+        self.projection = projection
+        self.jobs = jobs
+        self.pool = pool
+        self.interner = Interner() if intern else None
+
+        with Timings.span("read"):
+            self._caches: dict[str, RecipeCache | None] = {
+                cookbook_path: (
+                    RecipeCache(cookbook_path, cache_directory)
+                    if cache_directory is not None
+                    and not Bundle.is_bundle(cookbook_path)
+                    else None
+                )
+                for cookbook_path in cookbook_paths
+            }
+        # The (inode, mtime, size) of every loaded file, and the recipe it was
+        # loaded as, whether or not that recipe has a name.
+        self._snapshot: dict[str, tuple[int, int, int]] = {}
+        self._loaded: dict[str, Recipe] = {}
+        self._sources: dict[str, RecipeCache | None] = {}
+        self._bundles: dict[str, Bundle] = {}
+        self._search_index: SearchIndex | None = None
+        self._refreshed = False
+        self._lock = threading.Lock()
+
+        self.recipes: list[Recipe] = []
+        self.recipes_by_name: dict[str, Recipe] = {}
+        self.refresh()
+
+    def refresh(self) -> CookbookChanges:
+        """
+        Pick up files that were added, modified or deleted since the last load.
+
+        Every file is stat-ed, but only new and modified files are read and
+        parsed, so the cost of a refresh is dominated by the number of files
+        that changed rather than by the size of the cookbook.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def search(self, query: str) -> list[Recipe]:
+        """
+        Return the recipes that match a `SearchIndex` query, in cookbook order.
+
+        The index is built on first use (unless one was provided through
+        `use_search_index`) and kept up to date by `refresh()`.
+        """
+        # Searched under the lock, so that a concurrent refresh can't change the
+        # index (or the recipes) halfway through a query.
+        with self._lock:
+            paths = self._get_search_index().search(query)
+            return [r for r in self.recipes if r.document.filepath in paths]
+
+    @property
+    def search_index(self) -> SearchIndex:
+        with self._lock:
+            return self._get_search_index()
+
+    def use_search_index(self, search_index: SearchIndex) -> None:
+        """
+        Search with a previously saved index, re-indexing only the recipes that
+        changed since it was saved.
+        """
+        with self._lock:
+            self._search_index = search_index
+            self._sync_search_index()
+
+    def watch(
+        self, callback: Callable[[CookbookChanges], None], interval: float = 1.0
+    ) -> "CookbookWatcher":
+        """Poll for changes every `interval` seconds in a background thread."""
+        watcher = CookbookWatcher(self, callback, interval)
+        watcher.start()
+        return watcher
+
+    def _get_search_index(self) -> SearchIndex:
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+            self._sync_search_index()
+        return self._search_index
+
+    def _refresh(self) -> CookbookChanges:
+        with Timings.span("walk"):
+            collated_recipe_paths: list[
+                tuple[str, RecipeCache | None, BundleEntry | None]
+            ] = [(p, None, None) for p in self.recipe_paths]
+            for cookbook_path, cache in self._caches.items():
+                if Bundle.is_bundle(cookbook_path):
+                    for entry in self._open_bundle(cookbook_path):
+                        collated_recipe_paths.append((entry.filepath, None, entry))
+                    continue
+                for filepath in self.discover(cookbook_path):
+                    collated_recipe_paths.append((filepath, cache, None))
+
+            snapshot: dict[str, tuple[int, int, int]] = {}
+            changed: list[
+                tuple[str, RecipeCache | None, os.stat_result | BundleEntry]
+            ] = []
+            for filepath, cache, entry in collated_recipe_paths:
+                if filepath in snapshot:
+                    continue
+
+                if entry is not None:
+                    # Bundled recipes are stamped from the bundle's index, without
+                    # touching the files they were packed from.
+                    snapshot[filepath] = (0, entry.mtime_ns, entry.length)
+                    self._sources[filepath] = None
+                    if self._snapshot.get(filepath) != snapshot[filepath]:
+                        changed.append((filepath, None, entry))
+                    continue
+
+                try:
+                    stat = os.stat(filepath)
+                except FileNotFoundError:
+                    # A recipe path that is missing when the cookbook is loaded
+                    # is an error, but one deleted later is removed like any
+                    # other file.
+                    if filepath in self.recipe_paths and not self._refreshed:
+                        raise
+                    continue  # Deleted since it was discovered
+
+                snapshot[filepath] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                self._sources[filepath] = cache
+                if self._snapshot.get(filepath) != snapshot[filepath]:
+                    changed.append((filepath, cache, stat))
+
+        with Timings.span("parse"):
+            recipes = self._load(changed)
+
+            changes = CookbookChanges()
+            for (filepath, _, _), recipe in zip(changed, recipes, strict=True):
+                previous = self._loaded.get(filepath)
+                self._loaded[filepath] = recipe
+
+                if not recipe.name:
+                    sys.stderr.write(f"Ignoring recipe with no name at {filepath}\n")
+                    if previous and previous.name:
+                        changes.removed.append(previous)
+                elif previous and previous.name:
+                    changes.modified.append(recipe)
+                else:
+                    changes.added.append(recipe)
+
+        removed = [filepath for filepath in self._snapshot if filepath not in snapshot]
+        for filepath in removed:
+            previous = self._loaded.pop(filepath)
+            if previous.name:
+                changes.removed.append(previous)
+
+            cache = self._sources.pop(filepath)
+            if cache:
+                cache.discard(filepath)
+
+        self._snapshot = snapshot
+        self._refreshed = True
+        self.recipes = [
+            self._loaded[filepath]
+            for filepath in snapshot
+            if self._loaded[filepath].name
+        ]
+        self.recipes_by_name = {
+            cast(str, recipe.name): recipe for recipe in self.recipes
+        }
+
+        for cache in self._caches.values():
+            if cache:
+                cache.save()
+
+        if self._search_index is not None:
+            self._sync_search_index()
+
+        return changes
+
+    def _sync_search_index(self) -> None:
+        assert self._search_index is not None
+        self._search_index.sync(
+            {
+                filepath: (stamp, self._loaded[filepath])
+                for filepath, stamp in self._snapshot.items()
+                if self._loaded[filepath].name
+            }
+        )
+
+    def _open_bundle(self, path: str) -> Bundle:
+        stat = os.stat(path)
+        bundle = self._bundles.get(path)
+        if bundle is None or bundle.stamp != (
+            stat.st_ino,
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            bundle = self._bundles[path] = Bundle(path)
+        return bundle
+
+    @classmethod
+    def discover(cls, directory: str) -> Iterator[str]:
+        """
+        Yield the .sous files under `directory` in the same order as `os.walk`,
+        using the file types that `os.scandir` already knows about instead of
+        a stat per entry.
+        """
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+
+        subdirectories: list[str] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if not is_dir:
+                _, extension = os.path.splitext(entry.name)
+                if extension == SOUS_FILE_EXTENSION:
+                    yield entry.path
+            elif not entry.is_symlink():
+                subdirectories.append(entry.path)
+
+        for subdirectory in subdirectories:
+            yield from cls.discover(subdirectory)
+
+    def _load(
+        self,
+        collated_recipe_paths: list[
+            tuple[str, RecipeCache | None, os.stat_result | BundleEntry]
+        ],
+    ) -> list[Recipe]:
+        projection = self.projection
+        interner = self.interner
+
+        recipes: list[Recipe | None] = [None] * len(collated_recipe_paths)
+        misses: list[tuple[int, os.stat_result]] = []
+        uncached: list[int] = []
+
+        for index, (filepath, cache, stat) in enumerate(collated_recipe_paths):
+            if isinstance(stat, BundleEntry):
+                recipes[index] = stat.recipe(projection, interner)
+                continue
+
+            if cache is None:
+                uncached.append(index)
+                continue
+
+            stat, recipe = cache.get(filepath, stat, projection, interner)
+            if recipe is None:
+                misses.append((index, stat))
             else:
-                sys.stderr.write(f"Ignoring recipe with no name at {filepath}\n")
+                recipes[index] = recipe
+
+        workers = self.jobs if self.jobs > 0 else os.cpu_count() or 1
+        executor: Executor | None = None
+        if workers > 1 and len(misses) + len(uncached) > 1:
+            if self.pool == self.POOL_PROCESS:
+                # Imported here since multiprocessing is slow to import, and
+                # most runs are served from the cache without a pool.
+                from concurrent.futures import ProcessPoolExecutor
+
+                executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers)
+
+        def parallel_map(
+            fn: Callable[[str], Any], filepaths: list[str]
+        ) -> Iterator[Any]:
+            if executor is None:
+                return map(fn, filepaths)
+            # Hand each worker a few large batches to amortize the overhead of
+            # shipping work to another process.
+            chunksize = max(1, (len(misses) + len(uncached)) // (workers * 4))
+            return executor.map(fn, filepaths, chunksize=chunksize)
+
+        try:
+            miss_paths = [collated_recipe_paths[index][0] for index, _ in misses]
+            parsed: Iterator[EncodedParagraphs] = parallel_map(
+                RecipeCache.parse, miss_paths
+            )
+
+            uncached_paths = [collated_recipe_paths[index][0] for index in uncached]
+            in_process = executor is None or self.pool != self.POOL_PROCESS
+            loaded: Iterator[Recipe] = parallel_map(
+                partial(
+                    Recipe if executor is None else _load_recipe,
+                    projection=projection,
+                    # An interner can't be shared with other processes, so
+                    # recipes parsed in one are interned once they're back.
+                    interner=interner if in_process else None,
+                ),
+                uncached_paths,
+            )
+
+            for (index, stat), encoded_paragraphs in zip(misses, parsed, strict=True):
+                filepath, cache, _ = collated_recipe_paths[index]
+                assert cache is not None
+                cache.put(filepath, stat, encoded_paragraphs)
+                recipes[index] = cache.to_recipe(filepath, projection, interner)
+
+            for index, recipe in zip(uncached, loaded, strict=True):
+                if interner is not None and not in_process:
+                    document = recipe.document
+                    document.interner = interner
+                    document.paragraphs = [
+                        [interner.node(node) for node in paragraph]
+                        for paragraph in document.paragraphs
+                    ]
+                recipes[index] = recipe
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return cast(list[Recipe], recipes)
+
+
+class CookbookWatcher:
+    """
+    Refreshes a cookbook periodically and reports any changes.
+
+    A refresh that fails is logged and tried again at the next interval; its
+    error is kept in `last_error` until a refresh succeeds.
+    """
+
+    def __init__(
+        self,
+        cookbook: Cookbook,
+        callback: Callable[[CookbookChanges], None],
+        interval: float = 1.0,
+    ) -> None:
+        self.cookbook = cookbook
+        self.callback = callback
+        self.interval = interval
+        self.last_error: str | None = None
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                changes = self.cookbook.refresh()
+            except Exception as e:
+                logger.exception("Failed to refresh the cookbook")
+                self.last_error = f"{type(e).__name__}: {e}"
+                continue
+
+            self.last_error = None
+            if changes:
+                self.callback(changes)
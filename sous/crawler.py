@@ -0,0 +1,119 @@
+import heapq
+import time
+import urllib.parse
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class CrawlResult:
+    url: str
+    result: Any = None
+    error: Exception | None = None
+    attempts: int = 1
+
+
+@dataclass
+class _Host:
+    index: int
+    urls: deque[tuple[str, int]] = field(default_factory=deque)
+
+
+class Crawler:
+    """
+    Fetches many URLs concurrently while staying polite to each host.
+
+    Requests to the same host are made one at a time, `delay_for(url)`
+    seconds apart (from the start of one request to the start of the next),
+    while requests to different hosts run side by side on up to `workers`
+    threads. A URL file that spans many sites therefore takes about as long as
+    its slowest host allows, rather than the sum of every host's delays.
+
+    Failures that `is_transient` accepts are retried up to `retries` times,
+    after `backoff` seconds and then twice as long each time; any other
+    failure, or the last one, is reported in the URL's `CrawlResult`.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Any],
+        delay_for: Callable[[str], float],
+        workers: int = 8,
+        retries: int = 3,
+        backoff: float = 1.0,
+        is_transient: Callable[[Exception], bool] = lambda _: False,
+    ) -> None:
+        self.fetch = fetch
+        self.delay_for = delay_for
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.is_transient = is_transient
+
+    def run(self, urls: Iterable[str]) -> Iterator[CrawlResult]:
+        """Fetch every URL, yielding results in the order they complete."""
+        hosts: dict[str, _Host] = {}
+        for url in urls:
+            host = self.host(url)
+            if host not in hosts:
+                hosts[host] = _Host(len(hosts))
+            hosts[host].urls.append((url, 1))
+
+        # Hosts that have URLs left and no request in flight, by when they may
+        # next be requested. Ties go to hosts in the order of the URL file.
+        ready = [(0.0, state.index, host) for host, state in hosts.items()]
+        in_flight: dict[
+            Future[tuple[Any, Exception | None, float]], tuple[str, str, int, float]
+        ] = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while ready or in_flight:
+                now = time.monotonic()
+                while ready and ready[0][0] <= now and len(in_flight) < self.workers:
+                    _, _, host = heapq.heappop(ready)
+                    url, attempt = hosts[host].urls.popleft()
+                    future = executor.submit(self._fetch, url)
+                    in_flight[future] = (host, url, attempt, now)
+
+                timeout = None
+                if ready and len(in_flight) < self.workers:
+                    timeout = max(0.0, ready[0][0] - now)
+                if not in_flight:
+                    time.sleep(timeout or 0.0)
+                    continue
+
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, url, attempt, started_at = in_flight.pop(future)
+                    state = hosts[host]
+                    result, error, delay = future.result()
+                    ready_at = max(time.monotonic(), started_at + delay)
+
+                    if error is None:
+                        yield CrawlResult(url, result=result, attempts=attempt)
+                    elif attempt <= self.retries and self.is_transient(error):
+                        state.urls.appendleft((url, attempt + 1))
+                        backoff = self.backoff * 2 ** (attempt - 1)
+                        ready_at = max(ready_at, time.monotonic() + backoff)
+                    else:
+                        yield CrawlResult(url, error=error, attempts=attempt)
+
+                    if state.urls:
+                        heapq.heappush(ready, (ready_at, state.index, host))
+
+    def _fetch(self, url: str) -> tuple[Any, Exception | None, float]:
+        try:
+            result, error = self.fetch(url), None
+        except Exception as e:
+            result, error = None, e
+
+        # The delay is looked up in the worker too, so that each host's
+        # robots.txt is fetched in parallel rather than by the scheduler.
+        return result, error, self.delay_for(url)
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urllib.parse.urlsplit(url).netloc.lower()
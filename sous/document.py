@@ -1,31 +1,103 @@
+import io
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from functools import cached_property
+
 from sous.attribute import Attribute
 from sous.comment import Comment
 from sous.header import Header
 from sous.ingredient import Ingredient
+from sous.interner import Interner
+from sous.lexer import Lexer, Node
 from sous.prose import Prose
-
-type Node = Header | Attribute | Comment | Ingredient | Prose
+from sous.timings import Timings
 
 
 class Document:
-    def __init__(self, filepath: str) -> None:
-        self.filepath = filepath
-        self.paragraphs: list[list[Node]] = []
-
-        with open(filepath) as file:
-            paragraph: list[Node] = []
-
-            for line in file:
-                contents = line.strip()
-
-                if contents:
-                    paragraph.append(self._parse_line(contents))
-                elif len(paragraph):
-                    self.paragraphs.append(paragraph)
-                    paragraph = []
+    """
+    A parsed .sous file.
+
+    Parsing is lazy: nothing is read until `nodes()` or `paragraphs` is
+    accessed, and `nodes()` only reads as much of the file as its caller
+    consumes. A projection limits which nodes are produced:
+
+    - "name": only the first header; reading stops as soon as it is found
+    - "ingredients": headers, attributes and ingredients (block definitions,
+      and prose only when it contains inline definitions)
+    - "full": every node
+
+    Nodes are passed through `interner`, if one is given, as they are parsed.
+    """
+
+    PROJECTION_NAME = "name"
+    PROJECTION_INGREDIENTS = "ingredients"
+    PROJECTION_FULL = "full"
+    PROJECTIONS = [PROJECTION_NAME, PROJECTION_INGREDIENTS, PROJECTION_FULL]
+
+    PROJECTION_NODE_TYPES: dict[str, frozenset[type]] = {
+        PROJECTION_NAME: frozenset([Header]),
+        PROJECTION_INGREDIENTS: frozenset([Header, Attribute, Ingredient, Prose]),
+        PROJECTION_FULL: frozenset([Header, Attribute, Comment, Ingredient, Prose]),
+    }
+
+    def __init__(
+        self,
+        filepath: str,
+        text: str | None = None,
+        projection: str = PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> None:
+        if projection not in self.PROJECTIONS:
+            raise ValueError(f"Invalid document projection: '{projection}'")
 
-            if len(paragraph):
-                self.paragraphs.append(paragraph)
+        self.filepath = filepath
+        self.projection = projection
+        self.interner = interner
+        self._text = text
+
+    @classmethod
+    def from_string(
+        cls,
+        text: str,
+        filepath: str = "<string>",
+        projection: str = PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> "Document":
+        """Parse a document from the contents of a .sous file."""
+        return cls(filepath, text, projection, interner)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        filepath: str = "<bytes>",
+        encoding: str = "utf-8",
+        projection: str = PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> "Document":
+        """Parse a document from the encoded contents of a .sous file."""
+        return cls.from_string(data.decode(encoding), filepath, projection, interner)
+
+    def project(self, projection: str) -> "Document":
+        """Return a new, unparsed document over the same source."""
+        return Document(self.filepath, self._text, projection, self.interner)
+
+    @cached_property
+    def paragraphs(self) -> list[list[Node]]:
+        return list(self._paragraphs())
+
+    def nodes(self) -> Iterator[Node]:
+        """
+        Yield the nodes in this document's projection, in order.
+
+        Unless `paragraphs` has already been computed, the source is read
+        incrementally and closed as soon as the caller stops iterating.
+        """
+        paragraphs = self.__dict__.get("paragraphs")
+
+        for paragraph in paragraphs if paragraphs is not None else self._paragraphs():
+            yield from paragraph
 
     def summarize(self) -> str:
         result: list[str] = []
@@ -43,21 +115,77 @@ class Document:
 
         return "\n".join(result)
 
-    def _parse_line(self, line: str) -> Node:
-        header = Header.RE.match(line)
-        if header:
-            return Header(len(header.group("level")), header.group("name"))
+    def _open(self) -> AbstractContextManager[Iterable[str]]:
+        if self._text is not None:
+            return nullcontext(io.StringIO(self._text, newline=None))
+
+        Timings.count("files")
+        return open(self.filepath)
 
-        attribute = Attribute.RE.match(line)
-        if attribute:
-            return Attribute(attribute.group("name"), attribute.group("value"))
+    def _paragraphs(self) -> Iterator[list[Node]]:
+        if Timings.enabled:
+            return self._counted(self._parse_paragraphs())
+        return self._parse_paragraphs()
 
-        comment = Comment.RE.match(line)
-        if comment:
-            return Comment(comment.group("comment"))
+    def _parse_paragraphs(self) -> Iterator[list[Node]]:
+        node_types = self.PROJECTION_NODE_TYPES[self.projection]
+        full = self.projection == self.PROJECTION_FULL
 
-        block_ingredient_def = Ingredient.parse_block_definition(line)
-        if block_ingredient_def:
-            return block_ingredient_def
+        with self._open() as lines:
+            if Timings.enabled:
+                lines = self._counted_lines(lines)
+            paragraph: list[Node] = []
+
+            for line in lines:
+                contents = line.strip()
+
+                if not contents:
+                    if len(paragraph):
+                        yield paragraph
+                        paragraph = []
+                    continue
+
+                if full:
+                    node = self._parse_line(contents)
+                else:
+                    node = Lexer.project_line(contents, node_types)
+
+                    if node is None:
+                        continue
+                    if isinstance(node, Prose) and not node.ingredients:
+                        continue
 
-        return Prose(line, Ingredient.parse_inline_definitions(line))
+                if self.interner is not None:
+                    node = self.interner.node(node)
+
+                if self.projection == self.PROJECTION_NAME:
+                    yield [node]
+                    return
+
+                paragraph.append(node)
+
+            if len(paragraph):
+                yield paragraph
+
+    @staticmethod
+    def _counted_lines(lines: Iterable[str]) -> Iterator[str]:
+        count = 0
+        try:
+            for line in lines:
+                count += 1
+                yield line
+        finally:
+            Timings.count("lines", count)
+
+    @staticmethod
+    def _counted(paragraphs: Iterator[list[Node]]) -> Iterator[list[Node]]:
+        counts: Counter[str] = Counter()
+        try:
+            for paragraph in paragraphs:
+                counts.update(f"{type(node).__name__} nodes" for node in paragraph)
+                yield paragraph
+        finally:
+            Timings.add(counts)
+
+    def _parse_line(self, line: str) -> Node:
+        return Lexer.parse_line(line)
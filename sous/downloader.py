@@ -1,26 +1,50 @@
 import json
+import threading
+import urllib.parse
 import urllib.robotparser
-from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
 
 import requests
 from recipe_scrapers import scrape_html
 
+from sous.http_cache import HttpCache
+from sous.robots import RobotsCache
 from sous.scraped_recipe import ScrapedRecipe
+from sous.timings import Timings
 
 NYT_COOKING_BASE_URL = "https://cooking.nytimes.com"
-NYT_COOKING_ROBOTS_URL = f"{NYT_COOKING_BASE_URL}/robots.txt"
 DEFAULT_CRAWL_DELAY_SECONDS = 5
+REQUEST_TIMEOUT_SECONDS = 30
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
 
 
 class Downloader:
     def __init__(
-        self, robots_parser: Optional[urllib.robotparser.RobotFileParser] = None
+        self,
+        robots_parser: Optional[urllib.robotparser.RobotFileParser] = None,
+        http_cache: HttpCache | None = None,
+        robots: RobotsCache | None = None,
     ) -> None:
-        self.robots_parser = robots_parser or self.__robots_file_parser(
-            NYT_COOKING_ROBOTS_URL
-        )
+        """
+        Pages are downloaded through `http_cache` when one is given, and only
+        ever read from it when it is offline.
+
+        Each site's robots.txt comes from `robots`, and only once a page from
+        that site is downloaded, so reading local files never touches the
+        network. `robots_parser`, if given, is used for NYT Cooking instead.
+        """
+        self.http_cache = http_cache
+        self.offline = http_cache is not None and http_cache.offline
+        self.robots = robots or RobotsCache(offline=self.offline)
+
+        # One pooled session per host, so that concurrent downloads from
+        # different hosts don't share (or wait on) a connection.
+        self._sessions: dict[str, requests.Session] = {}
+        self._robots_parsers: dict[str, urllib.robotparser.RobotFileParser] = {}
+        if robots_parser is not None:
+            self._robots_parsers[self.__origin(NYT_COOKING_BASE_URL)] = robots_parser
+        self._lock = threading.Lock()
 
     def download(self, source: str) -> ScrapedRecipe:
         recipe_json = None
@@ -36,25 +60,58 @@ class Downloader:
 
         return ScrapedRecipe(recipe_json)
 
-    # TODO: Update this method to take a URL and produce the right delay for
-    # that URL in particular.
-    @cached_property
-    def delay(self) -> int:
-        requested_crawl_delay = self.robots_parser.crawl_delay("*")
-        return requested_crawl_delay or DEFAULT_CRAWL_DELAY_SECONDS
+    def delay_for(self, url: str) -> float:
+        """The number of seconds to wait between requests to the URL's host."""
+        if not url.startswith("http") or self.offline:
+            return 0
+
+        requested_crawl_delay = self.robots_parser_for(url).crawl_delay("*")
+        return float(requested_crawl_delay or DEFAULT_CRAWL_DELAY_SECONDS)
+
+    def robots_parser_for(self, url: str) -> urllib.robotparser.RobotFileParser:
+        robots_parser = self._robots_parsers.get(self.__origin(url))
+        return robots_parser or self.robots.parser_for(url)
+
+    def session_for(self, url: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(self.__origin(url))
+            if session is None:
+                session = self._sessions[self.__origin(url)] = requests.Session()
+            return session
+
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        """Whether a failed download is worth retrying."""
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in TRANSIENT_STATUS_CODES
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
 
     def __download_nyt_recipe(self, url: str) -> dict[Any, Any]:
-        if not self.robots_parser.can_fetch("*", url):
-            raise
+        if not self.offline and not self.robots_parser_for(url).can_fetch("*", url):
+            raise PermissionError(f"robots.txt doesn't allow downloading {url}")
 
-        return scrape_html(requests.get(url).text, org_url=url).to_json()  # type: ignore
+        html = self.__get(url)
+        with Timings.span("scrape"):
+            return scrape_html(html, org_url=url).to_json()  # type: ignore
 
     def __download_arbitrary_recipe(self, url: str) -> dict[Any, Any]:
-        return scrape_html(
-            requests.get(url).text, org_url=url, wild_mode=True
-        ).to_json()  # type: ignore
-
-    def __robots_file_parser(self, root_url: str) -> urllib.robotparser.RobotFileParser:
-        robots = urllib.robotparser.RobotFileParser(root_url)
-        robots.read()
-        return robots
+        html = self.__get(url)
+        with Timings.span("scrape"):
+            return scrape_html(html, org_url=url, wild_mode=True).to_json()  # type: ignore
+
+    def __get(self, url: str) -> str:
+        Timings.count("downloads")
+        with Timings.span("download"):
+            if self.http_cache is not None:
+                return self.http_cache.get(
+                    self.session_for(url), url, timeout=REQUEST_TIMEOUT_SECONDS
+                )
+
+            response = self.session_for(url).get(url, timeout=REQUEST_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            return response.text
+
+    @staticmethod
+    def __origin(url: str) -> str:
+        parts = urllib.parse.urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc.lower()}"
@@ -0,0 +1,230 @@
+import os
+import socket
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+DUMP_JOURNAL_FILE_NAME = ".sous-dump.sqlite3"
+DEFAULT_LEASE_SECONDS = 10 * 60
+THROUGHPUT_WINDOW_SECONDS = 10 * 60
+
+
+@dataclass
+class DumpStatus:
+    pending: int = 0
+    claimed: int = 0
+    done: int = 0
+    failed: int = 0
+    workers: int = 0
+    # Jobs finished per second over the last THROUGHPUT_WINDOW_SECONDS.
+    throughput: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.pending + self.claimed + self.done + self.failed
+
+
+class DumpJournal:
+    """
+    A SQLite table of the URLs to dump, and how each one went.
+
+    Every URL is a job that is pending, claimed by a worker, done (with the
+    path it was saved to) or failed (with its error). Workers claim pending
+    jobs in batches inside a write transaction, so several `sous dump`
+    processes can share one journal without dumping a URL twice. A claim
+    lapses after `lease` seconds without word from its worker, so that the
+    jobs of a worker that crashed are picked up by the others; a worker
+    renews its claims whenever it records a result (or calls `renew`), and
+    releases those it won't finish when it stops.
+
+    The journal doesn't use SQLite's write-ahead log, which needs shared
+    memory, so that workers on different machines can share it over a
+    network filesystem with working locks.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_CLAIMED = "claimed"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    def __init__(
+        self,
+        path: str,
+        worker: str | None = None,
+        lease: float = DEFAULT_LEASE_SECONDS,
+    ) -> None:
+        self.path = path
+        self.worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease = lease
+        self._renewed_at = 0.0
+
+        # Transactions are managed explicitly, so that claims can take the
+        # write lock before reading which jobs are free.
+        self._connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "url TEXT PRIMARY KEY, "
+            "status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "output_path TEXT, "
+            "error TEXT, "
+            "worker TEXT, "
+            "claimed_at REAL, "
+            "finished_at REAL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, claimed_at)"
+        )
+
+    @staticmethod
+    def path_for(output_directory_path: str) -> str:
+        return os.path.join(output_directory_path, DUMP_JOURNAL_FILE_NAME)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def add(self, urls: Iterable[str]) -> int:
+        """Add jobs for URLs that aren't in the journal yet, and count them."""
+        with self._transaction():
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO jobs (url, status) VALUES (?, ?)",
+                ((url, self.STATUS_PENDING) for url in urls),
+            )
+            return self._connection.total_changes - before
+
+    def retry_failed(self) -> int:
+        """Make every failed job pending again, and count them."""
+        with self._transaction():
+            return self._connection.execute(
+                "UPDATE jobs SET status = ?, error = NULL WHERE status = ?",
+                (self.STATUS_PENDING, self.STATUS_FAILED),
+            ).rowcount
+
+    def claim(self, limit: int) -> list[str]:
+        """
+        Claim up to `limit` jobs that are pending, or whose claim has lapsed,
+        and return their URLs in the order they were added.
+        """
+        now = time.time()
+        with self._transaction():
+            urls = [
+                url
+                for (url,) in self._connection.execute(
+                    "SELECT url FROM jobs "
+                    "WHERE status = ? OR (status = ? AND claimed_at < ?) "
+                    "ORDER BY rowid LIMIT ?",
+                    (
+                        self.STATUS_PENDING,
+                        self.STATUS_CLAIMED,
+                        now - self.lease,
+                        limit,
+                    ),
+                )
+            ]
+            self._connection.executemany(
+                "UPDATE jobs SET status = ?, worker = ?, claimed_at = ? WHERE url = ?",
+                ((self.STATUS_CLAIMED, self.worker, now, url) for url in urls),
+            )
+        return urls
+
+    def release(self) -> int:
+        """
+        Make the jobs this worker claimed but didn't finish pending again, for
+        the next worker to claim without waiting for the lease to lapse, and
+        count them.
+        """
+        with self._transaction():
+            return self._connection.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, claimed_at = NULL "
+                "WHERE status = ? AND worker = ?",
+                (self.STATUS_PENDING, self.STATUS_CLAIMED, self.worker),
+            ).rowcount
+
+    def renew(self) -> None:
+        """
+        Renew the lease on this worker's claims, for a worker that is making
+        progress without recording results. Only written once a tenth of the
+        lease has gone by since the last renewal, so it can be called often.
+        """
+        now = time.time()
+        if now - self._renewed_at < self.lease / 10:
+            return
+        with self._transaction():
+            self._renew(now)
+
+    def complete(self, url: str, output_path: str, attempts: int = 1) -> None:
+        self._finish(url, self.STATUS_DONE, attempts, output_path=output_path)
+
+    def fail(self, url: str, error: str, attempts: int = 1) -> None:
+        self._finish(url, self.STATUS_FAILED, attempts, error=error)
+
+    def failures(self) -> list[tuple[str, str]]:
+        """Return the URL and error of every failed job."""
+        return self._connection.execute(
+            "SELECT url, error FROM jobs WHERE status = ? ORDER BY rowid",
+            (self.STATUS_FAILED,),
+        ).fetchall()
+
+    def status(self) -> DumpStatus:
+        now = time.time()
+        status = DumpStatus()
+        for name, count in self._connection.execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        ):
+            setattr(status, name, count)
+
+        status.workers = self._connection.execute(
+            "SELECT COUNT(DISTINCT worker) FROM jobs "
+            "WHERE status = ? AND claimed_at >= ?",
+            (self.STATUS_CLAIMED, now - self.lease),
+        ).fetchone()[0]
+
+        # Measured from the first job finished in the window, so that a dump
+        # that started a minute ago isn't averaged over ten.
+        finished, first = self._connection.execute(
+            "SELECT COUNT(*), MIN(finished_at) FROM jobs WHERE finished_at >= ?",
+            (now - THROUGHPUT_WINDOW_SECONDS,),
+        ).fetchone()
+        if finished:
+            status.throughput = finished / max(now - first, 1.0)
+        return status
+
+    def _finish(
+        self,
+        url: str,
+        status: str,
+        attempts: int,
+        output_path: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        now = time.time()
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + ?, "
+                "output_path = ?, error = ?, finished_at = ? WHERE url = ?",
+                (status, attempts, output_path, error, now, url),
+            )
+            # Hearing from a worker renews the lease on the rest of its claims.
+            self._renew(now)
+
+    def _renew(self, now: float) -> None:
+        self._connection.execute(
+            "UPDATE jobs SET claimed_at = ? WHERE status = ? AND worker = ?",
+            (now, self.STATUS_CLAIMED, self.worker),
+        )
+        self._renewed_at = now
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # Takes the write lock up front, so that what a transaction reads
+        # can't be changed by another worker before it writes.
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
@@ -0,0 +1,174 @@
+import fcntl
+import json
+import os
+import sqlite3
+import struct
+import time
+import zlib
+from collections.abc import Iterator
+from typing import Any
+
+DUMP_STORE_DATA_FILE_NAME = "recipes.jsonl.z"
+DUMP_STORE_INDEX_FILE_NAME = "index.sqlite3"
+DEFAULT_CHUNK_SIZE = 64
+
+# Every chunk starts with this header: magic, then the length of its
+# compressed JSON Lines.
+CHUNK_MAGIC = b"SDC1"
+CHUNK_HEADER = struct.Struct("<4sI")
+
+
+class DumpStore:
+    """
+    Dumped recipes, as compressed JSON Lines in a single append-only file.
+
+    Recipes are added under an id (their URL, for `sous dump`) and written
+    `chunk_size` at a time as one zlib-compressed chunk of JSON Lines, which
+    takes a fraction of the space, and of the files, of one pretty-printed
+    JSON file per recipe. An index in a SQLite file next to the data maps each
+    id, and title, to its chunk, so single recipes can be read without
+    decompressing the rest. Adding a recipe under an id again supersedes the
+    earlier one.
+
+    Several processes can add to the same store; chunks are appended under an
+    exclusive lock on the data file.
+    """
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+
+        os.makedirs(path, exist_ok=True)
+        self._data_path = os.path.join(path, DUMP_STORE_DATA_FILE_NAME)
+        self._index = sqlite3.connect(
+            os.path.join(path, DUMP_STORE_INDEX_FILE_NAME),
+            timeout=60,
+            check_same_thread=False,
+        )
+        with self._index:
+            self._index.execute(
+                "CREATE TABLE IF NOT EXISTS recipes ("
+                "id TEXT PRIMARY KEY, title TEXT, offset INTEGER, line INTEGER, "
+                "added_at REAL)"
+            )
+            self._index.execute(
+                "CREATE INDEX IF NOT EXISTS recipes_by_title ON recipes (title)"
+            )
+
+        self._pending: list[tuple[str, dict[Any, Any]]] = []
+        # The most recently read chunk, since reads tend to be in order.
+        self._chunk: tuple[int, list[str]] | None = None
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.isfile(os.path.join(path, DUMP_STORE_DATA_FILE_NAME))
+
+    @staticmethod
+    def output_path(recipe_id: str) -> str:
+        """Where a dump journal records a recipe in a store as written to."""
+        return f"store:{recipe_id}"
+
+    def __enter__(self) -> "DumpStore":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.flush()
+        self._index.close()
+
+    def add(self, recipe_id: str, recipe_json: dict[Any, Any]) -> bool:
+        """
+        Add a recipe, which is written once a chunk fills up or on `flush()`,
+        and return whether this wrote every recipe added so far.
+        """
+        self._pending.append((recipe_id, recipe_json))
+        if len(self._pending) < self.chunk_size:
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+
+        lines = "".join(
+            json.dumps(recipe_json, ensure_ascii=False) + "\n"
+            for _, recipe_json in self._pending
+        )
+        compressed = zlib.compress(lines.encode("utf-8"))
+
+        with open(self._data_path, "ab") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            offset = fh.seek(0, os.SEEK_END)
+            fh.write(CHUNK_HEADER.pack(CHUNK_MAGIC, len(compressed)))
+            fh.write(compressed)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        # A chunk is only visible once indexed, so a crash before this point
+        # leaves unreachable bytes but no partial recipes.
+        now = time.time()
+        with self._index:
+            self._index.executemany(
+                "INSERT OR REPLACE INTO recipes VALUES (?, ?, ?, ?, ?)",
+                (
+                    (recipe_id, recipe_json.get("title"), offset, line, now)
+                    for line, (recipe_id, recipe_json) in enumerate(self._pending)
+                ),
+            )
+        self._pending.clear()
+
+    def get(self, recipe_id: str) -> dict[Any, Any] | None:
+        row = self._index.execute(
+            "SELECT offset, line FROM recipes WHERE id = ?", (recipe_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(self._read_chunk(row[0])[row[1]])
+
+    def find(self, title: str) -> list[str]:
+        """Return the ids of the recipes with the given title."""
+        return [
+            recipe_id
+            for (recipe_id,) in self._index.execute(
+                "SELECT id FROM recipes WHERE title = ? ORDER BY offset, line",
+                (title,),
+            )
+        ]
+
+    def entries(self) -> list[tuple[str, str | None, float]]:
+        """
+        Return the id, title and time added of every recipe, in the order they
+        are stored, which is the fastest order to read them in.
+        """
+        return self._index.execute(
+            "SELECT id, title, added_at FROM recipes ORDER BY offset, line"
+        ).fetchall()
+
+    def __len__(self) -> int:
+        return self._index.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def __iter__(self) -> Iterator[tuple[str, dict[Any, Any]]]:
+        """Yield the id and JSON of every recipe, in the order they are stored."""
+        for recipe_id, _, _ in self.entries():
+            recipe_json = self.get(recipe_id)
+            if recipe_json is not None:
+                yield recipe_id, recipe_json
+
+    def _read_chunk(self, offset: int) -> list[str]:
+        if self._chunk is not None and self._chunk[0] == offset:
+            return self._chunk[1]
+
+        with open(self._data_path, "rb") as fh:
+            fh.seek(offset)
+            magic, length = CHUNK_HEADER.unpack(fh.read(CHUNK_HEADER.size))
+            if magic != CHUNK_MAGIC:
+                raise ValueError(f"No chunk at offset {offset} of {self._data_path}")
+            # Not splitlines(), which also splits on characters that JSON
+            # leaves unescaped, such as U+2028.
+            lines = zlib.decompress(fh.read(length)).decode("utf-8").split("\n")
+
+        self._chunk = (offset, lines)
+        return lines
@@ -0,0 +1,174 @@
+import hashlib
+import marshal
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import requests
+
+from sous.recipe_cache import default_cache_directory
+
+HTTP_CACHE_FILE_EXTENSION = ".http"
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+
+class OfflineCacheMiss(LookupError):
+    pass
+
+
+class HttpCache:
+    """
+    An on-disk cache of downloaded pages, revalidated with conditional requests.
+
+    Each page is stored with its ETag and Last-Modified headers. Fetching it
+    again sends them back as If-None-Match and If-Modified-Since, and a `304
+    Not Modified` response is answered from disk, so re-downloading pages that
+    haven't changed costs a round trip but no transfer. Once the cache holds
+    more than `max_bytes`, the least recently used pages are evicted.
+
+    In `offline` mode the network is never used: cached pages are returned as
+    they are, and any other page raises `OfflineCacheMiss`.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        offline: bool = False,
+    ) -> None:
+        self.directory = directory or default_cache_directory("http")
+        self.max_bytes = max_bytes
+        self.offline = offline
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        # Entry path -> size, from least to most recently used. Built on the
+        # first write, since reads don't need it.
+        self._sizes: OrderedDict[str, int] | None = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, session: requests.Session, url: str, timeout: float) -> str:
+        """Return the text of the page at `url`, from the cache if it is fresh."""
+        path = self._path(url)
+        entry = self.read(path)
+
+        if self.offline:
+            if entry is None:
+                raise OfflineCacheMiss(f"Not in the download cache: {url}")
+            self._touch(path)
+            self.hits += 1
+            return entry["text"]
+
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            self._touch(path)
+            self.revalidated += 1
+            return entry["text"]
+
+        response.raise_for_status()
+        self.misses += 1
+        self.put(
+            path,
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "text": response.text,
+            },
+        )
+        return response.text
+
+    def put(self, path: str, entry: dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            marshal.dump(entry, fh)
+            size = fh.tell()
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            sizes = self._load_sizes()
+            self._total += size - sizes.pop(path, 0)
+            sizes[path] = size
+
+            while self._total > self.max_bytes and len(sizes) > 1:
+                evicted, evicted_size = sizes.popitem(last=False)
+                self._total -= evicted_size
+                try:
+                    os.unlink(evicted)
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def read(path: str) -> dict[str, Any] | None:
+        try:
+            with open(path, "rb") as fh:
+                return marshal.load(fh)
+        except OSError, EOFError, ValueError, TypeError:
+            return None
+
+    @classmethod
+    def stats(cls, directory: str | None = None) -> dict[str, int]:
+        """Count the pages, and their size, in the given cache directory."""
+        directory = directory or default_cache_directory("http")
+        pages = size = 0
+        if os.path.isdir(directory):
+            for entry in os.scandir(directory):
+                if entry.name.endswith(HTTP_CACHE_FILE_EXTENSION):
+                    pages += 1
+                    size += entry.stat().st_size
+        return {"pages": pages, "bytes": size}
+
+    @classmethod
+    def clear(cls, directory: str | None = None) -> int:
+        """Delete every page in the given cache directory."""
+        directory = directory or default_cache_directory("http")
+        if not os.path.isdir(directory):
+            return 0
+
+        removed = 0
+        for name in os.listdir(directory):
+            if name.endswith(HTTP_CACHE_FILE_EXTENSION):
+                os.unlink(os.path.join(directory, name))
+                removed += 1
+        return removed
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self.directory, key + HTTP_CACHE_FILE_EXTENSION)
+
+    def _touch(self, path: str) -> None:
+        # Modification times double as last-use times, so that the order of
+        # use survives between runs.
+        try:
+            os.utime(path)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._sizes is not None and path in self._sizes:
+                self._sizes.move_to_end(path)
+
+    def _load_sizes(self) -> "OrderedDict[str, int]":
+        if self._sizes is None:
+            entries: list[tuple[int, str, int]] = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(HTTP_CACHE_FILE_EXTENSION):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, entry.path, stat.st_size))
+
+            self._sizes = OrderedDict((path, size) for _, path, size in sorted(entries))
+            self._total = sum(self._sizes.values())
+        return self._sizes
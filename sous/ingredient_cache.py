@@ -0,0 +1,371 @@
+import importlib.metadata
+import marshal
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Any, Optional
+
+from sous.recipe_cache import default_cache_directory
+from sous.timings import Timings
+
+INGREDIENT_CACHE_FILE_NAME = "ingredients.sqlite3"
+DEFAULT_MEMORY_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 256
+
+# Bump whenever a change here changes what is stored for a sentence.
+INGREDIENT_CACHE_VERSION = 1
+
+type EncodedQuantity = tuple[int, int] | str
+type Parser = Callable[[list[str]], list[Any]]
+
+
+def parse_sentences(sentences: list[str]) -> list[Any]:
+    """Parse ingredient sentences with `ingredient_parser`, in one call."""
+    # Imported here since loading the parser's model is slow.
+    from ingredient_parser import parse_multiple_ingredients
+
+    return parse_multiple_ingredients(sentences)
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedName:
+    text: str
+    confidence: float
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedAmount:
+    quantity: Fraction | str
+    quantity_max: Fraction | str
+    unit: str
+    RANGE: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedIngredient:
+    """The parts of an `ingredient_parser` result that `.sous` files use."""
+
+    name: tuple[ParsedName, ...]
+    amount: ParsedAmount | None = None
+    preparation: str | None = None
+
+    @classmethod
+    def from_parser(cls, parsed: Any) -> "ParsedIngredient":  # noqa: ANN401
+        amount = None
+        if parsed.amount:
+            first = parsed.amount[0]
+            if hasattr(first, "quantity"):
+                amount = ParsedAmount(
+                    first.quantity,
+                    first.quantity_max,
+                    str(first.unit) if first.unit else "",
+                    bool(first.RANGE),
+                )
+            else:
+                # A composite amount, such as "1 lb 2 oz", is kept as written.
+                amount = ParsedAmount(first.text, first.text, "")
+
+        return cls(
+            name=tuple(ParsedName(n.text, n.confidence) for n in parsed.name or ()),
+            amount=amount,
+            preparation=parsed.preparation.text if parsed.preparation else None,
+        )
+
+    def encode(self) -> tuple[Any, ...]:
+        amount = None
+        if self.amount is not None:
+            amount = (
+                self._encode_quantity(self.amount.quantity),
+                self._encode_quantity(self.amount.quantity_max),
+                self.amount.unit,
+                self.amount.RANGE,
+            )
+        return (
+            tuple((n.text, n.confidence) for n in self.name),
+            amount,
+            self.preparation,
+        )
+
+    @classmethod
+    def decode(cls, data: tuple[Any, ...]) -> "ParsedIngredient":
+        names, amount, preparation = data
+        return cls(
+            name=tuple(ParsedName(text, confidence) for text, confidence in names),
+            amount=(
+                ParsedAmount(
+                    cls._decode_quantity(amount[0]),
+                    cls._decode_quantity(amount[1]),
+                    amount[2],
+                    amount[3],
+                )
+                if amount is not None
+                else None
+            ),
+            preparation=preparation,
+        )
+
+    @staticmethod
+    def _encode_quantity(quantity: Fraction | str) -> EncodedQuantity:
+        if isinstance(quantity, Fraction):
+            return (quantity.numerator, quantity.denominator)
+        return str(quantity)
+
+    @staticmethod
+    def _decode_quantity(quantity: EncodedQuantity) -> Fraction | str:
+        if isinstance(quantity, tuple):
+            return Fraction(*quantity)
+        return quantity
+
+
+class IngredientCache:
+    """
+    A memo of `ingredient_parser` results, keyed by normalized sentence.
+
+    The same ingredient sentences ("1 teaspoon kosher salt") appear thousands
+    of times across dumped recipes, and running the parser's model on each is
+    the bulk of converting them. Results are kept in memory, evicting the
+    least recently used beyond `memory_size`, and in a SQLite file that is
+    shared by every command (and every worker process) that parses
+    ingredients. Entries are keyed by the parser's version, so they are
+    ignored once a new model is installed.
+
+    `parser` is called with a list of sentences to parse them, and defaults to
+    `ingredient_parser`.
+    """
+
+    _default: Optional["IngredientCache"] = None
+
+    def __init__(
+        self,
+        path: str | None = None,
+        memory_size: int = DEFAULT_MEMORY_SIZE,
+        parser: Parser = parse_sentences,
+    ) -> None:
+        self.path = path or self.default_path()
+        self.memory_size = memory_size
+        self.parser = parser
+        self.version = f"{self.parser_version()}/{INGREDIENT_CACHE_VERSION}"
+
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict[str, ParsedIngredient] = OrderedDict()
+        self._pending: list[tuple[str, str, bytes]] = []
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._connected = False
+
+    @classmethod
+    def default(cls) -> "IngredientCache":
+        """The cache shared by everything in this process."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @staticmethod
+    def default_path() -> str:
+        return os.path.join(default_cache_directory(), INGREDIENT_CACHE_FILE_NAME)
+
+    @staticmethod
+    def parser_version() -> str:
+        try:
+            return importlib.metadata.version("ingredient-parser-nlp")
+        except importlib.metadata.PackageNotFoundError:
+            return "unknown"
+
+    @staticmethod
+    def normalize(sentence: str) -> str:
+        return " ".join(sentence.split())
+
+    def parse(self, sentence: str) -> ParsedIngredient:
+        """Parse an ingredient sentence, or return its memoized result."""
+        key = self.normalize(sentence)
+
+        parsed = self.get(key)
+        if parsed is None:
+            with Timings.span("nlp"):
+                parsed = ParsedIngredient.from_parser(self.parser([key])[0])
+            self.put(key, parsed)
+        return parsed
+
+    def parse_many(
+        self, sentences: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> list[ParsedIngredient | None]:
+        """
+        Parse many ingredient sentences, returning None for those that fail.
+
+        Each distinct sentence that isn't memoized is parsed once, in batches
+        of `batch_size`, and the results are written to disk together.
+        """
+        keys = [self.normalize(sentence) for sentence in sentences]
+
+        results: dict[str, ParsedIngredient | None] = {}
+        missing: list[str] = []
+        for key in dict.fromkeys(keys):
+            parsed = self.get(key)
+            if parsed is None:
+                missing.append(key)
+            else:
+                results[key] = parsed
+
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start : start + batch_size]
+            for key, parsed in zip(batch, self._parse_batch(batch), strict=True):
+                results[key] = parsed
+                if parsed is not None:
+                    self.put(key, parsed)
+
+        self.flush()
+        return [results[key] for key in keys]
+
+    def get(self, key: str) -> ParsedIngredient | None:
+        with self._lock:
+            parsed = self._memory.get(key)
+            if parsed is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return parsed
+
+            connection = self._connect()
+            row = None
+            if connection is not None:
+                row = connection.execute(
+                    "SELECT value FROM parsed WHERE version = ? AND sentence = ?",
+                    (self.version, key),
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            parsed = ParsedIngredient.decode(marshal.loads(row[0]))
+            self._remember(key, parsed)
+            return parsed
+
+    def put(self, key: str, parsed: ParsedIngredient) -> None:
+        """Memoize a result; it is written to disk on the next `flush()`."""
+        with self._lock:
+            self._remember(key, parsed)
+            self._pending.append((self.version, key, marshal.dumps(parsed.encode())))
+
+    def flush(self) -> None:
+        """Write the results memoized since the last flush to disk."""
+        with self._lock:
+            connection = self._connect()
+            if connection is None or not self._pending:
+                self._pending.clear()
+                return
+
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO parsed VALUES (?, ?, ?)",
+                        self._pending,
+                    )
+            except sqlite3.OperationalError:
+                pass  # Locked by another writer for too long; stay in memory
+            self._pending.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return len(self._memory)
+            return connection.execute(
+                "SELECT COUNT(*) FROM parsed WHERE version = ?", (self.version,)
+            ).fetchone()[0]
+
+    @classmethod
+    def stats(cls, path: str | None = None) -> dict[str, int]:
+        """Count the sentences, and the size of the file, in the given cache."""
+        path = path or cls.default_path()
+        if not os.path.exists(path):
+            return {"sentences": 0, "bytes": 0}
+
+        try:
+            connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                (sentences,) = connection.execute(
+                    "SELECT COUNT(*) FROM parsed"
+                ).fetchone()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            sentences = 0
+
+        size = sum(
+            os.path.getsize(path + suffix)
+            for suffix in ["", "-wal"]
+            if os.path.exists(path + suffix)
+        )
+        return {"sentences": sentences, "bytes": size}
+
+    @classmethod
+    def clear(cls, path: str | None = None) -> int:
+        """Delete the cache file, and return the number of files deleted."""
+        path = path or cls.default_path()
+        removed = 0
+        for suffix in ["", "-wal", "-shm"]:
+            try:
+                os.unlink(path + suffix)
+            except FileNotFoundError:
+                continue
+            removed += suffix == ""
+        return removed
+
+    def _parse_batch(self, batch: list[str]) -> list[ParsedIngredient | None]:
+        with Timings.span("nlp"):
+            return self._parse_batch_or_each(batch)
+
+    def _parse_batch_or_each(self, batch: list[str]) -> list[ParsedIngredient | None]:
+        Timings.count("ingredient sentences", len(batch))
+        try:
+            return [ParsedIngredient.from_parser(p) for p in self.parser(batch)]
+        except Exception:
+            pass  # One bad sentence fails the whole batch, so find it
+
+        results: list[ParsedIngredient | None] = []
+        for key in batch:
+            try:
+                results.append(ParsedIngredient.from_parser(self.parser([key])[0]))
+            except Exception:
+                results.append(None)
+        return results
+
+    def _remember(self, key: str, parsed: ParsedIngredient) -> None:
+        self._memory[key] = parsed
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection | None:
+        # Opened on first use, since most commands never parse an ingredient.
+        # A cache that can't be opened just leaves results in memory.
+        if self._connected:
+            return self._connection
+        self._connected = True
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS parsed ("
+                    "version TEXT, sentence TEXT, value BLOB, "
+                    "PRIMARY KEY (version, sentence))"
+                )
+                # Entries for other parser versions will never be read again.
+                connection.execute(
+                    "DELETE FROM parsed WHERE version != ?", (self.version,)
+                )
+        except OSError, sqlite3.Error:
+            return None
+
+        self._connection = connection
+        return connection
@@ -0,0 +1,53 @@
+from sous.attribute import Attribute
+from sous.ingredient import Ingredient
+from sous.lexer import Node
+from sous.prose import Prose
+
+
+class Interner:
+    """
+    A table of shared values for the nodes of many recipes.
+
+    Across a cookbook, the same ingredient ids, quantities and attribute names
+    (and often whole ingredients, such as `{}[kosher salt]`) appear thousands
+    of times. Passing every parsed node through one interner makes equal
+    values share a single object, instead of each recipe holding its own copy.
+    Unlike `sys.intern`, the table is freed along with the cookbook.
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+        self._ingredients: dict[Ingredient, Ingredient] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings) + len(self._ingredients)
+
+    def string(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def ingredient(self, ingredient: Ingredient) -> Ingredient:
+        interned = self._ingredients.get(ingredient)
+        if interned is None:
+            interned = Ingredient(
+                id=self.string(ingredient.id),
+                quantity=self._optional_string(ingredient.quantity),
+                descriptors=self._optional_string(ingredient.descriptors),
+                preparation=self._optional_string(ingredient.preparation),
+            )
+            self._ingredients[interned] = interned
+        return interned
+
+    def node(self, node: Node) -> Node:
+        """Return `node` with its repeated values replaced by shared ones."""
+        if isinstance(node, Ingredient):
+            return self.ingredient(node)
+
+        if isinstance(node, Prose):
+            node.ingredients = [self.ingredient(i) for i in node.ingredients]
+        elif isinstance(node, Attribute):
+            node.name = self.string(node.name)
+
+        return node
+
+    def _optional_string(self, value: str | None) -> str | None:
+        return None if value is None else self.string(value)
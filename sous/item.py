@@ -1,11 +1,18 @@
 from typing import Any
 
+from sous.quantity import Quantity
+
 
 class Item:
     def __init__(self, name: str, quantities: list[str]) -> None:
         self.name = name
         self.quantities = quantities
 
+    @property
+    def totals(self) -> list[str]:
+        """The quantities, with those of compatible units added together."""
+        return Quantity.sum(self.quantities)
+
     def __hash__(self) -> int:
         return hash(self.name)
 
@@ -16,7 +23,5 @@ class Item:
         return self.name != other.name
 
     def __str__(self) -> str:
-        formatted_quantities = (
-            f"({', '.join(self.quantities)})" if self.quantities else ""
-        )
+        formatted_quantities = f"({', '.join(self.totals)})" if self.quantities else ""
         return f"{self.name} {formatted_quantities}".strip()
@@ -0,0 +1,186 @@
+import re
+import string
+
+from sous.attribute import Attribute
+from sous.comment import Comment
+from sous.header import Header
+from sous.ingredient import Ingredient
+from sous.prose import Prose
+
+type Node = Header | Attribute | Comment | Ingredient | Prose
+
+# Bump whenever a change here changes the nodes produced for some line. This
+# invalidates parsed recipes that have been cached on disk.
+PARSER_VERSION = 1
+
+# Anchored, single-character-class runs: each is matched at most once per
+# position and can never backtrack.
+ATTRIBUTE_NAME_RUN_RE = re.compile(r"[\w-]*")
+INGREDIENT_ID_RUN_RE = re.compile(r"[^,\]]*")
+
+
+class Lexer:
+    """
+    Parses a single stripped line of a .sous file into a node.
+
+    The node type is chosen from the first character of the line, and each
+    line is then scanned once from left to right. The result is identical to
+    trying `Header.RE`, `Attribute.RE`, `Comment.RE` and
+    `Ingredient.BLOCK_DEFINITION_RE` in turn and falling back to `Prose`, but
+    never rescans the line, so pathological input (e.g. long runs of `{` or
+    `[`) stays linear in the length of the line.
+    """
+
+    # Node types that are introduced by a marker character. Every other line,
+    # and every marked line that fails to parse as its marked type, is prose.
+    MARKED_NODE_TYPES: dict[str, type] = {
+        "#": Header,
+        "@": Attribute,
+        "%": Comment,
+        "{": Ingredient,
+    }
+
+    @classmethod
+    def parse_line(cls, line: str) -> Node:
+        node = cls._parse_marked_line(line)
+
+        if node is None:
+            node = Prose(line, cls.inline_definitions(line))
+
+        return node
+
+    @classmethod
+    def project_line(cls, line: str, node_types: frozenset[type]) -> Node | None:
+        """
+        Like `parse_line`, but returns None for nodes whose type is not in
+        `node_types`, doing as little work as possible to find that out.
+        """
+        marked_node_type = cls.MARKED_NODE_TYPES.get(line[0])
+
+        if marked_node_type is not None:
+            if marked_node_type not in node_types and Prose not in node_types:
+                return None
+
+            node = cls._parse_marked_line(line)
+            if node is not None:
+                return node if marked_node_type in node_types else None
+
+        if Prose not in node_types:
+            return None
+
+        return Prose(line, cls.inline_definitions(line))
+
+    @classmethod
+    def _parse_marked_line(cls, line: str) -> Node | None:
+        first = line[0]
+
+        if first == "#":
+            return cls._header(line)
+        if first == "@":
+            return cls._attribute(line)
+        if first == "%":
+            return cls._comment(line)
+        if first == "{":
+            return cls._block_definition(line)
+
+        return None
+
+    @staticmethod
+    def _header(line: str) -> Header | None:
+        level = len(line) - len(line.lstrip("#"))
+        name = line[level:].lstrip()
+
+        if not name or len(name) == len(line) - level:
+            return None
+
+        return Header(level, name)
+
+    @staticmethod
+    def _attribute(line: str) -> Attribute | None:
+        end = ATTRIBUTE_NAME_RUN_RE.match(line, 1).end()  # type: ignore
+
+        value = line[end:].lstrip()
+
+        if end == 1 or not value or len(value) == len(line) - end:
+            return None
+
+        return Attribute(line[1:end], value)
+
+    @staticmethod
+    def _comment(line: str) -> Comment | None:
+        text = line[1:].lstrip()
+
+        if not text or len(text) == len(line) - 1:
+            return None
+
+        return Comment(text)
+
+    @staticmethod
+    def _block_definition(line: str) -> Ingredient | None:
+        quantity_end = line.find("}", 1)
+        if quantity_end < 0:
+            return None
+
+        id_start = line.find("[", quantity_end + 1) + 1
+        if not id_start:
+            return None
+
+        id_end = INGREDIENT_ID_RUN_RE.match(line, id_start).end()  # type: ignore
+
+        if id_end == id_start or id_end == len(line) or line[id_end] != "]":
+            return None
+
+        return Ingredient(
+            id=line[id_start:id_end],
+            quantity=line[1:quantity_end],
+            descriptors=(
+                line[quantity_end + 1 : id_start - 1].strip(string.punctuation).strip()
+                or None
+            ),
+            preparation=line[id_end + 1 :].strip(string.punctuation).strip() or None,
+        )
+
+    @staticmethod
+    def inline_definitions(line: str) -> list[Ingredient]:
+        """
+        Equivalent to `Ingredient.parse_inline_definitions`, but in linear time.
+
+        Each candidate `{` looks for the first `}` after it and then for the
+        first `,` or `]` after the following `[`. Both positions only ever move
+        forward as the scan proceeds, so they are cached instead of being
+        searched for again from every `{`.
+        """
+        inline_ingredients: list[Ingredient] = []
+
+        length = len(line)
+        quantity_end = -1
+        id_end = -1
+
+        start = line.find("{")
+        while start >= 0:
+            if quantity_end <= start:
+                quantity_end = line.find("}", start + 1)
+                if quantity_end < 0:
+                    break
+
+            id_start = quantity_end + 2
+            if id_start > length or line[id_start - 1] != "[":
+                start = line.find("{", quantity_end + 1)
+                continue
+
+            if id_end < id_start:
+                id_end = INGREDIENT_ID_RUN_RE.match(line, id_start).end()  # type: ignore
+
+            if id_end == id_start or id_end == length or line[id_end] != "]":
+                start = line.find("{", quantity_end + 1)
+                continue
+
+            inline_ingredients.append(
+                Ingredient(
+                    id=line[id_start:id_end],
+                    quantity=line[start + 1 : quantity_end],
+                )
+            )
+            start = line.find("{", id_end + 1)
+
+        return inline_ingredients
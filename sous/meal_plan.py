@@ -0,0 +1,81 @@
+import os
+import tomllib
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class PlannedRecipe:
+    name: str
+    include: list[str] | None = None
+    exclude: list[str] = field(default_factory=list)
+
+
+class MealPlan:
+    """
+    Parses a TOML file that lists the recipes, and which of their ingredients,
+    to build a shopping list from without going through the recipe menus.
+
+    Ingredients are matched by id, ignoring case. Every ingredient of a recipe
+    is used unless the recipe lists the ones to `include`, or the ones to
+    `exclude`; a top-level `exclude` applies to every recipe in the plan.
+
+    Expected format:
+        exclude = ["kosher salt", "black pepper"]
+
+        [[recipe]]
+        name = "Roasted broccoli"
+
+        [[recipe]]
+        name = "Chana masala"
+        exclude = ["cilantro"]
+
+        [[recipe]]
+        name = "Fried rice"
+        include = ["rice", "eggs", "scallions"]
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+
+        self.path = path
+        self.name = self.name_for(path)
+        self.exclude = self._ingredient_ids(data, "exclude") or []
+
+        recipes = data.get("recipe", [])
+        if not isinstance(recipes, list) or not recipes:
+            raise ValueError(f"No [[recipe]] tables in meal plan at {path}")
+
+        self.recipes: list[PlannedRecipe] = []
+        for recipe in recipes:
+            if not isinstance(recipe, dict):
+                raise ValueError(f"[[recipe]] must be a table in meal plan at {path}")
+
+            name = recipe.get("name")
+            if not isinstance(name, str):
+                raise ValueError(f"Recipe without a name in meal plan at {path}")
+
+            self.recipes.append(
+                PlannedRecipe(
+                    name=name,
+                    include=self._ingredient_ids(recipe, "include"),
+                    exclude=self._ingredient_ids(recipe, "exclude") or [],
+                )
+            )
+
+    @staticmethod
+    def name_for(path: str) -> str:
+        """The name of the plan at `path`, from its file name."""
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def _ingredient_ids(self, table: dict[str, Any], key: str) -> list[str] | None:
+        ids = table.get(key)
+        if ids is None:
+            return None
+
+        if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+            raise ValueError(
+                f"'{key}' must be a list of ingredients in meal plan at {self.path}"
+            )
+        return [i.lower() for i in ids]
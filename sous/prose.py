@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from sous.ingredient import Ingredient
 
 
-@dataclass
+@dataclass(slots=True)
 class Prose:
     text: str
     ingredients: list[Ingredient]
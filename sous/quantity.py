@@ -0,0 +1,232 @@
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import cache
+from typing import Optional
+
+from sous.utils import Text
+
+VULGAR_FRACTIONS = {
+    "½": "1/2",
+    "⅓": "1/3",
+    "⅔": "2/3",
+    "¼": "1/4",
+    "¾": "3/4",
+    "⅕": "1/5",
+    "⅛": "1/8",
+    "⅜": "3/8",
+    "⅝": "5/8",
+    "⅞": "7/8",
+}
+
+VULGAR_FRACTION_RE = re.compile(rf"(\d*)\s*([{''.join(VULGAR_FRACTIONS)}])")
+
+NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d*\.\d+|\d+"
+
+QUANTITY_RE = re.compile(
+    rf"^(?P<low>{NUMBER})(?:\s*(?:-|–|to)\s*(?P<high>{NUMBER}))?\s*(?P<unit>.*)$"
+)
+
+# Units that can be converted to one another, by dimension: each unit's
+# singular and plural names, abbreviations, and size in the dimension's
+# smallest unit. US and metric units are kept apart, since they don't convert
+# exactly.
+UNIT_TABLE: dict[str, list[tuple[str, str, list[str], int]]] = {
+    "volume": [
+        ("teaspoon", "teaspoons", ["tsp", "tsps", "t"], 1),
+        ("tablespoon", "tablespoons", ["tbsp", "tbsps", "tbs", "T"], 3),
+        ("fluid ounce", "fluid ounces", ["fl oz", "fl. oz"], 6),
+        ("cup", "cups", ["c"], 48),
+        ("pint", "pints", ["pt"], 96),
+        ("quart", "quarts", ["qt"], 192),
+        ("gallon", "gallons", ["gal"], 768),
+    ],
+    "metric volume": [
+        ("milliliter", "milliliters", ["ml", "millilitre", "millilitres"], 1),
+        ("liter", "liters", ["l", "litre", "litres"], 1000),
+    ],
+    "weight": [
+        ("ounce", "ounces", ["oz"], 1),
+        ("pound", "pounds", ["lb", "lbs"], 16),
+    ],
+    "metric weight": [
+        ("gram", "grams", ["g"], 1),
+        ("kilogram", "kilograms", ["kg"], 1000),
+    ],
+}
+
+# Words that describe the size of what is counted rather than a unit, as in
+# "2 large" (eggs). They are neither singular nor plural.
+SIZE_WORDS = frozenset(
+    [
+        "small",
+        "medium",
+        "large",
+        "extra large",
+        "extra-large",
+        "jumbo",
+        "big",
+        "whole",
+        "heaping",
+        "scant",
+        "level",
+    ]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Unit:
+    dimension: str
+    singular: str
+    plural: str
+    size: int
+
+
+def _compile_units() -> dict[str, Unit]:
+    units: dict[str, Unit] = {}
+    for dimension, specs in UNIT_TABLE.items():
+        for singular, plural, aliases, size in specs:
+            unit = Unit(dimension, singular, plural, size)
+            for name in [singular, plural, *aliases]:
+                # Single-letter abbreviations are case-sensitive ("t" vs "T").
+                units[name if len(name) == 1 else name.lower()] = unit
+    return units
+
+
+UNITS = _compile_units()
+
+
+@dataclass(frozen=True, slots=True)
+class Quantity:
+    """
+    An amount (or range of amounts) of a unit, parsed from the `{...}` of an
+    ingredient, such as "2", "1 1/2 cups", "1 - 2 tbsp" or "3 cloves".
+    """
+
+    low: Fraction
+    high: Fraction
+    unit: Unit | None = None
+    # The unit as written, for units that aren't in the conversion table.
+    # Their singular form is used, so that "1 clove" and "2 cloves" match.
+    other_unit: str | None = None
+
+    @staticmethod
+    @cache
+    def parse(text: str) -> Optional["Quantity"]:
+        """
+        Return the quantity in `text`, or None if it doesn't start with an
+        amount. The same few hundred quantities make up most of a cookbook,
+        so parsed quantities are memoized.
+        """
+        text = VULGAR_FRACTION_RE.sub(
+            lambda m: f"{m[1]} {VULGAR_FRACTIONS[m[2]]}".strip(), text.strip()
+        )
+        match = QUANTITY_RE.match(text)
+        if not match:
+            return None
+
+        try:
+            low = Quantity._amount(match["low"])
+            high = Quantity._amount(match["high"]) if match["high"] else low
+        except ZeroDivisionError:
+            return None  # A typo such as "1/0"
+        if high < low:
+            return None
+
+        unit_text = match["unit"].rstrip(".").strip()
+        if not unit_text:
+            return Quantity(low, high)
+
+        unit = UNITS.get(unit_text) or UNITS.get(unit_text.lower())
+        if unit is not None:
+            return Quantity(low, high, unit)
+        if unit_text.lower() in SIZE_WORDS:
+            return Quantity(low, high, other_unit=unit_text.lower())
+        return Quantity(low, high, other_unit=Text.singular(unit_text.lower()))
+
+    @classmethod
+    def sum(cls, texts: list[str]) -> list[str]:
+        """
+        Combine quantities of compatible units into one total per unit (or
+        dimension), in the order they first appear, e.g. "1 cup" and "2 tbsp"
+        into "1 1/8 cups". Quantities that can't be parsed, and those that are
+        the only one of their kind, are returned as they were written.
+        """
+        groups: dict[object, list[tuple[Quantity, str]]] = {}
+        result: list[str | list[tuple[Quantity, str]]] = []
+
+        for text in texts:
+            quantity = cls.parse(text)
+            if quantity is None:
+                result.append(text)
+                continue
+
+            key = (
+                quantity.unit.dimension
+                if quantity.unit is not None
+                else (quantity.other_unit,)
+            )
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = []
+                result.append(group)
+            group.append((quantity, text))
+
+        totals: list[str] = []
+        for entry in result:
+            if isinstance(entry, str):
+                totals.append(entry)
+            elif len(entry) == 1:
+                totals.append(entry[0][1])
+            else:
+                totals.append(cls._total([quantity for quantity, _ in entry]).format())
+        return totals
+
+    def format(self) -> str:
+        amount = self._format_amount(self.low)
+        if self.high != self.low:
+            amount += f" - {self._format_amount(self.high)}"
+
+        if self.unit is not None:
+            unit = self.unit.singular if self.high <= 1 else self.unit.plural
+        elif self.other_unit in SIZE_WORDS:
+            unit = self.other_unit
+        elif self.other_unit is not None:
+            unit = self.other_unit if self.high <= 1 else Text.plural(self.other_unit)
+        else:
+            return amount
+
+        return f"{amount} {unit}"
+
+    @staticmethod
+    def _total(quantities: list["Quantity"]) -> "Quantity":
+        first = quantities[0]
+        if first.unit is None:
+            return Quantity(
+                sum((q.low for q in quantities), Fraction(0)),
+                sum((q.high for q in quantities), Fraction(0)),
+                other_unit=first.other_unit,
+            )
+
+        units = {q.unit for q in quantities if q.unit is not None}
+        low = sum((q.low * q.unit.size for q in quantities if q.unit), Fraction(0))
+        high = sum((q.high * q.unit.size for q in quantities if q.unit), Fraction(0))
+
+        # Show the total in the largest unit that was used that fits it.
+        by_size = sorted(units, key=lambda unit: unit.size)
+        unit = next((u for u in reversed(by_size) if low >= u.size), by_size[0])
+        return Quantity(low / unit.size, high / unit.size, unit)
+
+    @staticmethod
+    def _amount(text: str) -> Fraction:
+        whole, _, fraction = text.rpartition(" ")
+        return Fraction(whole or 0) + Fraction(fraction)
+
+    @staticmethod
+    def _format_amount(amount: Fraction) -> str:
+        whole, remainder = divmod(amount, 1)
+        if not remainder:
+            return str(whole)
+        if not whole:
+            return str(remainder)
+        return f"{whole} {remainder}"
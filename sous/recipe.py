@@ -1,26 +1,39 @@
 from functools import cached_property
 
-from sous.document import Document, Header
+from sous.document import Document
+from sous.header import Header
 from sous.ingredient import Ingredient
+from sous.interner import Interner
 from sous.prose import Prose
 
 
 class Recipe:
-    def __init__(self, filepath: str) -> None:
-        self.document = Document(filepath)
+    def __init__(
+        self,
+        filepath: str,
+        projection: str = Document.PROJECTION_FULL,
+        document: Document | None = None,
+        interner: Interner | None = None,
+    ) -> None:
+        self.document = document or Document(
+            filepath, projection=projection, interner=interner
+        )
 
-    @property
+    @cached_property
     def name(self) -> str | None:
-        for paragraph in self.document.paragraphs:
-            for line in paragraph:
-                if isinstance(line, Header):
-                    return line.name
+        for line in self.document.nodes():
+            if isinstance(line, Header):
+                return line.name
 
     @cached_property
     def ingredients(self) -> list[Ingredient]:
         ingredients: list[Ingredient] = []
 
-        for paragraph in self.document.paragraphs:
+        document = self.document
+        if document.projection == Document.PROJECTION_NAME:
+            document = document.project(Document.PROJECTION_INGREDIENTS)
+
+        for paragraph in document.paragraphs:
             for line in paragraph:
                 if isinstance(line, Ingredient):
                     ingredients.append(line)
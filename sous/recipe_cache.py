@@ -0,0 +1,373 @@
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+from collections.abc import Iterator
+from typing import Any
+
+from sous.attribute import Attribute
+from sous.comment import Comment
+from sous.document import Document
+from sous.header import Header
+from sous.ingredient import Ingredient
+from sous.interner import Interner
+from sous.lexer import PARSER_VERSION, Node
+from sous.prose import Prose
+from sous.recipe import Recipe
+
+CACHE_FILE_EXTENSION = ".cache"
+
+# Parsed nodes are stored as plain tuples tagged with one of these, which
+# marshal can (de)serialize far faster than pickled dataclasses.
+HEADER, ATTRIBUTE, COMMENT, INGREDIENT, PROSE = range(5)
+
+NODE_TYPES: list[type] = [Header, Attribute, Comment, Ingredient, Prose]
+
+type EncodedNode = tuple[Any, ...]
+type EncodedParagraphs = tuple[tuple[EncodedNode, ...], ...]
+
+
+def default_cache_directory(name: str = "cookbooks") -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "sous", name)
+
+
+class CachedDocument(Document):
+    """
+    A document whose nodes are decoded from a `RecipeCache` entry, which is
+    only unmarshaled from the cache file once the document is parsed.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        encoded_paragraphs: EncodedParagraphs | memoryview,
+        projection: str = Document.PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> None:
+        super().__init__(filepath, projection=projection, interner=interner)
+        self._encoded_paragraphs = encoded_paragraphs
+
+    def project(self, projection: str) -> "CachedDocument":
+        return CachedDocument(
+            self.filepath, self._encoded_paragraphs, projection, self.interner
+        )
+
+    def _paragraphs(self) -> Iterator[list[Node]]:
+        if isinstance(self._encoded_paragraphs, memoryview):
+            self._encoded_paragraphs = marshal.loads(self._encoded_paragraphs)
+
+        node_types = self.PROJECTION_NODE_TYPES[self.projection]
+        full = self.projection == self.PROJECTION_FULL
+
+        for encoded_paragraph in self._encoded_paragraphs:
+            paragraph: list[Node] = []
+
+            for encoded_node in encoded_paragraph:
+                if NODE_TYPES[encoded_node[0]] not in node_types:
+                    continue
+
+                node = RecipeCache.decode(encoded_node)
+                if not full and isinstance(node, Prose) and not node.ingredients:
+                    continue
+                if self.interner is not None:
+                    node = self.interner.node(node)
+                if self.projection == self.PROJECTION_NAME:
+                    yield [node]
+                    return
+
+                paragraph.append(node)
+
+            if len(paragraph):
+                yield paragraph
+
+
+class RecipeCache:
+    """
+    On-disk cache of the parsed recipes under one cookbook root.
+
+    Entries are keyed by path relative to the root and are only used while the
+    file's mtime and size are unchanged. The whole cache is discarded when
+    `PARSER_VERSION` (or the marshal format) changes, and entries for files
+    that were not seen since the cache was loaded are evicted on `save()`.
+
+    Like a `Bundle`, the file holds a fixed-size header, every entry's nodes
+    marshaled back to back, and an index of (mtime, size, name, offset, length)
+    for each of them. Loading the cache memory-maps the file and reads only
+    the index, so listing recipes by name never unmarshals their nodes.
+    """
+
+    MAGIC = b"SOUSCACH"
+    HEADER = struct.Struct("<8sQQ")  # magic, index offset, index length
+    STAMP = (PARSER_VERSION, marshal.version)
+
+    def __init__(self, root: str, directory: str | None = None) -> None:
+        self.root = os.path.abspath(root)
+        # Files found by walking the root start with it as it was given.
+        self._prefix = os.path.join(root, "")
+        self.directory = directory or default_cache_directory()
+        self.path = os.path.join(
+            self.directory,
+            hashlib.sha1(self.root.encode()).hexdigest() + CACHE_FILE_EXTENSION,
+        )
+        self.hits = 0
+        self.misses = 0
+
+        # The (mtime, size, name) of every entry. Its nodes are either a slice
+        # of the mapped cache file, or were parsed since it was loaded.
+        self._entries: dict[str, tuple[int, int, str | None]] = {}
+        self._slices: dict[str, memoryview] = {}
+        self._parsed: dict[str, EncodedParagraphs] = {}
+        self._seen: set[str] = set()
+        self._dirty = False
+
+        index, buffer = self.read(self.path)
+        if (
+            index
+            and buffer is not None
+            and index["stamp"] == self.STAMP
+            and index["root"] == self.root
+        ):
+            for key, (mtime_ns, size, name, offset, length) in index["entries"].items():
+                self._entries[key] = (mtime_ns, size, name)
+                self._slices[key] = buffer[offset : offset + length]
+
+    def recipe(
+        self,
+        filepath: str,
+        projection: str = Document.PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> Recipe:
+        """Return the recipe at `filepath`, parsing it only on a cache miss."""
+        stat, recipe = self.get(filepath, None, projection, interner)
+
+        if recipe is None:
+            self.put(filepath, stat, self.parse(filepath))
+            recipe = self.to_recipe(filepath, projection, interner)
+
+        return recipe
+
+    def get(
+        self,
+        filepath: str,
+        stat: os.stat_result | None = None,
+        projection: str = Document.PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> tuple[os.stat_result, Recipe | None]:
+        """
+        Return the current stat of `filepath` (unless one is given), and its
+        cached recipe if it is still valid for that stat.
+        """
+        stat = stat or os.stat(filepath)
+        key = self._key(filepath)
+        self._seen.add(key)
+
+        entry = self._entries.get(key)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self.hits += 1
+            return stat, self._recipe(key, filepath, projection, interner)
+
+        self.misses += 1
+        return stat, None
+
+    def put(
+        self,
+        filepath: str,
+        stat: os.stat_result,
+        encoded_paragraphs: EncodedParagraphs,
+    ) -> None:
+        """Cache the nodes parsed from `filepath` when it had the given stat."""
+        key = self._key(filepath)
+        self._seen.add(key)
+        self._entries[key] = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            self.name(encoded_paragraphs),
+        )
+        self._parsed[key] = encoded_paragraphs
+        self._slices.pop(key, None)
+        self._dirty = True
+
+    def discard(self, filepath: str) -> None:
+        """Evict the entry for a file that no longer exists."""
+        key = self._key(filepath)
+        self._seen.discard(key)
+        if self._entries.pop(key, None) is not None:
+            self._slices.pop(key, None)
+            self._parsed.pop(key, None)
+            self._dirty = True
+
+    def to_recipe(
+        self,
+        filepath: str,
+        projection: str = Document.PROJECTION_FULL,
+        interner: Interner | None = None,
+    ) -> Recipe:
+        """Return the cached recipe at `filepath`, which must be in the cache."""
+        return self._recipe(self._key(filepath), filepath, projection, interner)
+
+    @staticmethod
+    def parse(filepath: str) -> EncodedParagraphs:
+        return tuple(
+            tuple(RecipeCache.encode(node) for node in paragraph)
+            for paragraph in Document(filepath).paragraphs
+        )
+
+    @staticmethod
+    def name(encoded_paragraphs: EncodedParagraphs) -> str | None:
+        """Return the name of a recipe from its encoded nodes, like `Recipe`."""
+        for encoded_paragraph in encoded_paragraphs:
+            for encoded_node in encoded_paragraph:
+                if encoded_node[0] == HEADER:
+                    return encoded_node[2]
+        return None
+
+    def save(self) -> None:
+        """Evict entries for files that were not seen and write the cache."""
+        for key in self._entries.keys() - self._seen:
+            del self._entries[key]
+            self._slices.pop(key, None)
+            self._parsed.pop(key, None)
+            self._dirty = True
+
+        if not self._dirty:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        entries: dict[str, tuple[int, int, str | None, int, int]] = {}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(self.HEADER.pack(self.MAGIC, 0, 0))
+
+            for key, (mtime_ns, size, name) in self._entries.items():
+                data = self._slices.get(key)
+                if data is None:
+                    data = marshal.dumps(self._parsed[key])
+                entries[key] = (mtime_ns, size, name, out.tell(), len(data))
+                out.write(data)
+
+            index_offset = out.tell()
+            index_data = marshal.dumps(
+                {"stamp": self.STAMP, "root": self.root, "entries": entries}
+            )
+            out.write(index_data)
+
+            out.seek(0)
+            out.write(self.HEADER.pack(self.MAGIC, index_offset, len(index_data)))
+        os.replace(tmp_path, self.path)
+
+        self._dirty = False
+
+    def _key(self, filepath: str) -> str:
+        if filepath.startswith(self._prefix) and ".." not in filepath:
+            return filepath[len(self._prefix) :]
+        return os.path.relpath(os.path.abspath(filepath), self.root)
+
+    def _recipe(
+        self,
+        key: str,
+        filepath: str,
+        projection: str,
+        interner: Interner | None,
+    ) -> Recipe:
+        encoded_paragraphs = self._parsed.get(key)
+        document = CachedDocument(
+            filepath,
+            self._slices[key] if encoded_paragraphs is None else encoded_paragraphs,
+            projection,
+            interner,
+        )
+        recipe = Recipe(filepath, document=document)
+        # The name is kept in the index, so that listing recipes never has to
+        # unmarshal their nodes.
+        recipe.name = self._entries[key][2]
+        return recipe
+
+    @classmethod
+    def read(cls, path: str) -> tuple[dict[str, Any] | None, memoryview | None]:
+        """Return the index of a cache file, and a mapping of the whole file."""
+        try:
+            with open(path, "rb") as fh:
+                buffer = memoryview(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+            magic, index_offset, index_length = cls.HEADER.unpack_from(buffer)
+            if magic != cls.MAGIC:
+                return None, None
+            index = marshal.loads(buffer[index_offset : index_offset + index_length])
+        except OSError, EOFError, ValueError, TypeError, struct.error:
+            return None, None
+        return index, buffer
+
+    @classmethod
+    def stats(cls, directory: str | None = None) -> list[dict[str, Any]]:
+        """Describe every cache file in the given cache directory."""
+        directory = directory or default_cache_directory()
+        if not os.path.isdir(directory):
+            return []
+
+        result: list[dict[str, Any]] = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(CACHE_FILE_EXTENSION):
+                continue
+
+            path = os.path.join(directory, name)
+            index = cls.read(path)[0] or {}
+            result.append(
+                {
+                    "path": path,
+                    "root": index.get("root"),
+                    "recipes": len(index.get("entries", {})),
+                    "bytes": os.path.getsize(path),
+                    "stale": index.get("stamp") != cls.STAMP,
+                }
+            )
+
+        return result
+
+    @classmethod
+    def clear(cls, directory: str | None = None) -> int:
+        """Delete every cache file in the given cache directory."""
+        removed = 0
+        for stats in cls.stats(directory):
+            os.unlink(stats["path"])
+            removed += 1
+        return removed
+
+    @staticmethod
+    def encode(node: Node) -> EncodedNode:
+        if isinstance(node, Header):
+            return (HEADER, node.level, node.name)
+        if isinstance(node, Attribute):
+            return (ATTRIBUTE, node.name, node.value)
+        if isinstance(node, Comment):
+            return (COMMENT, node.text)
+        if isinstance(node, Ingredient):
+            return (
+                INGREDIENT,
+                node.id,
+                node.quantity,
+                node.descriptors,
+                node.preparation,
+            )
+        return (
+            PROSE,
+            node.text,
+            tuple(
+                (i.id, i.quantity, i.descriptors, i.preparation)
+                for i in node.ingredients
+            ),
+        )
+
+    @staticmethod
+    def decode(encoded_node: EncodedNode) -> Node:
+        tag = encoded_node[0]
+        if tag == HEADER:
+            return Header(encoded_node[1], encoded_node[2])
+        if tag == ATTRIBUTE:
+            return Attribute(encoded_node[1], encoded_node[2])
+        if tag == COMMENT:
+            return Comment(encoded_node[1])
+        if tag == INGREDIENT:
+            return Ingredient(*encoded_node[1:])
+        return Prose(encoded_node[1], [Ingredient(*i) for i in encoded_node[2]])
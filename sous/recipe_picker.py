@@ -0,0 +1,493 @@
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from sous.cookbook import Cookbook
+from sous.recipe import Recipe
+from sous.recipe_cache import default_cache_directory
+from sous.search_index import SearchIndex
+
+RECENT_RECIPES_FILE_NAME = "recent-recipes.json"
+MAX_RECENT_RECIPES = 100
+# The most results ranked for a query; the rest can be reached by typing more.
+MAX_RESULTS = 500
+MAX_WINDOW_HEIGHT = 15
+MAX_CACHED_WORDS = 256
+# Shorter query words only match names, since nearly every recipe has some
+# ingredient or attribute that starts with any one or two letters.
+MIN_TERM_WORD_LENGTH = 3
+
+WORD_RE = re.compile(r"\w+")
+
+KEY_UP = ("\x1b[A", "\x1bOA", "\x10")  # Also ctrl-p
+KEY_DOWN = ("\x1b[B", "\x1bOB", "\x0e")  # Also ctrl-n
+KEY_PAGE_UP = "\x1b[5~"
+KEY_PAGE_DOWN = "\x1b[6~"
+KEY_ENTER = ("\r", "\n")
+KEY_BACKSPACE = ("\x7f", "\x08")
+KEY_CLEAR = "\x15"  # ctrl-u
+KEY_CANCEL = ("\x1b", "\x03", "\x04")  # escape, ctrl-c, ctrl-d
+
+
+def bitset(entries: Iterable[int], size: int) -> int:
+    """Return a bitset of the given entries, out of `size`."""
+    bits = bytearray((size + 7) // 8)
+    for entry in entries:
+        bits[entry >> 3] |= 1 << (entry & 7)
+    return int.from_bytes(bits, "little")
+
+
+def bitset_entries(bits: int, limit: int) -> Iterator[int]:
+    """Yield the first `limit` entries of a bitset, in order."""
+    while bits and limit > 0:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+        limit -= 1
+
+
+class TrigramIndex:
+    """
+    An index from the trigrams of words to the entries that contain them, for
+    fuzzy matching as you type.
+
+    Every word is indexed as the trigrams of itself padded with spaces, plus
+    its first letter, so that a query word matches the words it starts, and
+    still matches words it misspells.
+
+    Matches are bitsets: ints whose bit `i` is set when entry `i` matches.
+    Combining them takes a handful of operations over `size / 64` machine
+    words, however many entries match.
+    """
+
+    def __init__(self) -> None:
+        self.postings: dict[str, list[int]] = {}
+        self.size = 0
+
+        self._bitsets: dict[str, int] = {}
+        # The grams of the last query word and what `match()` returned for it,
+        # which the next word usually extends by one gram.
+        self._last: tuple[frozenset[str], list[int]] = (frozenset(), [])
+
+    def add(self, text: str) -> int:
+        entry = self.size
+        self.size += 1
+        for gram in set(self.grams(text)):
+            self.postings.setdefault(gram, []).append(entry)
+        self._bitsets.clear()
+        return entry
+
+    def freeze(self) -> None:
+        """
+        Convert the postings of common grams to bitsets ahead of the first
+        query. A bitset is no bigger than a posting list with more than one
+        entry in 64, and rarer grams are converted as they're queried.
+        """
+        for gram, entries in self.postings.items():
+            if len(entries) * 64 >= self.size:
+                self._bitsets[gram] = bitset(entries, self.size)
+
+    def bitset(self, gram: str) -> int:
+        bits = self._bitsets.get(gram)
+        if bits is None:
+            bits = bitset(self.postings.get(gram, ()), self.size)
+        return bits
+
+    def match(self, word: str) -> list[int]:
+        """
+        Return, for each `k` from 0 to the number of grams in a query word,
+        the entries that contain at least `k` of them.
+        """
+        grams = self.query_grams(word)
+        last_grams, at_least = self._last
+        if last_grams and last_grams.issubset(grams):
+            at_least = at_least.copy()
+        else:
+            last_grams, at_least = frozenset(), [(1 << self.size) - 1]
+
+        for gram in grams:
+            if gram in last_grams:
+                continue
+            bits = self.bitset(gram)
+            at_least.append(0)
+            for k in range(len(at_least) - 1, 0, -1):
+                at_least[k] |= at_least[k - 1] & bits
+
+        self._last = (frozenset(grams), at_least)
+        return at_least
+
+    @staticmethod
+    def grams(text: str) -> Iterator[str]:
+        for word in WORD_RE.findall(text.lower()):
+            padded = f" {word} "
+            yield padded[:2]
+            for start in range(len(padded) - 2):
+                yield padded[start : start + 3]
+
+    @staticmethod
+    def query_grams(word: str) -> list[str]:
+        """Return the grams of a query word, which may be incomplete."""
+        padded = f" {word.lower()}"
+        if len(padded) == 2:
+            return [padded]
+        return list(
+            dict.fromkeys(padded[start : start + 3] for start in range(len(padded) - 2))
+        )
+
+
+class RecentRecipes:
+    """The names of the recipes picked most recently, most recent first."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self.names: list[str] = []
+
+        if path is not None:
+            try:
+                with open(path) as fh:
+                    names = json.load(fh)
+                self.names = [name for name in names if isinstance(name, str)]
+            except OSError, ValueError, TypeError:
+                pass
+
+    @classmethod
+    def default(cls) -> "RecentRecipes":
+        return cls(os.path.join(default_cache_directory(), RECENT_RECIPES_FILE_NAME))
+
+    def use(self, name: str) -> None:
+        if name in self.names:
+            self.names.remove(name)
+        self.names.insert(0, name)
+        del self.names[MAX_RECENT_RECIPES:]
+
+        if self.path is not None:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "w") as fh:
+                    json.dump(self.names, fh)
+            except OSError:
+                pass  # Only the ranking suffers
+
+
+class RecipePicker:
+    """
+    A terminal menu to pick a recipe from, filtered as you type.
+
+    Recipes are matched against their names, ingredient ids and attribute
+    values through trigram indexes, and ranked by how well they match, then
+    by how recently they were picked. Only the visible window of results is
+    drawn, so the menu stays responsive with tens of thousands of recipes.
+    """
+
+    def __init__(
+        self,
+        recipes: list[Recipe],
+        terms: list[Iterable[str]] | None = None,
+        recent: RecentRecipes | None = None,
+    ) -> None:
+        self.recipes = recipes
+        self.recent = recent if recent is not None else RecentRecipes()
+
+        self._names = TrigramIndex()
+        for recipe in recipes:
+            self._names.add(recipe.name or "")
+        self._names.freeze()
+        self._terms, self._term_recipes = self.index_terms(terms or [], len(recipes))
+        # Terms indexed by `for_cookbook()` in the background, until the next
+        # query picks them up.
+        self._indexed_terms: tuple[TrigramIndex, list[int | list[int]]] | None = None
+        self._indexer: threading.Thread | None = None
+
+        # The scores for the words of recent queries, as bitsets of the recipes
+        # with each score, so that typing a query only scores the word being
+        # typed.
+        self._words: dict[str, dict[int, int]] = {}
+        self._positions = {recipe.name: i for i, recipe in enumerate(recipes)}
+        self._rank_recent()
+
+    @classmethod
+    def for_cookbook(
+        cls,
+        cookbook: Cookbook,
+        recent: RecentRecipes | None = None,
+        search_index_path: str | None = None,
+    ) -> "RecipePicker":
+        """
+        Make a picker for every recipe in a cookbook, which matches names right
+        away, and ingredients and attributes once the cookbook's search index
+        is read in the background.
+
+        The index is loaded from and saved to `search_index_path`, if given,
+        so that only recipes that changed since are read in full; the program
+        then waits for the index to be saved before it exits.
+        """
+        picker = cls(cookbook.recipes, recent=recent)
+        picker._indexer = threading.Thread(
+            target=picker._index_cookbook,
+            args=(cookbook, search_index_path),
+            daemon=search_index_path is None,
+        )
+        picker._indexer.start()
+        return picker
+
+    @staticmethod
+    def index_terms(
+        terms: list[Iterable[str]], size: int
+    ) -> tuple[TrigramIndex, list[int | list[int]]]:
+        """
+        Index the terms of each recipe. Unlike names, terms are shared between
+        recipes, so each one is indexed once, with the recipes that have it:
+        as a bitset if they are common, like the postings of `TrigramIndex`.
+        """
+        index = TrigramIndex()
+        term_ids: dict[str, int] = {}
+        term_recipes: list[list[int]] = []
+        for position, recipe_terms in enumerate(terms):
+            for term in recipe_terms:
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = index.add(term)
+                    term_recipes.append([])
+                term_recipes[term_id].append(position)
+
+        index.freeze()
+        return index, [
+            bitset(positions, size) if len(positions) * 64 >= size else positions
+            for positions in term_recipes
+        ]
+
+    def wait(self) -> None:
+        """Wait for the terms of `for_cookbook()` to be indexed."""
+        if self._indexer is not None:
+            self._indexer.join()
+
+    def filter(self, query: str, limit: int = MAX_RESULTS) -> list[Recipe]:
+        """
+        Return the best matches for a query, best first. A recipe matches when
+        it matches every word of the query, and scores the sum of its scores
+        for each word.
+        """
+        if self._indexed_terms is not None:
+            self._terms, self._term_recipes = self._indexed_terms
+            self._indexed_terms = None
+            self._words.clear()
+
+        words = dict.fromkeys(WORD_RE.findall(query.lower()))
+        if not words:
+            return [self.recipes[entry] for entry in self._order[:limit]]
+
+        scores: dict[int, int] | None = None
+        for word in words:
+            word_scores = self._match(word)
+            if scores is None:
+                scores = word_scores
+                continue
+
+            combined: dict[int, int] = {}
+            for score, bits in scores.items():
+                for word_score, word_bits in word_scores.items():
+                    both = bits & word_bits
+                    if both:
+                        total = score + word_score
+                        combined[total] = combined.get(total, 0) | both
+            scores = combined
+
+        assert scores is not None
+        return [self.recipes[entry] for entry in self._rank(scores, limit)]
+
+    def pick(self, recipe: Recipe) -> None:
+        """Remember that a recipe was picked, to rank it first next time."""
+        if recipe.name:
+            self.recent.use(recipe.name)
+            self._rank_recent()
+
+    def show(self, title: str = "Please select a recipe:") -> Recipe | None:
+        """Let the user pick a recipe in the terminal, or None if they cancel."""
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        attributes = termios.tcgetattr(fd)
+        screen = _Screen(sys.stdout)
+        query = ""
+        selected = top = 0
+        results = self.filter(query)
+
+        try:
+            tty.setraw(fd)
+            while True:
+                lines = shutil.get_terminal_size().lines
+                height = max(1, min(MAX_WINDOW_HEIGHT, lines - 2))
+                selected = max(0, min(selected, len(results) - 1))
+                top = min(max(top, selected - height + 1), selected)
+
+                window = results[top : top + height]
+                screen.draw(
+                    f"{title} {query}",
+                    [recipe.name or "" for recipe in window],
+                    selected - top,
+                    f"{len(results)}{'+' if len(results) == MAX_RESULTS else ''}",
+                )
+
+                key = os.read(fd, 64).decode("utf-8", "replace")
+                if key in KEY_CANCEL:
+                    return None
+                elif key in KEY_ENTER:
+                    if not results:
+                        continue
+                    recipe = results[selected]
+                    self.pick(recipe)
+                    return recipe
+                elif key in KEY_UP:
+                    selected -= 1
+                elif key in KEY_DOWN:
+                    selected += 1
+                elif key == KEY_PAGE_UP:
+                    selected -= height
+                elif key == KEY_PAGE_DOWN:
+                    selected += height
+                else:
+                    if key in KEY_BACKSPACE:
+                        query = query[:-1]
+                    elif key == KEY_CLEAR:
+                        query = ""
+                    elif not key.startswith("\x1b"):
+                        query += "".join(c for c in key if c.isprintable())
+                    else:
+                        continue
+                    results = self.filter(query)
+                    selected = top = 0
+        finally:
+            screen.clear()
+            termios.tcsetattr(fd, termios.TCSADRAIN, attributes)
+
+    def _index_cookbook(
+        self, cookbook: Cookbook, search_index_path: str | None
+    ) -> None:
+        if search_index_path is not None:
+            cookbook.use_search_index(SearchIndex.load(search_index_path))
+        search_index = cookbook.search_index
+
+        terms: list[Iterable[str]] = []
+        for recipe in self.recipes:
+            words, ingredients = search_index.terms_for(recipe.document.filepath)
+            attributes = [
+                word.partition(":")[2]
+                for word in words
+                if ":" in word and not word.startswith("name:")
+            ]
+            terms.append([*ingredients, *attributes])
+        # Handed over whole, for the picker's thread to swap in.
+        self._indexed_terms = self.index_terms(terms, len(self.recipes))
+
+        if search_index_path is not None:
+            try:
+                search_index.save(search_index_path)
+            except OSError:
+                pass  # Only the next run's start suffers
+
+    def _match(self, word: str) -> dict[int, int]:
+        scores = self._words.get(word)
+        if scores is None:
+            if len(self._words) >= MAX_CACHED_WORDS:
+                self._words.clear()
+            scores = self._words[word] = self._score(word)
+        return scores
+
+    def _score(self, word: str) -> dict[int, int]:
+        """
+        Score the recipes that match a query word: twice the number of its
+        grams in a recipe's name, if that's at least half of them, or else the
+        number of grams, if one of the recipe's terms has them all. Returns a
+        bitset of the recipes with each score.
+        """
+        at_least = self._names.match(word)
+        total = len(at_least) - 1
+
+        scores: dict[int, int] = {}
+        for count in range(total, (total + 1) // 2 - 1, -1):
+            bits = at_least[count]
+            if count < total:
+                bits &= ~at_least[count + 1]
+            if bits:
+                scores[2 * count] = bits
+
+        if len(word) >= MIN_TERM_WORD_LENGTH:
+            size = len(self.recipes)
+            terms = self._terms.match(word)[-1] if self._terms.size else 0
+            bits = 0
+            for term_id in bitset_entries(terms, self._terms.size):
+                recipes = self._term_recipes[term_id]
+                bits |= recipes if isinstance(recipes, int) else bitset(recipes, size)
+            # Only recipes whose names don't match already.
+            bits &= ~at_least[(total + 1) // 2]
+            if bits:
+                scores[total] = scores.get(total, 0) | bits
+
+        return scores
+
+    def _rank(self, scores: dict[int, int], limit: int) -> list[int]:
+        """
+        Return the `limit` best entries, by score, then recency, then order in
+        the cookbook, taking only as many from each score's bitset as needed.
+        """
+        ranked: list[int] = []
+        for score in sorted(scores, reverse=True):
+            bits = scores[score]
+            if bits & self._recent_bits:
+                ranked.extend(entry for entry in self._recent if bits >> entry & 1)
+                bits &= ~self._recent_bits
+            ranked.extend(bitset_entries(bits, limit - len(ranked)))
+            if len(ranked) >= limit:
+                break
+        return ranked[:limit]
+
+    def _rank_recent(self) -> None:
+        positions = self._positions
+        self._recent = list(
+            dict.fromkeys(
+                positions[name] for name in self.recent.names if name in positions
+            )
+        )
+        self._recent_bits = bitset(self._recent, len(self.recipes))
+        recent = set(self._recent)
+        self._order = self._recent + [
+            entry for entry in range(len(self.recipes)) if entry not in recent
+        ]
+
+
+class _Screen:
+    """Draws the picker below the cursor, over what it drew last."""
+
+    def __init__(self, output: TextIO) -> None:
+        self.output = output
+        self.lines = 0
+
+    def draw(self, prompt: str, rows: list[str], selected: int, status: str) -> None:
+        width = max(shutil.get_terminal_size().columns - 1, 10)
+        parts = [self._rewind()]
+        parts.append(f"{prompt}\x1b[K\r\n")
+        for position, row in enumerate(rows):
+            row = row[: width - 2]
+            if position == selected:
+                parts.append(f"\x1b[7m> {row}\x1b[0m\x1b[K\r\n")
+            else:
+                parts.append(f"  {row}\x1b[K\r\n")
+        parts.append(f"\x1b[2m{status}\x1b[0m\x1b[J")
+
+        self.lines = len(rows) + 1
+        self.output.write("".join(parts))
+        self.output.flush()
+
+    def clear(self) -> None:
+        self.output.write(self._rewind() + "\x1b[J")
+        self.output.flush()
+        self.lines = 0
+
+    def _rewind(self) -> str:
+        return f"\r\x1b[{self.lines}A" if self.lines else "\r"
@@ -0,0 +1,131 @@
+import hashlib
+import marshal
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import urllib.robotparser
+from collections.abc import Callable
+
+from sous.recipe_cache import default_cache_directory
+
+ROBOTS_FILE_EXTENSION = ".robots"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+ROBOTS_TIMEOUT_SECONDS = 10
+
+# What an unauthorized or unreachable robots.txt means, as robots.txt rules. A
+# missing one (any other 4xx) allows everything, like an empty file.
+DISALLOW_ALL = "User-agent: *\nDisallow: /\n"
+
+
+def fetch_robots_txt(robots_url: str) -> str:
+    """
+    Download a robots.txt file, interpreting 4xx statuses the same way as
+    `urllib.robotparser.RobotFileParser.read`. Other errors, such as a 5xx
+    status or a network error, are raised.
+    """
+    try:
+        with urllib.request.urlopen(robots_url, timeout=ROBOTS_TIMEOUT_SECONDS) as f:
+            return f.read().decode("utf-8", errors="replace")
+    except urllib.error.HTTPError as err:
+        if err.code in (401, 403):
+            return DISALLOW_ALL
+        if 400 <= err.code < 500:
+            return ""
+        raise
+
+
+class RobotsCache:
+    """
+    The robots.txt file of each site, fetched the first time that a page from
+    the site is needed, and kept on disk for `ttl` seconds so that later runs
+    don't fetch it again.
+
+    `source` is called with a robots.txt URL to get its contents, and defaults
+    to downloading it. In `offline` mode it is never called: files on disk are
+    used however old they are, and sites without one get no rules at all.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        source: Callable[[str], str] = fetch_robots_txt,
+        offline: bool = False,
+    ) -> None:
+        self.directory = directory or default_cache_directory("robots")
+        self.ttl = ttl
+        self.source = source
+        self.offline = offline
+
+        self._parsers: dict[str, urllib.robotparser.RobotFileParser] = {}
+        self._lock = threading.Lock()
+
+    def parser_for(self, url: str) -> urllib.robotparser.RobotFileParser:
+        """Return the parsed robots.txt of the site that `url` belongs to."""
+        parts = urllib.parse.urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc.lower()}"
+
+        with self._lock:
+            parser = self._parsers.get(origin)
+        if parser is not None:
+            return parser
+
+        path = os.path.join(
+            self.directory,
+            hashlib.sha1(origin.encode()).hexdigest() + ROBOTS_FILE_EXTENSION,
+        )
+        fetched_at, text = self.read(path) or (0.0, None)
+
+        if text is None or (not self.offline and time.time() - fetched_at > self.ttl):
+            if self.offline:
+                text = ""
+            else:
+                try:
+                    text = self.source(f"{origin}/robots.txt")
+                except OSError:
+                    # The site may be down, so stay away from all of it for
+                    # now (but try again next time), like `RobotFileParser`.
+                    return self.parse(DISALLOW_ALL)
+                self.write(path, text)
+
+        with self._lock:
+            return self._parsers.setdefault(origin, self.parse(text))
+
+    @staticmethod
+    def parse(text: str) -> urllib.robotparser.RobotFileParser:
+        parser = urllib.robotparser.RobotFileParser()
+        parser.parse(text.splitlines())
+        return parser
+
+    @staticmethod
+    def read(path: str) -> tuple[float, str] | None:
+        try:
+            with open(path, "rb") as fh:
+                return marshal.load(fh)
+        except OSError, EOFError, ValueError, TypeError:
+            return None
+
+    def write(self, path: str, text: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            marshal.dump((time.time(), text), fh)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def clear(cls, directory: str | None = None) -> int:
+        """Delete every robots.txt file in the given cache directory."""
+        directory = directory or default_cache_directory("robots")
+        if not os.path.isdir(directory):
+            return 0
+
+        removed = 0
+        for name in os.listdir(directory):
+            if name.endswith(ROBOTS_FILE_EXTENSION):
+                os.unlink(os.path.join(directory, name))
+                removed += 1
+        return removed
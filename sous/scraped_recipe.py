@@ -1,12 +1,12 @@
 import json
 import logging
+from collections.abc import Iterable
 from fractions import Fraction
 from functools import cached_property
 from typing import Any
 
-from ingredient_parser import parse_ingredient
-from ingredient_parser.dataclasses import IngredientAmount
-
+from sous.ingredient_cache import IngredientCache, ParsedAmount
+from sous.timings import Timings
 from sous.utils import Text
 
 SOUS_FORMAT_VERSION = 1
@@ -16,22 +16,58 @@ logger = logging.getLogger(__name__)
 
 
 class ScrapedRecipe:
-    def __init__(self, recipe_json: dict[Any, Any]) -> None:
+    def __init__(
+        self,
+        recipe_json: dict[Any, Any],
+        ingredient_cache: IngredientCache | None = None,
+    ) -> None:
         self.recipe_json = recipe_json
+        self.ingredient_cache = (
+            ingredient_cache
+            if ingredient_cache is not None
+            else IngredientCache.default()
+        )
+
+    @classmethod
+    def load(
+        cls, path: str, ingredient_cache: IngredientCache | None = None
+    ) -> "ScrapedRecipe":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), ingredient_cache)
+
+    @staticmethod
+    def parse_ingredients(recipes: Iterable["ScrapedRecipe"]) -> None:
+        """
+        Parse the ingredients of many recipes together, in batches, so that
+        `to_sous` only has to look them up. Sentences that fail to parse are
+        left for `to_sous` to report.
+        """
+        caches: dict[int, IngredientCache] = {}
+        sentences: dict[int, list[str]] = {}
+        for recipe in recipes:
+            key = id(recipe.ingredient_cache)
+            caches[key] = recipe.ingredient_cache
+            sentences.setdefault(key, []).extend(
+                recipe.recipe_json.get("ingredients") or []
+            )
+
+        for key, cache in caches.items():
+            cache.parse_many(sentences[key])
 
     def save(self, output_path: str) -> None:
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(self.recipe_json, f, ensure_ascii=False, indent=2)
 
     def to_sous(self, output_file_path: str | None = None) -> str:
-        lines: list[str] = []
-        lines.extend(self._title())
-        lines.extend(self._frontmatter())
-        lines.extend(self._intro())
-        lines.extend(self._ingredients())
-        lines.extend(self._steps())
+        with Timings.span("convert"):
+            lines: list[str] = []
+            lines.extend(self._title())
+            lines.extend(self._frontmatter())
+            lines.extend(self._intro())
+            lines.extend(self._ingredients())
+            lines.extend(self._steps())
 
-        result = "\n".join(lines)
+            result = "\n".join(lines)
 
         if output_file_path:
             with open(output_file_path, "w") as fh:
@@ -78,7 +114,7 @@ class ScrapedRecipe:
         result: list[str] = []
 
         for sentence in self.recipe_json["ingredients"]:
-            ingredient = parse_ingredient(sentence)
+            ingredient = self.ingredient_cache.parse(sentence)
             logger.info(ingredient)
 
             if not ingredient.name:
@@ -94,9 +130,9 @@ class ScrapedRecipe:
                     )
 
             names = [name.text for name in ingredient.name]
-            prep = f"{ingredient.preparation.text}" if ingredient.preparation else None
+            prep = ingredient.preparation
             amount = (
-                f"{{{self._format_amount(ingredient.amount[0])}}}"
+                f"{{{self._format_amount(ingredient.amount)}}}"
                 if ingredient.amount
                 else "{}"
             )
@@ -107,20 +143,21 @@ class ScrapedRecipe:
             ]
             result.append(Text.join(" ", components))
 
+        self.ingredient_cache.flush()
         if len(result):
             result.append("")
 
         return result
 
     @staticmethod
-    def _format_amount(amount: IngredientAmount) -> str:
+    def _format_amount(amount: ParsedAmount) -> str:
         qty_str = ScrapedRecipe._format_fraction(amount.quantity)
 
         if amount.RANGE and amount.quantity != amount.quantity_max:
             max_str = ScrapedRecipe._format_fraction(amount.quantity_max)
             qty_str = f"{qty_str} - {max_str}"
 
-        unit_str = str(amount.unit) if amount.unit else ""
+        unit_str = amount.unit
         if unit_str:
             effective_qty = amount.quantity_max if amount.RANGE else amount.quantity
             if effective_qty > 1 and not unit_str.endswith("s"):
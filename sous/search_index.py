@@ -0,0 +1,363 @@
+import bisect
+import hashlib
+import marshal
+import os
+import re
+from collections.abc import Iterable
+
+from sous.attribute import Attribute
+from sous.document import Document
+from sous.header import Header
+from sous.ingredient import Ingredient
+from sous.lexer import PARSER_VERSION
+from sous.prose import Prose
+from sous.recipe import Recipe
+
+INDEX_FILE_EXTENSION = ".index"
+
+# Bump whenever a change here changes the terms that are indexed for a recipe.
+INDEX_VERSION = 1
+
+WORD_RE = re.compile(r"\w+")
+
+QUERY_TOKEN_RE = re.compile(r'(?:[\w-]+:)?"[^"]*"\*?|[()]|[^\s()]+')
+
+INGREDIENT_FIELDS = ["ingredient", "i"]
+
+type Stamp = tuple[int, int, int]
+
+
+class SearchQueryError(ValueError):
+    pass
+
+
+class SearchIndex:
+    """
+    An inverted index from terms to the recipes that contain them.
+
+    Two kinds of terms are indexed for every recipe:
+
+    - ingredients: each normalized ingredient id (and each alternative of an
+      id such as "olive oil | avocado oil")
+    - words: every word of the recipe's name, attribute values, prose and
+      ingredient ids, plus name and attribute words scoped to where they came
+      from (e.g. "name:tofu" or "author:williams")
+
+    Queries are made of terms, which are ANDed together unless separated by
+    OR, and which can be negated with NOT or a leading "-" and grouped with
+    parentheses:
+
+        garlic                      any word
+        ingredient:"olive oil"      an ingredient (also i:"olive oil")
+        author:williams             a word in a field or attribute
+        garl*  i:chick*             a prefix of a word or ingredient
+        chickpeas garlic -cilantro
+        (tofu OR tempeh) NOT author:williams
+    """
+
+    def __init__(self) -> None:
+        self.paths: list[str | None] = []
+        self.stamps: dict[str, Stamp] = {}
+        self.ids: dict[str, int] = {}
+        self.words: dict[str, set[int]] = {}
+        self.ingredients: dict[str, set[int]] = {}
+
+        self._terms: dict[int, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+        self._free_ids: list[int] = []
+        self._dirty = False
+        self._sorted_words: list[str] | None = None
+        self._sorted_ingredients: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def sync(self, recipes: dict[str, tuple[Stamp, Recipe]]) -> None:
+        """
+        Bring the index up to date with the given recipes, keyed by path,
+        re-indexing only those whose stamp changed.
+        """
+        for filepath in [p for p in self.ids if p not in recipes]:
+            self.remove(filepath)
+
+        for filepath, (stamp, recipe) in recipes.items():
+            if self.stamps.get(filepath) != stamp:
+                self.add(filepath, stamp, recipe)
+
+    def add(self, filepath: str, stamp: Stamp, recipe: Recipe) -> None:
+        self.remove(filepath)
+
+        document = recipe.document
+        if document.projection != Document.PROJECTION_FULL:
+            document = document.project(Document.PROJECTION_FULL)
+
+        words, ingredients = self.terms(document)
+
+        if self._free_ids:
+            doc_id = self._free_ids.pop()
+            self.paths[doc_id] = filepath
+        else:
+            doc_id = len(self.paths)
+            self.paths.append(filepath)
+
+        self.ids[filepath] = doc_id
+        self.stamps[filepath] = stamp
+        self._terms[doc_id] = (words, ingredients)
+
+        for word in words:
+            self.words.setdefault(word, set()).add(doc_id)
+        for ingredient in ingredients:
+            self.ingredients.setdefault(ingredient, set()).add(doc_id)
+
+        self._sorted_words = self._sorted_ingredients = None
+        self._dirty = True
+
+    def remove(self, filepath: str) -> None:
+        doc_id = self.ids.pop(filepath, None)
+        if doc_id is None:
+            return
+
+        del self.stamps[filepath]
+        words, ingredients = self._terms.pop(doc_id)
+        self._discard(self.words, words, doc_id)
+        self._discard(self.ingredients, ingredients, doc_id)
+
+        self.paths[doc_id] = None
+        self._free_ids.append(doc_id)
+        self._sorted_words = self._sorted_ingredients = None
+        self._dirty = True
+
+    def search(self, query: str) -> set[str]:
+        """Return the paths of the recipes that match the given query."""
+        tokens = QUERY_TOKEN_RE.findall(query)
+        if not tokens:
+            raise SearchQueryError("Empty search query")
+
+        ids, position = self._parse_or(tokens, 0)
+        if position != len(tokens):
+            raise SearchQueryError(f"Unexpected '{tokens[position]}' in search query")
+
+        return {self.paths[doc_id] for doc_id in ids}  # type: ignore
+
+    def terms_for(self, filepath: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """Return the words and ingredients indexed for a recipe, if any."""
+        doc_id = self.ids.get(filepath)
+        return ((), ()) if doc_id is None else self._terms[doc_id]
+
+    @classmethod
+    def terms(cls, document: Document) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        words: set[str] = set()
+        ingredients: set[str] = set()
+
+        def add_words(text: str, field: str | None = None) -> None:
+            for word in WORD_RE.findall(text.lower()):
+                words.add(word)
+                if field:
+                    words.add(f"{field}:{word}")
+
+        def add_ingredient(ingredient: Ingredient) -> None:
+            for alternative in ingredient.id.split("|"):
+                normalized = cls.normalize(alternative)
+                if normalized:
+                    ingredients.add(normalized)
+                    add_words(normalized)
+
+        for node in document.nodes():
+            if isinstance(node, Header):
+                add_words(node.name, "name")
+            elif isinstance(node, Attribute):
+                add_words(node.value, node.name.lower())
+            elif isinstance(node, Ingredient):
+                add_ingredient(node)
+            elif isinstance(node, Prose):
+                add_words(node.text)
+                for ingredient in node.ingredients:
+                    add_ingredient(ingredient)
+
+        return tuple(sorted(words)), tuple(sorted(ingredients))
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    @staticmethod
+    def path_for(
+        directory: str, cookbook_paths: Iterable[str], recipe_paths: Iterable[str]
+    ) -> str:
+        """Where to store the index for a given set of cookbooks and recipes."""
+        key = repr(
+            (
+                [os.path.abspath(p) for p in cookbook_paths],
+                [os.path.abspath(p) for p in recipe_paths],
+            )
+        )
+        return os.path.join(
+            directory, hashlib.sha1(key.encode()).hexdigest() + INDEX_FILE_EXTENSION
+        )
+
+    def save(self, path: str) -> None:
+        """Write the index, unless it is unchanged since it was loaded or saved."""
+        if not self._dirty:
+            return
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            marshal.dump(
+                {
+                    "version": (INDEX_VERSION, PARSER_VERSION),
+                    "paths": self.paths,
+                    "stamps": self.stamps,
+                    "terms": self._terms,
+                    "words": self.words,
+                    "ingredients": self.ingredients,
+                },
+                fh,
+            )
+        os.replace(tmp_path, path)
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        """Load a saved index, or return an empty one if it is missing or stale."""
+        index = cls()
+
+        try:
+            with open(path, "rb") as fh:
+                data = marshal.load(fh)
+        except OSError, EOFError, ValueError, TypeError:
+            return index
+
+        if data.get("version") != (INDEX_VERSION, PARSER_VERSION):
+            return index
+
+        index.paths = data["paths"]
+        index.stamps = data["stamps"]
+        index.words = data["words"]
+        index.ingredients = data["ingredients"]
+        index._terms = data["terms"]
+        for doc_id, filepath in enumerate(index.paths):
+            if filepath is None:
+                index._free_ids.append(doc_id)
+            else:
+                index.ids[filepath] = doc_id
+
+        return index
+
+    @classmethod
+    def clear(cls, directory: str) -> int:
+        """Delete every saved index in the given directory."""
+        if not os.path.isdir(directory):
+            return 0
+
+        removed = 0
+        for name in os.listdir(directory):
+            if name.endswith(INDEX_FILE_EXTENSION):
+                os.unlink(os.path.join(directory, name))
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _discard(
+        postings: dict[str, set[int]], terms: Iterable[str], doc_id: int
+    ) -> None:
+        for term in terms:
+            ids = postings[term]
+            ids.discard(doc_id)
+            if not ids:
+                del postings[term]
+
+    def _parse_or(self, tokens: list[str], position: int) -> tuple[set[int], int]:
+        ids, position = self._parse_and(tokens, position)
+
+        while position < len(tokens) and tokens[position] == "OR":
+            other, position = self._parse_and(tokens, position + 1)
+            ids = ids | other
+
+        return ids, position
+
+    def _parse_and(self, tokens: list[str], position: int) -> tuple[set[int], int]:
+        ids, position = self._parse_not(tokens, position)
+
+        while position < len(tokens) and tokens[position] not in ("OR", ")"):
+            if tokens[position] == "AND":
+                position += 1
+            other, position = self._parse_not(tokens, position)
+            ids = ids & other
+
+        return ids, position
+
+    def _parse_not(self, tokens: list[str], position: int) -> tuple[set[int], int]:
+        if position == len(tokens):
+            raise SearchQueryError("Unexpected end of search query")
+
+        token = tokens[position]
+
+        if token == "NOT" or (token.startswith("-") and len(token) > 1):
+            if token == "NOT":
+                position += 1
+            else:
+                tokens = tokens[:position] + [token[1:]] + tokens[position + 1 :]
+            ids, position = self._parse_not(tokens, position)
+            return set(self.ids.values()) - ids, position
+
+        if token == "(":
+            ids, position = self._parse_or(tokens, position + 1)
+            if position == len(tokens) or tokens[position] != ")":
+                raise SearchQueryError("Unbalanced parentheses in search query")
+            return ids, position + 1
+
+        if token in ("OR", "AND", ")"):
+            raise SearchQueryError(f"Unexpected '{token}' in search query")
+
+        return self._match(token), position + 1
+
+    def _match(self, token: str) -> set[int]:
+        field = None
+        if not token.startswith('"') and ":" in token:
+            field, token = token.split(":", 1)
+            field = field.lower()
+
+        prefix = token.endswith("*")
+        text = token.rstrip("*").strip('"')
+
+        if field in INGREDIENT_FIELDS:
+            normalized = self.normalize(text)
+            if prefix:
+                return self._prefix(self.ingredients, normalized, ingredients=True)
+            return set(self.ingredients.get(normalized, ()))
+
+        words = WORD_RE.findall(text.lower())
+        if not words:
+            raise SearchQueryError(f"Nothing to search for in '{token}'")
+
+        ids: set[int] | None = None
+        for index, word in enumerate(words):
+            term = f"{field}:{word}" if field else word
+            if prefix and index == len(words) - 1:
+                matches = self._prefix(self.words, term, ingredients=False)
+            else:
+                matches = self.words.get(term, set())
+            ids = set(matches) if ids is None else ids & matches
+
+        return ids or set()
+
+    def _prefix(
+        self, postings: dict[str, set[int]], prefix: str, ingredients: bool
+    ) -> set[int]:
+        if ingredients:
+            if self._sorted_ingredients is None:
+                self._sorted_ingredients = sorted(postings)
+            keys = self._sorted_ingredients
+        else:
+            if self._sorted_words is None:
+                self._sorted_words = sorted(postings)
+            keys = self._sorted_words
+
+        ids: set[int] = set()
+        for key in keys[bisect.bisect_left(keys, prefix) :]:
+            if not key.startswith(prefix):
+                break
+            ids |= postings[key]
+
+        return ids
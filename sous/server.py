@@ -0,0 +1,294 @@
+import json
+import sys
+import threading
+import time
+import urllib.parse
+from collections import deque
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from sous.cookbook import Cookbook, CookbookChanges, CookbookWatcher
+from sous.recipe import Recipe
+from sous.search_index import SearchQueryError
+from sous.shopping_list import ShoppingList
+from sous.shopping_list_aggregator import ShoppingListAggregator
+from sous.shopping_list_config import ShoppingListConfig
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_RELOAD_INTERVAL_SECONDS = 1.0
+# The number of most recent requests to each route that latencies are
+# reported over.
+LATENCY_WINDOW = 1024
+MAX_REQUEST_BYTES = 1024 * 1024
+
+ROUTES = frozenset(
+    [
+        "GET /health",
+        "GET /metrics",
+        "GET /recipes",
+        "GET /recipes/{name}",
+        "POST /shopping-list",
+    ]
+)
+
+
+class RequestError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class RouteMetrics:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            **{
+                f"p{percentile}_ms": (
+                    round(latencies[(len(latencies) - 1) * percentile // 100], 3)
+                    if latencies
+                    else None
+                )
+                for percentile in (50, 90, 99)
+            },
+        }
+
+
+class CookbookServer(ThreadingHTTPServer):
+    """
+    A local HTTP server for a cookbook, which answers with JSON:
+
+    - `GET /health`: whether the server is up, how many recipes it has, and
+      the error of the last reload if it failed
+    - `GET /metrics`: requests, errors and latency percentiles by route
+    - `GET /recipes`: the name and path of every recipe, or with `?q=`, of
+      the recipes that match a search query
+    - `GET /recipes/<name>`: a recipe's ingredients and parsed paragraphs
+    - `POST /shopping-list`: a shopping list for a selection of recipes, as
+      `{"recipes": [{"name": ..., "ingredients": [...]}], "format": ...}`,
+      with every ingredient of a recipe that doesn't list any, grouped by the
+      server's config unless `"grouped": false`
+
+    The cookbook stays in memory and is refreshed every `reload_interval`
+    seconds in the background, which only re-parses the files that changed.
+    Each request is handled in its own thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        cookbook: Cookbook,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        config: ShoppingListConfig | None = None,
+        reload_interval: float = DEFAULT_RELOAD_INTERVAL_SECONDS,
+        quiet: bool = False,
+    ) -> None:
+        super().__init__((host, port), CookbookRequestHandler)
+        self.cookbook = cookbook
+        self.config = config
+        self.quiet = quiet
+        self.started_at = time.time()
+        self.reloads = 0
+
+        self._metrics: dict[str, RouteMetrics] = {}
+        self._metrics_lock = threading.Lock()
+        self._watcher: CookbookWatcher | None = None
+        if reload_interval > 0:
+            self._watcher = cookbook.watch(self._on_change, reload_interval)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+        super().server_close()
+
+    def record(self, route: str, seconds: float, failed: bool) -> None:
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(route, RouteMetrics())
+            metrics.requests += 1
+            metrics.errors += failed
+            metrics.latencies.append(seconds * 1000)
+
+    def health(self) -> dict[str, Any]:
+        health: dict[str, Any] = {"status": "ok", "recipes": len(self.cookbook.recipes)}
+        last_error = self._watcher.last_error if self._watcher is not None else None
+        if last_error is not None:
+            health["status"] = "reload failed"
+            health["last_error"] = last_error
+        return health
+
+    def metrics(self) -> dict[str, Any]:
+        with self._metrics_lock:
+            routes = {
+                route: metrics.to_dict()
+                for route, metrics in sorted(self._metrics.items())
+            }
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "recipes": len(self.cookbook.recipes),
+            "reloads": self.reloads,
+            "routes": routes,
+        }
+
+    def _on_change(self, changes: CookbookChanges) -> None:
+        self.reloads += 1
+        if not self.quiet:
+            sys.stderr.write(
+                f"Reloaded {len(changes.added)} added, {len(changes.modified)} "
+                f"modified and {len(changes.removed)} removed recipes\n"
+            )
+
+
+class CookbookRequestHandler(BaseHTTPRequestHandler):
+    server: CookbookServer
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: ANN401
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _handle(self) -> None:
+        start = time.perf_counter()
+        url = urllib.parse.urlsplit(self.path)
+        parts = [urllib.parse.unquote(part) for part in url.path.split("/") if part]
+        route = f"{self.command} /{'/'.join(parts[:1])}"
+        if len(parts) > 1:
+            route += "/{name}"
+
+        if route not in ROUTES or len(parts) > 2:
+            route = f"{self.command} (unknown)"
+
+        try:
+            status, body = HTTPStatus.OK, self._route(route, parts, url.query)
+        except RequestError as e:
+            status, body = e.status, {"error": str(e)}
+        except Exception as e:
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            body = {"error": f"{type(e).__name__}: {e}"}
+
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+        self.server.record(route, time.perf_counter() - start, status >= 500)
+
+    def _route(self, route: str, parts: list[str], query: str) -> dict[str, Any]:
+        match route:
+            case "GET /health":
+                return self.server.health()
+            case "GET /metrics":
+                return self.server.metrics()
+            case "GET /recipes":
+                return self._recipes(urllib.parse.parse_qs(query).get("q", [""])[0])
+            case "GET /recipes/{name}":
+                return self._recipe(parts[1])
+            case "POST /shopping-list":
+                return self._shopping_list(self._read_json())
+            case _:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"No route for {self.path}")
+
+    def _recipes(self, query: str) -> dict[str, Any]:
+        cookbook = self.server.cookbook
+        try:
+            recipes = cookbook.search(query) if query else cookbook.recipes
+        except SearchQueryError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from e
+
+        return {
+            "recipes": [
+                {"name": recipe.name, "path": recipe.document.filepath}
+                for recipe in recipes
+            ]
+        }
+
+    def _recipe(self, name: str) -> dict[str, Any]:
+        recipe = self._find(name)
+        return {
+            "name": recipe.name,
+            "path": recipe.document.filepath,
+            "ingredients": [asdict(i) for i in recipe.ingredients],
+            "paragraphs": [
+                [{"type": type(node).__name__.lower(), **asdict(node)} for node in p]
+                for p in recipe.document.paragraphs
+            ],
+        }
+
+    def _shopping_list(self, request: Any) -> dict[str, Any]:  # noqa: ANN401
+        selections = request.get("recipes") if isinstance(request, dict) else None
+        if not isinstance(selections, list):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Expected a list of recipes")
+
+        format = request.get("format", ShoppingList.FORMAT_EXPANDED)
+        if format not in ShoppingList.FORMATS:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid format: '{format}'")
+
+        aggregator = ShoppingListAggregator()
+        for selection in selections:
+            if isinstance(selection, str):
+                selection = {"name": selection}
+            if not isinstance(selection, dict) or not isinstance(
+                selection.get("name"), str
+            ):
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Recipe without a name")
+
+            ingredients = selection.get("ingredients")
+            if ingredients is not None and (
+                not isinstance(ingredients, list)
+                or not all(isinstance(i, str) for i in ingredients)
+            ):
+                raise RequestError(
+                    HTTPStatus.BAD_REQUEST,
+                    f"'ingredients' of '{selection['name']}' must be a list of names",
+                )
+
+            try:
+                aggregator.add_recipe(self._find(selection["name"]), ingredients)
+            except ValueError as e:
+                raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from e
+
+        config = self.server.config if request.get("grouped", True) else None
+        shopping_list = aggregator.snapshot(format, config)
+        return {**shopping_list.to_dict(), "text": str(shopping_list)}
+
+    def _find(self, name: str) -> Recipe:
+        recipe = self.server.cookbook.recipes_by_name.get(name)
+        if recipe is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown recipe '{name}'")
+        return recipe
+
+    def _read_json(self) -> Any:  # noqa: ANN401
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_REQUEST_BYTES:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Too large")
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}") from e
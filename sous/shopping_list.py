@@ -1,13 +1,15 @@
-from collections import defaultdict
-from typing import cast
-
-from simple_term_menu import TerminalMenu
+from collections.abc import Iterable
+from functools import cached_property
+from typing import Any, cast
 
 from sous.cookbook import Cookbook
 from sous.ingredient import Ingredient
 from sous.item import Item
+from sous.meal_plan import MealPlan
 from sous.recipe import Recipe
+from sous.recipe_picker import RecentRecipes, RecipePicker
 from sous.shopping_list_config import ShoppingListConfig
+from sous.timings import Timings
 
 
 class ShoppingList:
@@ -21,17 +23,82 @@ class ShoppingList:
         cookbook: Cookbook,
         format: str,
         config: ShoppingListConfig | None = None,
+        search_index_path: str | None = None,
+    ) -> "ShoppingList":
+        selected_ingredients: list[Ingredient] = []
+
+        with Timings.span("select"):
+            # Indexed once, for every recipe picked.
+            picker = RecipePicker.for_cookbook(
+                cookbook, RecentRecipes.default(), search_index_path
+            )
+            while True:
+                recipe = picker.show()
+                if recipe is None:
+                    break
+                selected_ingredients.extend(cls.__select_ingredients(recipe))
+
+        return cls(selected_ingredients, format, config)
+
+    @classmethod
+    def from_plan(
+        cls,
+        plan: MealPlan,
+        recipes_by_name: dict[str, Recipe],
+        format: str,
+        config: ShoppingListConfig | None = None,
     ) -> "ShoppingList":
+        """
+        Build a shopping list from the recipes and ingredients chosen in a meal
+        plan, instead of from the menus.
+        """
         selected_ingredients: list[Ingredient] = []
 
-        while True:
-            recipe = cls.__select_recipe(cookbook)
+        for planned in plan.recipes:
+            recipe = recipes_by_name.get(planned.name)
             if recipe is None:
-                break
-            selected_ingredients.extend(cls.__select_ingredients(recipe))
+                raise ValueError(
+                    f"Unknown recipe '{planned.name}' in meal plan at {plan.path}"
+                )
+
+            # Like the ingredient menu, offer each ingredient id once.
+            ingredients_by_id: dict[str, Ingredient] = {
+                ingredient.id.lower(): ingredient for ingredient in recipe.ingredients
+            }
+
+            unknown = [
+                i
+                for i in (planned.include or []) + planned.exclude
+                if i not in ingredients_by_id
+            ]
+            if unknown:
+                raise ValueError(
+                    f"Unknown ingredient '{unknown[0]}' for recipe '{planned.name}' "
+                    f"in meal plan at {plan.path}"
+                )
+
+            excluded = set(planned.exclude) | set(plan.exclude)
+            selected_ingredients.extend(
+                ingredient
+                for ingredient_id, ingredient in ingredients_by_id.items()
+                if (planned.include is None or ingredient_id in planned.include)
+                and ingredient_id not in excluded
+            )
 
         return cls(selected_ingredients, format, config)
 
+    @classmethod
+    def from_items(
+        cls,
+        items: Iterable[Item],
+        format: str,
+        config: ShoppingListConfig | None = None,
+    ) -> "ShoppingList":
+        """Make a shopping list of items that have already been aggregated."""
+        shopping_list = cls([], format, config)
+        shopping_list.items = set(items)
+        return shopping_list
+
     def __init__(
         self,
         ingredients: list[Ingredient],
@@ -39,21 +106,71 @@ class ShoppingList:
         config: ShoppingListConfig | None = None,
     ) -> None:
         if format not in self.FORMATS:
-            raise ValueError(f"Invalid shopping list format: '{self.format}'")
-
-        quantities: dict[Ingredient, list[str]] = defaultdict(list)
-        for ingredient in ingredients:
-            if ingredient.quantity:
-                quantities[ingredient].append(ingredient.quantity)
-
-        self.items = set(
-            [Item(ingredient.id, quantities[ingredient]) for ingredient in ingredients]
-        )
+            raise ValueError(f"Invalid shopping list format: '{format}'")
+
+        # Quantities are collected per item, whatever the descriptors or
+        # preparation of each ingredient, so that they can be added up.
+        with Timings.span("aggregate"):
+            quantities: dict[str, list[str]] = {}
+            for ingredient in ingredients:
+                item_quantities = quantities.setdefault(ingredient.id, [])
+                if ingredient.quantity:
+                    item_quantities.append(ingredient.quantity)
+
+            self.items = {Item(name, q) for name, q in quantities.items()}
         self.format = format
         self.config = config
 
     def __str__(self) -> str:
-        return "\n".join(self._format())
+        with Timings.span("format"):
+            return "\n".join(self._format())
+
+    @cached_property
+    def classification(self) -> dict[str, tuple[int, str | None]]:
+        """
+        The category index and category of each item in the config, looked up
+        once for all of the ways the list is formatted and checked.
+        """
+        if not self.config:
+            return {}
+        return {item.name: self.config.classify(item.name) for item in self.items}
+
+    def uncategorized(self) -> list[str]:
+        """Return the names of the items that aren't in the config, sorted."""
+        if not self.config:
+            return []
+        return sorted(
+            name
+            for name, (_, category) in self.classification.items()
+            if category is None
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the items in display order, each with all of its quantities,
+        their totals and its category (when there is a config), whatever the
+        format.
+        """
+        with Timings.span("format"):
+            classification = self.classification
+            if self.config:
+                items = self._sorted_by_category()
+            else:
+                items = sorted(self.items, key=lambda item: item.name)
+
+            return {
+                "items": [
+                    {
+                        "name": item.name,
+                        "quantities": item.quantities,
+                        "totals": item.totals,
+                        "category": (
+                            classification[item.name][1] if classification else None
+                        ),
+                    }
+                    for item in items
+                ]
+            }
 
     def _format(self) -> list[str]:
         result: list[str] = []
@@ -67,9 +184,7 @@ class ShoppingList:
                 result.append(f"{item.name} {uses}".strip())
         elif self.format == self.FORMAT_EXPANDED:
             for item in self.items:
-                quantities = (
-                    f"({', '.join(item.quantities)})" if item.quantities else ""
-                )
+                quantities = f"({', '.join(item.totals)})" if item.quantities else ""
                 result.append(f"{item.name} {quantities}".strip())
 
         return sorted(result)
@@ -77,15 +192,11 @@ class ShoppingList:
     def _format_grouped(self) -> list[str]:
         assert self.config is not None
 
-        sorted_items = sorted(
-            self.items, key=lambda item: self.config.sort_key(item.name)
-        )
-
         result: list[str] = []
         current_category: str | None = None
 
-        for item in sorted_items:
-            category = self.config.category_for(item.name)
+        for item in self._sorted_by_category():
+            _, category = self.classification[item.name]
 
             if category != current_category:
                 if result:
@@ -100,26 +211,25 @@ class ShoppingList:
 
         return result
 
+    def _sorted_by_category(self) -> list[Item]:
+        # The same order as `ShoppingListConfig.sort_key`.
+        return sorted(
+            self.items,
+            key=lambda item: (self.classification[item.name][0], item.name.lower()),
+        )
+
     def _format_item(self, item: Item) -> str:
         if self.format == self.FORMAT_COMPACT:
             uses = f"({len(item.quantities)})" if len(item.quantities) > 1 else ""
             return f"{item.name} {uses}".strip()
 
-        quantities = f"({', '.join(item.quantities)})" if item.quantities else ""
+        quantities = f"({', '.join(item.totals)})" if item.quantities else ""
         return f"{item.name} {quantities}".strip()
 
-    @classmethod
-    def __select_recipe(cls, cookbook: Cookbook) -> Recipe | None:
-        recipes_by_name: dict[str, Recipe] = {r.name: r for r in cookbook.recipes}
-        recipe_names: list[str] = list(recipes_by_name.keys())
-        recipe_selection_menu = TerminalMenu(
-            recipe_names, title="Please select a recipe:\n", show_search_hint=True
-        )
-        index: int | None = cast(int | None, recipe_selection_menu.show())
-        return recipes_by_name[recipe_names[index]] if index is not None else None
-
     @classmethod
     def __select_ingredients(cls, recipe: Recipe) -> list[Ingredient]:
+        from simple_term_menu import TerminalMenu
+
         ingredients_by_id: dict[str, Ingredient] = {
             ingredient.id: ingredient for ingredient in recipe.ingredients
         }
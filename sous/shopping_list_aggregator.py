@@ -0,0 +1,142 @@
+from collections.abc import Iterable
+
+from sous.ingredient import Ingredient
+from sous.item import Item
+from sous.recipe import Recipe
+from sous.shopping_list import ShoppingList
+from sous.shopping_list_config import ShoppingListConfig
+
+
+class ShoppingListAggregator:
+    """
+    A selection of recipes, and of their ingredients, that can change one
+    recipe or ingredient at a time, as in an interactive planner or a
+    long-lived server.
+
+    The quantities each recipe contributes are kept per ingredient id, so
+    adding or removing a recipe takes time in proportion to its ingredients,
+    and `snapshot()` only rebuilds the items that changed since the last one,
+    rather than aggregating the whole selection again.
+
+    Recipes are selected by name, and their ingredients by id. Every
+    occurrence of a selected ingredient in a recipe counts towards its
+    quantities.
+    """
+
+    def __init__(self) -> None:
+        # Each selected recipe's ingredients, by id, and which ids are selected.
+        self._ingredients: dict[str, dict[str, list[Ingredient]]] = {}
+        self._selected: dict[str, set[str]] = {}
+        # The quantities each recipe contributes to each ingredient id; an id
+        # is on the list as long as any recipe contributes to it.
+        self._contributions: dict[str, dict[str, list[str]]] = {}
+        self._items: dict[str, Item] = {}
+        self._stale: set[str] = set()
+
+    @property
+    def recipes(self) -> list[str]:
+        """The names of the selected recipes, in the order they were added."""
+        return list(self._ingredients)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ingredients
+
+    def selected(self, name: str) -> list[str]:
+        """Return the ids of the selected ingredients of a recipe, in order."""
+        selected = self._selected[self._check(name)]
+        return [i for i in self._ingredients[name] if i in selected]
+
+    def uses(self, ingredient_id: str) -> int:
+        """Return the number of selected recipes that use an ingredient."""
+        return len(self._contributions.get(ingredient_id, ()))
+
+    def add_recipe(
+        self, recipe: Recipe, ingredient_ids: Iterable[str] | None = None
+    ) -> None:
+        """
+        Select a recipe, with all of its ingredients or only those in
+        `ingredient_ids`. Adding a recipe again replaces its selection.
+        """
+        name = recipe.name
+        if not name:
+            raise ValueError(f"Recipe with no name at {recipe.document.filepath}")
+
+        ingredients: dict[str, list[Ingredient]] = {}
+        for ingredient in recipe.ingredients:
+            ingredients.setdefault(ingredient.id, []).append(ingredient)
+
+        selected = set(ingredients if ingredient_ids is None else ingredient_ids)
+        unknown = selected - ingredients.keys()
+        if unknown:
+            raise ValueError(f"Unknown ingredient '{min(unknown)}' for recipe '{name}'")
+
+        if name in self._ingredients:
+            self.remove_recipe(name)
+
+        self._ingredients[name] = ingredients
+        self._selected[name] = selected
+        for ingredient_id in ingredients:
+            if ingredient_id in selected:
+                self._contribute(name, ingredient_id)
+
+    def remove_recipe(self, name: str) -> None:
+        for ingredient_id in self._selected.pop(self._check(name)):
+            self._withdraw(name, ingredient_id)
+        del self._ingredients[name]
+
+    def toggle_ingredient(self, name: str, ingredient_id: str) -> bool:
+        """
+        Select an ingredient of a selected recipe if it isn't, or deselect it
+        if it is, and return whether it is now selected.
+        """
+        if ingredient_id not in self._ingredients[self._check(name)]:
+            raise ValueError(
+                f"Unknown ingredient '{ingredient_id}' for recipe '{name}'"
+            )
+
+        selected = self._selected[name]
+        if ingredient_id in selected:
+            selected.remove(ingredient_id)
+            self._withdraw(name, ingredient_id)
+            return False
+
+        selected.add(ingredient_id)
+        self._contribute(name, ingredient_id)
+        return True
+
+    def snapshot(
+        self, format: str, config: ShoppingListConfig | None = None
+    ) -> ShoppingList:
+        """Return the shopping list for the current selection."""
+        for ingredient_id in self._stale:
+            contributions = self._contributions.get(ingredient_id)
+            if contributions is None:
+                self._items.pop(ingredient_id, None)
+            else:
+                self._items[ingredient_id] = Item(
+                    ingredient_id,
+                    [q for quantities in contributions.values() for q in quantities],
+                )
+        self._stale.clear()
+
+        return ShoppingList.from_items(self._items.values(), format, config)
+
+    def _check(self, name: str) -> str:
+        if name not in self._ingredients:
+            raise ValueError(f"Recipe '{name}' isn't selected")
+        return name
+
+    def _contribute(self, name: str, ingredient_id: str) -> None:
+        self._contributions.setdefault(ingredient_id, {})[name] = [
+            ingredient.quantity
+            for ingredient in self._ingredients[name][ingredient_id]
+            if ingredient.quantity
+        ]
+        self._stale.add(ingredient_id)
+
+    def _withdraw(self, name: str, ingredient_id: str) -> None:
+        contributions = self._contributions[ingredient_id]
+        del contributions[name]
+        if not contributions:
+            del self._contributions[ingredient_id]
+        self._stale.add(ingredient_id)
@@ -1,6 +1,8 @@
 import tomllib
 from collections import OrderedDict
 
+from sous.utils import Text
+
 
 class ShoppingListConfig:
     """
@@ -13,6 +15,10 @@ class ShoppingListConfig:
 
         [produce]
         items = ["potatoes", "onions", "garlic"]
+        aliases = ["yukon golds", "shallots"]
+
+    Names match whatever their case, spacing or plural (see `forms`), and
+    aliases put other names in the same category as its items.
     """
 
     def __init__(self, path: str) -> None:
@@ -20,19 +26,38 @@ class ShoppingListConfig:
             data = tomllib.load(f)
 
         self.categories: OrderedDict[str, list[str]] = OrderedDict()
+        self.aliases: dict[str, list[str]] = {}
         for category, value in data.items():
             if isinstance(value, dict) and "items" in value:
                 self.categories[category] = [
                     item.lower() for item in value["items"]
                 ]
+                self.aliases[category] = [
+                    alias.lower() for alias in value.get("aliases", [])
+                ]
+
+        # Every form of every item name and alias, mapped to the first
+        # category that lists it, so that an item is classified with a lookup
+        # per form of its name.
+        self._index: dict[str, tuple[int, str]] = {}
+        for cat_index, (category, items) in enumerate(self.categories.items()):
+            for name in items + self.aliases[category]:
+                for form in self.forms(name):
+                    self._index.setdefault(form, (cat_index, category))
+
+    def classify(self, item_name: str) -> tuple[int, str | None]:
+        """
+        Return the index and name of the category for a given item, or the
+        number of categories and None if it is uncategorized.
+        """
+        for form in self.forms(item_name):
+            if form in self._index:
+                return self._index[form]
+        return (len(self.categories), None)
 
     def category_for(self, item_name: str) -> str | None:
         """Return the category name for a given item, or None if uncategorized."""
-        normalized = item_name.lower()
-        for category, items in self.categories.items():
-            if normalized in items:
-                return category
-        return None
+        return self.classify(item_name)[1]
 
     def sort_key(self, item_name: str) -> tuple[int, str]:
         """
@@ -40,8 +65,16 @@ class ShoppingListConfig:
         1. Category order (uncategorized items last)
         2. Alphabetical within each category
         """
-        normalized = item_name.lower()
-        for cat_index, (_, items) in enumerate(self.categories.items()):
-            if normalized in items:
-                return (cat_index, normalized)
-        return (len(self.categories), normalized)
+        return (self.classify(item_name)[0], item_name.lower())
+
+    @staticmethod
+    def forms(item_name: str) -> list[str]:
+        """
+        Lowercase a name and collapse its whitespace, and return it along with
+        each singular its last word could be the plural of. Two names match
+        when they share a form, so e.g. "Broccoli  Crowns" matches "broccoli
+        crown", and "cookies" matches "cookie" while "cherries" matches
+        "cherry".
+        """
+        *words, last = item_name.lower().split() or [""]
+        return [" ".join([*words, form]) for form in Text.singulars(last)]
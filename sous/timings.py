@@ -0,0 +1,191 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
+
+REGEX_CALLS_COUNTER = "regex calls"
+
+_DISABLED: AbstractContextManager[None] = nullcontext()
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+
+
+class _RecordingSpan:
+    __slots__ = ("name", "start_ns")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start_ns = 0
+
+    def __enter__(self) -> None:
+        self.start_ns = time.perf_counter_ns()
+
+    def __exit__(self, *_: object) -> None:
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        Timings.spans.append(
+            Span(self.name, self.start_ns, duration_ns, threading.get_ident())
+        )
+
+
+class _CountingPattern:
+    """A compiled regex that counts the calls to its matching methods."""
+
+    def __init__(self, pattern: re.Pattern[str]) -> None:
+        self.pattern = pattern
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        attribute = getattr(self.pattern, name)
+        if not callable(attribute):
+            return attribute
+
+        def counted(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            Timings.count(REGEX_CALLS_COUNTER)
+            return attribute(*args, **kwargs)
+
+        return counted
+
+
+class Timings:
+    """
+    Spans of time spent in each phase of a command, and counters of the work
+    done, for `--timings` and `--trace`.
+
+    Nothing is recorded until `enable()` is called. Until then, `span()`
+    returns a shared no-op context manager and `count()` returns immediately,
+    so instrumented code costs an attribute lookup. Only the main process is
+    recorded; work done by worker processes shows up as the time the main
+    process spends waiting for it.
+    """
+
+    enabled = False
+    spans: list[Span] = []
+    counters: Counter[str] = Counter()
+    started_at_ns = 0
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def enable(cls, regex_owners: tuple[ModuleType | type, ...] = ()) -> None:
+        """
+        Start recording. Calls to the compiled regexes defined at the top level
+        of the modules, or in the classes, in `regex_owners` are counted from
+        now on.
+        """
+        cls.enabled = True
+        cls.spans = []
+        cls.counters = Counter()
+        cls.started_at_ns = time.perf_counter_ns()
+
+        for owner in regex_owners:
+            for name, value in list(vars(owner).items()):
+                if isinstance(value, re.Pattern):
+                    setattr(owner, name, _CountingPattern(value))
+
+    @classmethod
+    def disable(cls) -> None:
+        """Stop recording; regexes that are being counted stay counted."""
+        cls.enabled = False
+
+    @classmethod
+    def span(cls, name: str) -> AbstractContextManager[None]:
+        """Record the time spent in a `with` block as a span called `name`."""
+        if not cls.enabled:
+            return _DISABLED
+        return _RecordingSpan(name)
+
+    @classmethod
+    def count(cls, name: str, amount: int = 1) -> None:
+        if not cls.enabled:
+            return
+        with cls._lock:
+            cls.counters[name] += amount
+
+    @classmethod
+    def add(cls, counters: Counter[str]) -> None:
+        """Add counters that were tallied locally, as in a tight loop."""
+        with cls._lock:
+            cls.counters.update(counters)
+
+    @classmethod
+    def summary(cls) -> str:
+        """Return a table of the total time in each phase, and the counters."""
+        elapsed_ns = time.perf_counter_ns() - cls.started_at_ns
+        totals: dict[str, list[int]] = {}
+        for span in cls.spans:
+            total = totals.setdefault(span.name, [0, 0])
+            total[0] += 1
+            total[1] += span.duration_ns
+
+        lines = [f"{'phase':<16} {'calls':>8} {'ms':>10} {'%':>6}"]
+        for name, (calls, duration_ns) in sorted(
+            totals.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            lines.append(
+                f"{name:<16} {calls:>8} {duration_ns / 1e6:>10.1f} "
+                f"{duration_ns / max(elapsed_ns, 1):>6.0%}"
+            )
+        lines.append(f"{'total':<16} {'':>8} {elapsed_ns / 1e6:>10.1f}")
+
+        if cls.counters:
+            lines.append("")
+            lines.append(f"{'counter':<24} {'count':>10}")
+            for name, value in sorted(cls.counters.items()):
+                lines.append(f"{name:<24} {value:>10}")
+
+        return "\n".join(lines)
+
+    @classmethod
+    def trace(cls) -> dict[str, Any]:
+        """Return the spans and counters as Chrome trace events."""
+        pid = os.getpid()
+        end_us = (time.perf_counter_ns() - cls.started_at_ns) / 1000
+        thread_ids: dict[int, int] = {threading.main_thread().ident or 0: 0}
+
+        events: list[dict[str, Any]] = []
+        for span in cls.spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "sous",
+                    "ph": "X",
+                    "ts": (span.start_ns - cls.started_at_ns) / 1000,
+                    "dur": span.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": thread_ids.setdefault(span.thread_id, len(thread_ids)),
+                }
+            )
+        events.extend(
+            {
+                "name": name,
+                "ph": "C",
+                "ts": end_us,
+                "pid": pid,
+                "tid": 0,
+                "args": {name: value},
+            }
+            for name, value in sorted(cls.counters.items())
+        )
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"command": " ".join(sys.argv), **cls.counters},
+        }
+
+    @classmethod
+    def write_trace(cls, path: str) -> None:
+        with open(path, "w") as fh:
+            json.dump(cls.trace(), fh)
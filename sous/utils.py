@@ -5,20 +5,49 @@ from typing import Any
 class Text:
     @staticmethod
     def pluralize(singular_noun: str, count: int) -> str:
-        pluralized = ""
+        pluralized = singular_noun if count == 1 else Text.plural(singular_noun)
+        return f"{count} {pluralized}"
 
-        if count == 1:
-            pluralized = singular_noun
-        elif re.search("[sxz]$", singular_noun) or re.search(
+    @staticmethod
+    def plural(singular_noun: str) -> str:
+        if re.search("[sxz]$", singular_noun) or re.search(
             "[^aeioudgkprt]h$", singular_noun
         ):
-            pluralized = re.sub("$", "es", singular_noun)
+            return re.sub("$", "es", singular_noun)
         elif re.search("[aeiou]y$", singular_noun):
-            pluralized = re.sub("y$", "ies", singular_noun)
+            return re.sub("y$", "ies", singular_noun)
         else:
-            pluralized = singular_noun + "s"
+            return singular_noun + "s"
 
-        return f"{count} {pluralized}"
+    @staticmethod
+    def singular(plural_noun: str) -> str:
+        """The inverse of `plural`, for nouns that `plural` would produce."""
+        if re.search("[sxz]es$", plural_noun) or re.search(
+            "[^aeioudgkprt]hes$", plural_noun
+        ):
+            return plural_noun[:-2]
+        elif re.search("[aeiou]ies$", plural_noun):
+            return plural_noun[:-3] + "y"
+        elif re.search("[^s]s$", plural_noun):
+            return plural_noun[:-1]
+        else:
+            return plural_noun
+
+    @staticmethod
+    def singulars(noun: str) -> list[str]:
+        """
+        `noun`, followed by each singular it could be the plural of, since
+        e.g. "cookies" and "cherries" (or "cheeses" and "boxes") end alike but
+        don't have singulars that end alike.
+        """
+        forms = [noun]
+        if re.search("[^s]s$", noun):
+            forms.append(noun[:-1])
+        if noun.endswith("es"):
+            forms.append(noun[:-2])
+        if noun.endswith("ies"):
+            forms.append(noun[:-3] + "y")
+        return forms
 
     @staticmethod
     def join(separator: str, collection: list[Any]) -> str:
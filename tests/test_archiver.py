@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import unittest
+
+from sous.archiver import Archiver, ArchiveReport
+from sous.dump_store import DumpStore
+
+
+class TestArchiver(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dump = os.path.join(self.tmp.name, "dump")
+        self.output = os.path.join(self.tmp.name, "output")
+        os.makedirs(os.path.join(self.dump, "nested"))
+
+        for index in range(4):
+            recipe = {
+                "title": f"Soup {index}",
+                "description": "",
+                "ingredients": [],
+                "instructions_list": ["Simmer."],
+            }
+            if index == 3:
+                del recipe["title"]
+
+            directory = self.dump if index % 2 else os.path.join(self.dump, "nested")
+            with open(os.path.join(directory, f"soup-{index}.json"), "w") as fh:
+                json.dump(recipe, fh)
+
+        with open(os.path.join(self.dump, "notes.txt"), "w") as fh:
+            fh.write("Not a recipe\n")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def archive(self, jobs: int) -> tuple[ArchiveReport, list[tuple[int, int]]]:
+        progress: list[tuple[int, int]] = []
+        report = Archiver(self.dump, self.output, jobs).run(
+            lambda done, total: progress.append((done, total))
+        )
+        return report, progress
+
+    def test_converts_files_and_reports_failures(self) -> None:
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                report, progress = self.archive(jobs)
+
+                self.assertEqual(report.converted, 3)
+                self.assertEqual(list(report.failures), [f"{self.dump}/soup-3.json"])
+                self.assertIn("KeyError", report.failures[f"{self.dump}/soup-3.json"])
+                self.assertEqual(progress[0], (0, 4))
+                self.assertEqual(progress[-1], (4, 4))
+
+                with open(os.path.join(self.output, "soup-2.sous")) as fh:
+                    self.assertTrue(fh.read().startswith("# Soup 2\n"))
+
+                for name in os.listdir(self.output):
+                    os.unlink(os.path.join(self.output, name))
+
+    def test_skips_files_that_are_up_to_date(self) -> None:
+        Archiver(self.dump, self.output).run()
+
+        os.utime(os.path.join(self.dump, "soup-1.json"), ns=(0, 2**62))
+        report = Archiver(self.dump, self.output).run()
+
+        self.assertEqual((report.converted, report.skipped), (1, 2))
+        self.assertEqual(len(report.failures), 1)
+
+    def test_converts_dump_stores(self) -> None:
+        store_path = os.path.join(self.tmp.name, "store")
+        with DumpStore(store_path) as store:
+            for name in sorted(os.listdir(self.dump)):
+                if name.endswith(".json"):
+                    with open(os.path.join(self.dump, name)) as fh:
+                        store.add(f"https://example.com/{name}", json.load(fh))
+
+        report = Archiver(store_path, self.output).run()
+        self.assertEqual(report.converted, 1)
+        self.assertEqual(list(report.failures), ["https://example.com/soup-3.json"])
+        self.assertEqual(os.listdir(self.output), ["soup-1.sous"])
+
+        report = Archiver(store_path, self.output).run()
+        self.assertEqual((report.converted, report.skipped), (0, 1))
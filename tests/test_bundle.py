@@ -0,0 +1,117 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from sous.bundle import Bundle, BundledDocument
+from sous.cookbook import Cookbook
+from sous.document import Document
+
+
+class TestBundle(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "cookbook")
+
+        for index in range(6):
+            directory = os.path.join(self.root, f"section-{index % 2}")
+            os.makedirs(directory, exist_ok=True)
+            contents = (
+                f"# Recipe {index}\n\n{{{index}}}[egg]\n{{}}[salt]\r\n"
+                if index % 5
+                else "No header here.\n"
+            )
+            with open(os.path.join(directory, f"recipe-{index}.sous"), "w") as fh:
+                fh.write(contents)
+
+        self.bundle_path = os.path.join(self.tmp.name, "cookbook.souspack")
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.count = Bundle.write(self.bundle_path, [self.root])
+        self.stderr = stderr.getvalue()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_write_skips_recipes_without_a_name(self) -> None:
+        self.assertEqual(self.count, 4)
+        self.assertIn("Ignoring recipe with no name", self.stderr)
+
+    def test_lists_names_from_the_index(self) -> None:
+        bundle = Bundle(self.bundle_path)
+
+        self.assertEqual(
+            sorted(bundle.names()), [f"Recipe {index}" for index in range(1, 5)]
+        )
+        self.assertEqual(
+            {entry.path for entry in bundle},
+            {
+                os.path.join("cookbook", os.path.relpath(p, self.root))
+                for p in Cookbook.discover(self.root)
+                if not p.endswith(("recipe-0.sous", "recipe-5.sous"))
+            },
+        )
+
+    def test_cookbooks_with_the_same_name_are_packed_apart(self) -> None:
+        paths = []
+        for parent in ["a", "b"]:
+            path = os.path.join(self.tmp.name, parent, "recipes")
+            os.makedirs(path)
+            with open(os.path.join(path, "stew.sous"), "w") as fh:
+                fh.write(f"# Stew from {parent}\n")
+            paths.append(path)
+
+        bundle_path = os.path.join(self.tmp.name, "recipes.souspack")
+        Bundle.write(bundle_path, paths)
+
+        self.assertEqual(
+            [(entry.name, entry.path) for entry in Bundle(bundle_path)],
+            [
+                ("Stew from a", os.path.join("recipes", "stew.sous")),
+                ("Stew from b", os.path.join("recipes-2", "stew.sous")),
+            ],
+        )
+
+    def test_parses_recipes_on_demand(self) -> None:
+        entry = Bundle(self.bundle_path).entries[0]
+        recipe = entry.recipe(Document.PROJECTION_NAME)
+
+        self.assertIsInstance(recipe.document, BundledDocument)
+        self.assertNotIn("paragraphs", recipe.document.__dict__)
+        self.assertEqual(recipe.name, entry.name)
+
+        ingredients = [str(i.id) for i in recipe.ingredients]
+        self.assertEqual(ingredients, ["egg", "salt"])
+
+    def test_cookbook_loads_bundle_like_a_directory(self) -> None:
+        with contextlib.redirect_stderr(io.StringIO()):
+            directory = Cookbook((self.root,), ())
+        bundled = Cookbook((self.bundle_path,), ())
+
+        def summary(cookbook: Cookbook) -> list[tuple[str, list[str]]]:
+            return sorted(
+                (str(r.name), [i.id for i in r.ingredients]) for r in cookbook.recipes
+            )
+
+        self.assertEqual(summary(bundled), summary(directory))
+        self.assertEqual([r.name for r in bundled.search("i:egg name:3")], ["Recipe 3"])
+
+    def test_cookbook_reloads_a_repacked_bundle(self) -> None:
+        cookbook = Cookbook((self.bundle_path,), ())
+        self.assertEqual(len(cookbook.recipes), 4)
+
+        os.unlink(os.path.join(self.root, "section-1", "recipe-1.sous"))
+        with contextlib.redirect_stderr(io.StringIO()):
+            Bundle.write(self.bundle_path, [self.root])
+
+        changes = cookbook.refresh()
+        self.assertEqual([r.name for r in changes.removed], ["Recipe 1"])
+        self.assertEqual(len(cookbook.recipes), 3)
+
+    def test_rejects_other_files(self) -> None:
+        path = os.path.join(self.tmp.name, "other.souspack")
+        with open(path, "wb") as fh:
+            fh.write(b"# Not a bundle\n" * 4)
+
+        with self.assertRaises(ValueError):
+            Bundle(path)
@@ -0,0 +1,20 @@
+import subprocess
+import sys
+import unittest
+
+from benchmarks.startup import HEAVY_MODULES
+
+
+class TestCli(unittest.TestCase):
+    def test_help_does_not_import_heavy_modules(self) -> None:
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, sous.cli; print(*sys.modules)"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        imported = set(result.stdout.split())
+        self.assertIn("sous.cli", imported)
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, imported)
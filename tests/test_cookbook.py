@@ -0,0 +1,221 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from sous.cookbook import Cookbook, CookbookChanges
+from sous.document import Document
+from sous.recipe import Recipe
+
+
+class TestCookbook(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+        for index in range(12):
+            directory = os.path.join(self.root, f"section-{index % 3}")
+            os.makedirs(directory, exist_ok=True)
+            contents = (
+                f"# Recipe {index}\n\n{{{index}}}[egg]\n"
+                if index % 5
+                else "No header here.\n"
+            )
+            with open(os.path.join(directory, f"recipe-{index}.sous"), "w") as fh:
+                fh.write(contents)
+
+        with open(os.path.join(self.root, "notes.txt"), "w") as fh:
+            fh.write("# Not a recipe\n")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _load(self, **kwargs: object) -> tuple[list[tuple[str, int]], str]:
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            cookbook = Cookbook((self.root,), (), **kwargs)  # type: ignore
+
+        recipes = [(str(r.name), len(r.ingredients)) for r in cookbook.recipes]
+        return recipes, stderr.getvalue()
+
+    def test_discovers_files_in_os_walk_order(self) -> None:
+        expected = [
+            os.path.join(root, file)
+            for root, _, files in os.walk(self.root)
+            for file in files
+            if file.endswith(".sous")
+        ]
+
+        self.assertEqual(list(Cookbook.discover(self.root)), expected)
+
+    def test_parallel_loading_matches_serial_loading(self) -> None:
+        serial = self._load()
+        self.assertEqual(len(serial[0]), 9)
+        self.assertEqual(serial[1].count("Ignoring recipe with no name"), 3)
+
+        cache_directory = os.path.join(self.root, ".cache")
+        variants = [
+            dict(jobs=3, pool=Cookbook.POOL_THREAD),
+            dict(jobs=2, pool=Cookbook.POOL_PROCESS),
+            dict(jobs=2, projection=Document.PROJECTION_NAME),
+            dict(jobs=2, cache_directory=cache_directory),
+            dict(jobs=2, cache_directory=cache_directory),
+        ]
+
+        for kwargs in variants:
+            with self.subTest(**kwargs):
+                self.assertEqual(self._load(**kwargs), serial)
+
+    def test_rejects_unknown_pools(self) -> None:
+        with self.assertRaises(ValueError):
+            Cookbook((self.root,), (), pool="fiber")
+
+
+class TestCookbookRefresh(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self._mtime_ns = time.time_ns()
+        self._write("broccoli.sous", "# Roasted broccoli\n")
+        self._write("tofu.sous", "# Mapo tofu\n")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _write(self, name: str, contents: str) -> str:
+        path = os.path.join(self.root, name)
+        with open(path, "w") as fh:
+            fh.write(contents)
+        # Every write gets a later mtime, so that rewrites of the same size are
+        # seen as changes even within the filesystem's timestamp resolution.
+        self._mtime_ns += 1_000_000_000
+        os.utime(path, ns=(self._mtime_ns, self._mtime_ns))
+        return path
+
+    def _names(self, recipes: list[Recipe]) -> list[str]:
+        return sorted(str(recipe.name) for recipe in recipes)
+
+    def test_refresh_without_changes_is_empty(self) -> None:
+        cookbook = Cookbook((self.root,), ())
+
+        changes = cookbook.refresh()
+
+        self.assertFalse(changes)
+        self.assertEqual(len(cookbook.recipes), 2)
+
+    def test_refresh_reports_and_applies_changes(self) -> None:
+        cache_directory = os.path.join(self.root, ".cache")
+        cookbook = Cookbook((self.root,), (), cache_directory=cache_directory)
+        unchanged = next(r for r in cookbook.recipes if r.name == "Mapo tofu")
+
+        self._write("broccoli.sous", "# Charred broccoli\n")
+        self._write("pozole.sous", "# Pozole verde\n")
+        os.unlink(os.path.join(self.root, "tofu.sous"))
+        self._write("tofu-2.sous", "# Mapo tofu, again\n")
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            self._write("notes.sous", "No header.\n")
+            changes = cookbook.refresh()
+
+        self.assertEqual(
+            self._names(changes.added), ["Mapo tofu, again", "Pozole verde"]
+        )
+        self.assertEqual(self._names(changes.modified), ["Charred broccoli"])
+        self.assertEqual(changes.removed, [unchanged])
+        self.assertEqual(
+            self._names(cookbook.recipes),
+            ["Charred broccoli", "Mapo tofu, again", "Pozole verde"],
+        )
+        self.assertFalse(cookbook.refresh())
+
+    def test_refresh_skips_files_deleted_after_discovery(self) -> None:
+        cookbook = Cookbook((self.root,), ())
+        gone = os.path.join(self.root, "gone.sous")
+        discover = Cookbook.discover
+
+        with mock.patch.object(
+            Cookbook, "discover", staticmethod(lambda path: [*discover(path), gone])
+        ):
+            self.assertFalse(cookbook.refresh())
+
+        with self.assertRaises(FileNotFoundError):
+            Cookbook((), (gone,))
+
+    def test_refresh_removes_deleted_recipe_paths(self) -> None:
+        path = self._write("pozole.sous", "# Pozole verde\n")
+        cookbook = Cookbook((self.root,), (path,))
+        os.unlink(path)
+
+        changes = cookbook.refresh()
+
+        self.assertEqual(self._names(changes.removed), ["Pozole verde"])
+        self.assertEqual(
+            self._names(cookbook.recipes), ["Mapo tofu", "Roasted broccoli"]
+        )
+        self.assertFalse(cookbook.refresh())
+
+    def test_refresh_only_parses_changed_files(self) -> None:
+        cookbook = Cookbook((self.root,), ())
+        tofu, broccoli = sorted(cookbook.recipes, key=lambda r: str(r.name))
+
+        self._write("tofu.sous", "# Mapo tofu with pork\n")
+        cookbook.refresh()
+
+        self.assertIn(broccoli, cookbook.recipes)
+        self.assertNotIn(tofu, cookbook.recipes)
+
+    def test_watch_reports_changes(self) -> None:
+        cookbook = Cookbook((self.root,), ())
+        reported: list[CookbookChanges] = []
+        event = threading.Event()
+
+        def callback(changes: CookbookChanges) -> None:
+            reported.append(changes)
+            event.set()
+
+        watcher = cookbook.watch(callback, interval=0.01)
+        self._write("pozole.sous", "# Pozole verde\n")
+        event.wait(timeout=5)
+        watcher.stop()
+
+        self.assertEqual(self._names(reported[0].added), ["Pozole verde"])
+
+    def test_watch_keeps_polling_after_a_failed_refresh(self) -> None:
+        cookbook = Cookbook((self.root,), ())
+        refresh = cookbook.refresh
+        broken = threading.Event()
+        broken.set()
+        reported: list[CookbookChanges] = []
+        event = threading.Event()
+
+        def flaky_refresh() -> CookbookChanges:
+            if broken.is_set():
+                raise OSError("Stale file handle")
+            return refresh()
+
+        def callback(changes: CookbookChanges) -> None:
+            reported.append(changes)
+            event.set()
+
+        with (
+            self.assertLogs("sous.cookbook", level="ERROR"),
+            mock.patch.object(cookbook, "refresh", flaky_refresh),
+        ):
+            watcher = cookbook.watch(callback, interval=0.01)
+            for _ in range(500):
+                if watcher.last_error is not None:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(watcher.last_error, "OSError: Stale file handle")
+
+            self._write("pozole.sous", "# Pozole verde\n")
+            broken.clear()
+            event.wait(timeout=5)
+            watcher.stop()
+
+        self.assertEqual(self._names(reported[0].added), ["Pozole verde"])
+        self.assertIsNone(watcher.last_error)
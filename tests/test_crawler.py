@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+from itertools import pairwise
+
+from sous.crawler import Crawler
+
+
+class TransientError(Exception):
+    pass
+
+
+class TestCrawler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lock = threading.Lock()
+        self.requests: list[tuple[str, float]] = []
+        self.failures: dict[str, int] = {}
+
+    def fetch(self, url: str) -> str:
+        with self.lock:
+            self.requests.append((url, time.monotonic()))
+            if self.failures.get(url):
+                self.failures[url] -= 1
+                raise TransientError(url)
+        return url.upper()
+
+    def crawler(self, **kwargs: object) -> Crawler:
+        return Crawler(
+            self.fetch,
+            lambda url: 0.1 if "slow" in url else 0.0,
+            is_transient=lambda e: isinstance(e, TransientError),
+            **kwargs,  # type: ignore
+        )
+
+    def test_fetches_every_url(self) -> None:
+        urls = [f"https://{host}.example/{i}" for i in range(3) for host in "abc"]
+
+        results = list(self.crawler().run(urls))
+
+        self.assertEqual(sorted(r.url for r in results), sorted(urls))
+        self.assertTrue(all(r.result == r.url.upper() for r in results))
+
+    def test_spaces_requests_to_each_host_independently(self) -> None:
+        urls = [f"https://slow-{host}.example/{i}" for i in range(3) for host in "ab"]
+
+        start = time.monotonic()
+        list(self.crawler().run(urls))
+        elapsed = time.monotonic() - start
+
+        for host in ["slow-a", "slow-b"]:
+            times = [t for url, t in self.requests if host in url]
+            gaps = [later - earlier for earlier, later in pairwise(times)]
+            self.assertTrue(all(gap >= 0.095 for gap in gaps), gaps)
+
+        # Both hosts' delays run at the same time, rather than one after another.
+        self.assertLess(elapsed, 0.5)
+
+    def test_retries_transient_failures(self) -> None:
+        self.failures = {"https://a.example/flaky": 2, "https://a.example/down": 5}
+
+        results = {
+            r.url: r
+            for r in self.crawler(retries=2, backoff=0.01).run(
+                ["https://a.example/flaky", "https://a.example/down"]
+            )
+        }
+
+        self.assertEqual(results["https://a.example/flaky"].attempts, 3)
+        self.assertIsNone(results["https://a.example/flaky"].error)
+        self.assertEqual(results["https://a.example/down"].attempts, 3)
+        self.assertIsInstance(results["https://a.example/down"].error, TransientError)
+
+    def test_does_not_retry_other_failures(self) -> None:
+        def fetch(url: str) -> str:
+            raise ValueError(url)
+
+        crawler = Crawler(fetch, lambda url: 0.0)
+        (result,) = crawler.run(["https://a.example/broken"])
+
+        self.assertEqual(result.attempts, 1)
+        self.assertIsInstance(result.error, ValueError)
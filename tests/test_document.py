@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from sous.document import Document
+from sous.header import Header
+from sous.ingredient import Ingredient
+from sous.prose import Prose
+
+RECIPE = """# Roasted broccoli
+
+@syntax 1
+
+{2} large [broccoli crowns], washed and trimmed
+{3 cloves} [garlic], minced
+
+Season with [garlic] and {}[black pepper].
+"""
+
+
+class TestDocument(unittest.TestCase):
+    def test_from_string_matches_file(self) -> None:
+        with tempfile.NamedTemporaryFile("w", suffix=".sous", delete=False) as f:
+            f.write(RECIPE)
+
+        from_file = Document(f.name)
+        paragraphs = from_file.paragraphs
+        os.unlink(f.name)
+
+        from_string = Document.from_string(RECIPE)
+
+        self.assertEqual(paragraphs, from_string.paragraphs)
+        self.assertEqual(from_string.paragraphs[0], [Header(1, "Roasted broccoli")])
+        self.assertEqual(
+            from_string.paragraphs[3],
+            [
+                Prose(
+                    "Season with [garlic] and {}[black pepper].",
+                    [Ingredient(id="black pepper", quantity="")],
+                )
+            ],
+        )
+
+    def test_from_bytes_handles_windows_line_endings(self) -> None:
+        document = Document.from_bytes(RECIPE.replace("\n", "\r\n").encode())
+
+        self.assertEqual(document.paragraphs, Document.from_string(RECIPE).paragraphs)
+        self.assertEqual(document.filepath, "<bytes>")
+
+    def test_name_projection_stops_reading_after_first_header(self) -> None:
+        contents = "# Roasted broccoli\n\n" + "Prose.\n" * 10000
+        with tempfile.NamedTemporaryFile("wb", suffix=".sous", delete=False) as f:
+            f.write(contents.encode() + b"\xff\xfe invalid utf-8\n")
+
+        named = Document(f.name, projection=Document.PROJECTION_NAME)
+        full = Document(f.name)
+
+        self.assertEqual(named.paragraphs, [[Header(1, "Roasted broccoli")]])
+        self.assertEqual(next(full.nodes()), Header(1, "Roasted broccoli"))
+        with self.assertRaises(UnicodeDecodeError):
+            _ = full.paragraphs
+
+        os.unlink(f.name)
+
+    def test_ingredients_projection_skips_comments_and_plain_prose(self) -> None:
+        document = Document.from_string(
+            RECIPE + "% A comment\n\nServe warm.\n",
+            projection=Document.PROJECTION_INGREDIENTS,
+        )
+
+        self.assertEqual(
+            document.summarize(),
+            "Header\n\nAttribute\n\nIngredient\nIngredient\n\nProse (1)\n",
+        )
+
+    def test_rejects_unknown_projections(self) -> None:
+        with self.assertRaises(ValueError):
+            Document.from_string(RECIPE, projection="summary")
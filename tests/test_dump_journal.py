@@ -0,0 +1,96 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from sous.dump_journal import DumpJournal
+
+URLS = [f"https://example.com/recipes/{index}" for index in range(10)]
+
+
+class TestDumpJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = DumpJournal.path_for(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def journal(self, worker: str, lease: float = 60) -> DumpJournal:
+        journal = DumpJournal(self.path, worker=worker, lease=lease)
+        self.addCleanup(journal.close)
+        return journal
+
+    def test_add_skips_known_urls(self) -> None:
+        journal = self.journal("a")
+        self.assertEqual(journal.add(URLS[:6]), 6)
+        self.assertEqual(journal.add(URLS), 4)
+        self.assertEqual(journal.status().pending, 10)
+
+    def test_workers_claim_disjoint_jobs(self) -> None:
+        self.journal("setup").add(URLS)
+        claims: dict[str, list[str]] = {}
+
+        def work(worker: str) -> None:
+            journal = DumpJournal(self.path, worker=worker)
+            claims[worker] = []
+            while claimed := journal.claim(2):
+                claims[worker].extend(claimed)
+                for url in claimed:
+                    journal.complete(url, os.path.join(self.tmp.name, "out.json"))
+            journal.close()
+
+        threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        claimed = [url for urls in claims.values() for url in urls]
+        self.assertCountEqual(claimed, URLS)
+        self.assertEqual(self.journal("check").status().done, 10)
+
+    def test_lapsed_claims_are_claimed_again(self) -> None:
+        crashed = self.journal("crashed", lease=0)
+        crashed.add(URLS[:2])
+        self.assertEqual(crashed.claim(5), URLS[:2])
+
+        survivor = self.journal("survivor", lease=0)
+        self.assertEqual(survivor.claim(5), URLS[:2])
+        self.assertEqual(self.journal("fresh").claim(5), [])
+
+    def test_renewed_claims_are_kept(self) -> None:
+        worker = self.journal("worker", lease=0.5)
+        worker.add(URLS[:2])
+        self.assertEqual(worker.claim(5), URLS[:2])
+
+        time.sleep(0.35)
+        worker.renew()
+        time.sleep(0.25)
+        self.assertEqual(self.journal("other", lease=0.5).claim(5), [])
+
+    def test_released_claims_are_claimed_again_at_once(self) -> None:
+        interrupted = self.journal("interrupted")
+        interrupted.add(URLS[:3])
+        first, *rest = interrupted.claim(3)
+        interrupted.complete(first, "first.json")
+
+        self.assertEqual(interrupted.release(), 2)
+        self.assertEqual(self.journal("next").claim(5), rest)
+
+    def test_failures_are_only_retried_on_request(self) -> None:
+        journal = self.journal("a")
+        journal.add(URLS[:2])
+        first, second = journal.claim(2)
+        journal.complete(first, "first.json", attempts=1)
+        journal.fail(second, "HTTPError: 404", attempts=2)
+
+        status = journal.status()
+        self.assertEqual((status.done, status.failed, status.pending), (1, 1, 0))
+        self.assertGreater(status.throughput, 0)
+        self.assertEqual(journal.failures(), [(second, "HTTPError: 404")])
+        self.assertEqual(journal.claim(2), [])
+
+        self.assertEqual(journal.retry_failed(), 1)
+        self.assertEqual(journal.claim(2), [second])
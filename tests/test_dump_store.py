@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from sous.dump_store import DUMP_STORE_DATA_FILE_NAME, DumpStore
+
+
+def recipe(index: int) -> dict[str, str]:
+    return {"title": f"Soup {index}", "description": f"Line\u2028separated {index}"}
+
+
+class TestDumpStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "dumps")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_recipes_are_written_in_chunks(self) -> None:
+        with DumpStore(self.path, chunk_size=3) as store:
+            flushed = [store.add(f"url-{index}", recipe(index)) for index in range(7)]
+            self.assertEqual(flushed, [False, False, True] * 2 + [False])
+            self.assertEqual(len(store), 6)
+            self.assertIsNone(store.get("url-6"))
+        self.assertTrue(DumpStore.exists(self.path))
+
+        with DumpStore(self.path) as store:
+            self.assertEqual(len(store), 7)
+            self.assertEqual(store.get("url-4"), recipe(4))
+            self.assertEqual(store.get("url-6"), recipe(6))
+            self.assertIsNone(store.get("url-7"))
+            self.assertEqual(store.find("Soup 5"), ["url-5"])
+            self.assertEqual(
+                [recipe_id for recipe_id, _ in store],
+                [f"url-{index}" for index in range(7)],
+            )
+
+    def test_adding_again_supersedes(self) -> None:
+        with DumpStore(self.path) as store:
+            store.add("url", recipe(1))
+            store.flush()
+            store.add("url", recipe(2))
+
+        with DumpStore(self.path) as store:
+            self.assertEqual(list(store), [("url", recipe(2))])
+
+    def test_is_smaller_than_pretty_printed_files(self) -> None:
+        with DumpStore(self.path) as store:
+            for index in range(100):
+                store.add(f"url-{index}", {**recipe(index), "steps": ["Simmer."] * 20})
+
+        size = os.path.getsize(os.path.join(self.path, DUMP_STORE_DATA_FILE_NAME))
+        self.assertLess(size, 100 * 200)
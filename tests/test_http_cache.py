@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from typing import Any
+
+import requests
+
+from sous.http_cache import HttpCache, OfflineCacheMiss
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, text: str, headers: dict[str, str]) -> None:
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(response=self)  # type: ignore
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.pages: dict[str, tuple[str, str]] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+
+    def get(self, url: str, headers: dict[str, str], **kwargs: Any) -> FakeResponse:  # noqa: ANN401
+        self.requests.append((url, headers))
+        if url not in self.pages:
+            return FakeResponse(404, "", {})
+
+        text, etag = self.pages[url]
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304, "", {})
+        return FakeResponse(200, text, {"ETag": etag})
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.session = FakeSession()
+        self.session.pages = {
+            "https://a.example/1": ("<html>one</html>", '"v1"'),
+            "https://a.example/2": ("<html>two</html>", '"v1"'),
+        }
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def get(self, cache: HttpCache, url: str) -> str:
+        return cache.get(self.session, url, timeout=1)  # type: ignore
+
+    def test_revalidates_cached_pages(self) -> None:
+        cache = HttpCache(self.tmp.name)
+
+        self.assertEqual(self.get(cache, "https://a.example/1"), "<html>one</html>")
+        self.assertEqual(self.get(cache, "https://a.example/1"), "<html>one</html>")
+        self.assertEqual((cache.misses, cache.revalidated), (1, 1))
+        self.assertEqual(self.session.requests[1][1], {"If-None-Match": '"v1"'})
+
+        self.session.pages["https://a.example/1"] = ("<html>new</html>", '"v2"')
+        self.assertEqual(self.get(cache, "https://a.example/1"), "<html>new</html>")
+        self.assertEqual(
+            self.get(HttpCache(self.tmp.name), "https://a.example/1"),
+            "<html>new</html>",
+        )
+
+    def test_offline_mode_never_uses_the_network(self) -> None:
+        self.get(HttpCache(self.tmp.name), "https://a.example/1")
+        self.session.requests.clear()
+
+        offline = HttpCache(self.tmp.name, offline=True)
+        self.assertEqual(self.get(offline, "https://a.example/1"), "<html>one</html>")
+        with self.assertRaises(OfflineCacheMiss):
+            self.get(offline, "https://a.example/2")
+        self.assertEqual(self.session.requests, [])
+
+    def test_evicts_least_recently_used_pages(self) -> None:
+        cache = HttpCache(self.tmp.name)
+        self.get(cache, "https://a.example/1")
+        page_size = HttpCache.stats(self.tmp.name)["bytes"]
+
+        cache = HttpCache(self.tmp.name, max_bytes=page_size + page_size // 2)
+        self.get(cache, "https://a.example/2")
+
+        self.assertEqual(HttpCache.stats(self.tmp.name)["pages"], 1)
+        self.assertFalse(os.path.exists(cache._path("https://a.example/1")))
+        self.assertTrue(os.path.exists(cache._path("https://a.example/2")))
+
+    def test_does_not_cache_errors(self) -> None:
+        cache = HttpCache(self.tmp.name)
+
+        with self.assertRaises(requests.HTTPError):
+            self.get(cache, "https://a.example/missing")
+        self.assertEqual(HttpCache.clear(self.tmp.name), 0)
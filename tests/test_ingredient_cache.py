@@ -0,0 +1,154 @@
+import os
+import tempfile
+import unittest
+from fractions import Fraction
+from types import SimpleNamespace
+from typing import Any
+
+from sous.ingredient_cache import (
+    IngredientCache,
+    ParsedAmount,
+    ParsedIngredient,
+    ParsedName,
+)
+from sous.scraped_recipe import ScrapedRecipe
+
+SALT = ParsedIngredient(
+    name=(ParsedName("kosher salt", 0.98),),
+    amount=ParsedAmount(Fraction(1), Fraction(1), "teaspoon"),
+)
+BUTTER = ParsedIngredient(
+    name=(ParsedName("butter", 0.99),),
+    amount=ParsedAmount(Fraction(3, 2), Fraction(2), "cup", RANGE=True),
+    preparation="melted",
+)
+
+
+class FakeParser:
+    """Parses every sentence as just an ingredient name, and fails on "!"."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, sentences: list[str]) -> list[Any]:
+        self.calls.append(sentences)
+        if "!" in sentences:
+            raise ValueError("Unparseable")
+        return [
+            SimpleNamespace(
+                name=[SimpleNamespace(text=s, confidence=1.0)],
+                amount=[],
+                preparation=None,
+            )
+            for s in sentences
+        ]
+
+
+class TestIngredientCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ingredients.sqlite3")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_encode_round_trip(self) -> None:
+        for parsed in [SALT, BUTTER, ParsedIngredient(name=())]:
+            self.assertEqual(ParsedIngredient.decode(parsed.encode()), parsed)
+
+    def test_persists_after_flush(self) -> None:
+        cache = IngredientCache(self.path)
+        cache.put("1 teaspoon kosher salt", SALT)
+        self.assertIsNone(IngredientCache(self.path).get("1 teaspoon kosher salt"))
+
+        cache.flush()
+        reopened = IngredientCache(self.path)
+        self.assertEqual(reopened.get("1 teaspoon kosher salt"), SALT)
+        self.assertEqual(reopened.hits, 1)
+        self.assertEqual(IngredientCache.stats(self.path)["sentences"], 1)
+
+    def test_other_parser_versions_are_ignored(self) -> None:
+        cache = IngredientCache(self.path)
+        cache.put("1 teaspoon kosher salt", SALT)
+        cache.flush()
+
+        upgraded = IngredientCache(self.path)
+        upgraded.version = "other"
+        self.assertIsNone(upgraded.get("1 teaspoon kosher salt"))
+        self.assertEqual(upgraded.misses, 1)
+        self.assertEqual(len(upgraded), 0)
+
+    def test_memory_is_least_recently_used(self) -> None:
+        cache = IngredientCache(self.path, memory_size=2)
+        cache.put("a", SALT)
+        cache.put("b", SALT)
+        cache.get("a")
+        cache.put("c", BUTTER)
+
+        self.assertEqual(list(cache._memory), ["a", "c"])
+
+    def test_parse_many_parses_each_sentence_once(self) -> None:
+        parser = FakeParser()
+        cache = IngredientCache(self.path, parser=parser)
+        cache.put("salt", SALT)
+
+        results = cache.parse_many(["salt", "oil", "rice", "oil ", "!"], batch_size=2)
+
+        self.assertEqual(results[0], SALT)
+        self.assertEqual([r.name[0].text for r in results[1:4]], ["oil", "rice", "oil"])
+        self.assertIsNone(results[4])
+        self.assertEqual(parser.calls, [["oil", "rice"], ["!"], ["!"]])
+        self.assertEqual(IngredientCache.stats(self.path)["sentences"], 3)
+
+    def test_scraped_recipes_parse_ingredients_together(self) -> None:
+        parser = FakeParser()
+        cache = IngredientCache(self.path, parser=parser)
+        recipes = [
+            ScrapedRecipe(
+                {
+                    "title": title,
+                    "description": "",
+                    "ingredients": ingredients,
+                    "instructions_list": [],
+                },
+                ingredient_cache=cache,
+            )
+            for title, ingredients in [("A", ["oil", "rice"]), ("B", ["rice"])]
+        ]
+
+        ScrapedRecipe.parse_ingredients(recipes)
+
+        self.assertEqual(parser.calls, [["oil", "rice"]])
+        self.assertIn("{}[rice]", recipes[1].to_sous())
+        self.assertEqual(len(parser.calls), 1)
+
+    def test_scraped_recipe_uses_cache(self) -> None:
+        cache = IngredientCache(self.path)
+        cache.put("1 teaspoon kosher salt", SALT)
+        cache.put("1 1/2 - 2 cups butter, melted", BUTTER)
+
+        recipe = ScrapedRecipe(
+            {
+                "title": "Buttery Salt",
+                "description": "",
+                "ingredients": [
+                    "1  teaspoon kosher salt",
+                    "1 1/2 - 2 cups butter, melted",
+                ],
+                "instructions_list": ["Mix."],
+            },
+            ingredient_cache=cache,
+        )
+
+        self.assertIn("{1 teaspoon}[kosher salt]", recipe.to_sous())
+        self.assertIn("{1 1/2 - 2 cups}[butter] melted", recipe.to_sous())
+        self.assertEqual(cache.misses, 0)
+        self.assertEqual(IngredientCache.stats(self.path)["sentences"], 2)
+
+    def test_clear(self) -> None:
+        cache = IngredientCache(self.path)
+        cache.put("a", SALT)
+        cache.flush()
+
+        self.assertEqual(IngredientCache.clear(self.path), 1)
+        self.assertEqual(IngredientCache.stats(self.path)["sentences"], 0)
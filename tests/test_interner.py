@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sous.cookbook import Cookbook
+from sous.document import Document
+from sous.ingredient import Ingredient
+from sous.interner import Interner
+from sous.prose import Prose
+
+RECIPE = """# {name}
+
+@author Lérè Williams
+
+{{3 cloves}} [garlic], minced
+{{}}[kosher salt]
+
+Season with {{}}[kosher salt].
+"""
+
+
+class TestInterner(unittest.TestCase):
+    def test_shares_equal_ingredients(self) -> None:
+        interner = Interner()
+
+        first = interner.node(Ingredient(id="garlic", quantity="3 cloves"))
+        second = interner.node(Ingredient(id="garlic", quantity="3 cloves"))
+        prose = interner.node(Prose("Add {}[garlic].", [Ingredient(id="garlic")]))
+
+        self.assertIs(first, second)
+        assert isinstance(prose, Prose)
+        self.assertIs(prose.ingredients[0].id, first.id)
+
+    def test_interned_documents_are_equal_to_plain_documents(self) -> None:
+        interner = Interner()
+        text = RECIPE.format(name="Garlic")
+
+        plain = Document.from_string(text)
+        interned = Document.from_string(text, interner=interner)
+        other = Document.from_string(
+            RECIPE.format(name="More garlic"), interner=interner
+        )
+
+        self.assertEqual(interned.paragraphs, plain.paragraphs)
+        self.assertIs(interned.paragraphs[2][0], other.paragraphs[2][0])
+        self.assertIs(interned.paragraphs[1][0].name, other.paragraphs[1][0].name)  # type: ignore
+
+    def test_name_projection_interns_the_header(self) -> None:
+        interner = Interner()
+        text = RECIPE.format(name="Garlic")
+
+        with mock.patch.object(interner, "node", wraps=interner.node) as node:
+            document = Document.from_string(
+                text, projection=Document.PROJECTION_NAME, interner=interner
+            )
+            header = document.paragraphs[0][0]
+
+        node.assert_called_once_with(header)
+
+    def test_cookbook_interns_across_recipes(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            for name in ["Garlic", "More garlic", "Even more garlic"]:
+                with open(os.path.join(root, f"{name}.sous"), "w") as fh:
+                    fh.write(RECIPE.format(name=name))
+
+            plain = Cookbook((root,), ())
+            variants = [
+                Cookbook((root,), (), intern=True),
+                Cookbook((root,), (), intern=True, jobs=2),
+                Cookbook((root,), (), intern=True, jobs=2, pool=Cookbook.POOL_THREAD),
+                Cookbook(
+                    (root,),
+                    (),
+                    intern=True,
+                    cache_directory=os.path.join(root, ".cache"),
+                ),
+            ]
+
+            for cookbook in variants:
+                with self.subTest(jobs=cookbook.jobs, pool=cookbook.pool):
+                    self.assertEqual(
+                        [r.document.paragraphs for r in cookbook.recipes],
+                        [r.document.paragraphs for r in plain.recipes],
+                    )
+                    salts = {
+                        id(recipe.document.paragraphs[2][1])
+                        for recipe in cookbook.recipes
+                    }
+                    self.assertEqual(len(salts), 1)
@@ -0,0 +1,101 @@
+import random
+import unittest
+
+from sous.attribute import Attribute
+from sous.comment import Comment
+from sous.header import Header
+from sous.ingredient import Ingredient
+from sous.lexer import Lexer, Node
+from sous.prose import Prose
+
+
+def parse_with_regexes(line: str) -> Node:
+    header = Header.RE.match(line)
+    if header:
+        return Header(len(header.group("level")), header.group("name"))
+
+    attribute = Attribute.RE.match(line)
+    if attribute:
+        return Attribute(attribute.group("name"), attribute.group("value"))
+
+    comment = Comment.RE.match(line)
+    if comment:
+        return Comment(comment.group("comment"))
+
+    block_ingredient_def = Ingredient.parse_block_definition(line)
+    if block_ingredient_def:
+        return block_ingredient_def
+
+    return Prose(line, Ingredient.parse_inline_definitions(line))
+
+
+class TestLexer(unittest.TestCase):
+    def test_parse_line_matches_regexes(self) -> None:
+        test_cases = [
+            "# Roasted broccoli",
+            "## Sauce",
+            "#hashtag",
+            "#\tTabbed",
+            "@author Lérè Williams",
+            "@cook-time 20 minutes",
+            "@ author",
+            "@author",
+            "@a.b c",
+            "% Syntax for optional ingredients coming soon!",
+            "%no space",
+            "{2} large [broccoli crowns], washed and trimmed",
+            "{3 cloves} [garlic], minced",
+            "{} extra virgin [olive oil | avocado oil]",
+            "{}[red pepper flakes]",
+            "{1/2}[lemon], for juicing",
+            "{}[]",
+            "{}[salt, pepper]",
+            "{no closing brace [salt]",
+            "Season with [garlic], {}[Kosher salt] and {}[black pepper].",
+            "{{}[a]}[b]",
+            "{}[a{}[b]",
+            "{} {}[a]",
+            "Plain prose with no ingredients.",
+        ]
+
+        for line in test_cases:
+            with self.subTest(line=line):
+                self.assertEqual(parse_with_regexes(line), Lexer.parse_line(line))
+
+    def test_parse_line_matches_regexes_on_random_lines(self) -> None:
+        rng = random.Random(0)
+        alphabet = "#@%{}[],|-_ \ta1é"
+
+        for _ in range(20000):
+            line = "".join(rng.choices(alphabet, k=rng.randint(1, 16))).strip()
+            if not line:
+                continue
+
+            with self.subTest(line=line):
+                self.assertEqual(parse_with_regexes(line), Lexer.parse_line(line))
+
+    def test_project_line_filters_node_types(self) -> None:
+        lines = [
+            "# Header",
+            "#not a header",
+            "@author Someone",
+            "% comment",
+            "{1}[egg]",
+            "{1} no id",
+            "Prose with {}[salt].",
+        ]
+        projections: list[frozenset[type]] = [
+            frozenset([Header]),
+            frozenset([Header, Attribute, Ingredient, Prose]),
+            frozenset([Comment]),
+            frozenset([Prose]),
+        ]
+
+        for node_types in projections:
+            for line in lines:
+                with self.subTest(line=line, node_types=node_types):
+                    node = Lexer.parse_line(line)
+                    self.assertEqual(
+                        node if type(node) in node_types else None,
+                        Lexer.project_line(line, node_types),
+                    )
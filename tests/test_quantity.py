@@ -0,0 +1,53 @@
+import unittest
+from fractions import Fraction
+
+from sous.quantity import UNITS, Quantity
+
+
+class TestQuantity(unittest.TestCase):
+    def test_parse(self) -> None:
+        test_cases: list[tuple[str, Quantity | None]] = [
+            ("2", Quantity(Fraction(2), Fraction(2))),
+            ("1 1/2", Quantity(Fraction(3, 2), Fraction(3, 2))),
+            ("1 - 2", Quantity(Fraction(1), Fraction(2))),
+            ("1½ cups", Quantity(Fraction(3, 2), Fraction(3, 2), UNITS["cup"])),
+            ("0.25 Tbsp.", Quantity(Fraction(1, 4), Fraction(1, 4), UNITS["tbsp"])),
+            ("2 to 3 T", Quantity(Fraction(2), Fraction(3), UNITS["tablespoon"])),
+            ("1 t", Quantity(Fraction(1), Fraction(1), UNITS["teaspoon"])),
+            (
+                "3 cloves",
+                Quantity(Fraction(3), Fraction(3), other_unit="clove"),
+            ),
+            ("2 large", Quantity(Fraction(2), Fraction(2), other_unit="large")),
+            ("a pinch", None),
+            ("3 - 2", None),
+            ("1/0 cup", None),
+        ]
+
+        for text, expected in test_cases:
+            self.assertEqual(Quantity.parse(text), expected, text)
+
+    def test_sum_combines_compatible_quantities(self) -> None:
+        test_cases: list[tuple[list[str], list[str]]] = [
+            (["3 cloves", "2 cloves", "1 clove"], ["6 cloves"]),
+            (["1 cup", "2 tbsp"], ["1 1/8 cups"]),
+            (["1/2 cup", "1/2 cup"], ["1 cup"]),
+            (["1 - 2", "3"], ["4 - 5"]),
+            (["1 lb", "8 oz"], ["1 1/2 pounds"]),
+            (["1 tsp", "1/2 tsp"], ["1 1/2 teaspoons"]),
+            (["1 large", "2 large"], ["3 large"]),
+            (["1 medium", "2 medium"], ["3 medium"]),
+        ]
+
+        for quantities, expected in test_cases:
+            self.assertEqual(Quantity.sum(quantities), expected, quantities)
+
+    def test_sum_keeps_incompatible_and_unparsed_quantities(self) -> None:
+        self.assertEqual(
+            Quantity.sum(["100 g", "1 oz", "a pinch", "1 kg", "2 tbsp", "a pinch"]),
+            ["1 1/10 kilograms", "1 oz", "a pinch", "2 tbsp", "a pinch"],
+        )
+        self.assertEqual(Quantity.sum(["1/0 cup", "1 cup"]), ["1/0 cup", "1 cup"])
+
+    def test_sum_leaves_single_quantities_as_written(self) -> None:
+        self.assertEqual(Quantity.sum(["2 Tbsp", "3"]), ["2 Tbsp", "3"])
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sous.cookbook import Cookbook
+from sous.document import Document
+from sous.recipe_cache import RecipeCache
+
+BROCCOLI = """# Roasted broccoli
+
+@author Lérè Williams
+
+{2} large [broccoli crowns], washed and trimmed
+% A comment
+
+Season with [garlic] and {}[black pepper].
+"""
+
+TOFU = """# Mapo tofu
+
+{1 block}[tofu]
+"""
+
+
+class TestRecipeCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "cookbook")
+        self.cache_directory = os.path.join(self.tmp.name, "cache")
+        os.makedirs(self.root)
+        self._write("broccoli.sous", BROCCOLI)
+        self._write("tofu.sous", TOFU)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _write(self, name: str, contents: str) -> str:
+        path = os.path.join(self.root, name)
+        with open(path, "w") as fh:
+            fh.write(contents)
+        return path
+
+    def _load(self) -> RecipeCache:
+        cache = RecipeCache(self.root, self.cache_directory)
+        for name in sorted(os.listdir(self.root)):
+            cache.recipe(os.path.join(self.root, name))
+        cache.save()
+        return cache
+
+    def test_cached_recipes_match_parsed_recipes(self) -> None:
+        self._load()
+        cache = RecipeCache(self.root, self.cache_directory)
+        path = os.path.join(self.root, "broccoli.sous")
+
+        recipe = cache.recipe(path)
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(recipe.document.paragraphs, Document(path).paragraphs)
+        self.assertEqual(recipe.name, "Roasted broccoli")
+        self.assertEqual(
+            [i.id for i in recipe.ingredients], ["broccoli crowns", "black pepper"]
+        )
+
+    def test_cached_recipes_honor_projections(self) -> None:
+        self._load()
+        cache = RecipeCache(self.root, self.cache_directory)
+        path = os.path.join(self.root, "broccoli.sous")
+
+        recipe = cache.recipe(path, Document.PROJECTION_NAME)
+
+        self.assertEqual(
+            recipe.document.paragraphs,
+            Document(path, projection=Document.PROJECTION_NAME).paragraphs,
+        )
+        self.assertEqual(len(recipe.ingredients), 2)
+
+    def test_names_are_read_without_unmarshaling_nodes(self) -> None:
+        self._load()
+        cache = RecipeCache(self.root, self.cache_directory)
+        path = os.path.join(self.root, "broccoli.sous")
+
+        with mock.patch("sous.recipe_cache.marshal.loads") as loads:
+            recipe = cache.recipe(path, Document.PROJECTION_NAME)
+            self.assertEqual(recipe.name, "Roasted broccoli")
+            loads.assert_not_called()
+
+        self.assertEqual(len(recipe.ingredients), 2)
+
+    def test_unreadable_cache_files_are_replaced(self) -> None:
+        self._load()
+        [stats] = RecipeCache.stats(self.cache_directory)
+        with open(stats["path"], "wb") as fh:
+            fh.write(b"not a cache")
+
+        cache = self._load()
+
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        self.assertFalse(RecipeCache.stats(self.cache_directory)[0]["stale"])
+
+    def test_changed_files_are_reparsed(self) -> None:
+        self._load()
+        path = self._write("tofu.sous", TOFU.replace("Mapo", "Braised"))
+        os.utime(path, ns=(0, 0))
+
+        cache = self._load()
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(
+            RecipeCache(self.root, self.cache_directory).recipe(path).name,
+            "Braised tofu",
+        )
+
+    def test_deleted_files_are_evicted(self) -> None:
+        self._load()
+        os.unlink(os.path.join(self.root, "tofu.sous"))
+        self._load()
+
+        [stats] = RecipeCache.stats(self.cache_directory)
+
+        self.assertEqual(stats["recipes"], 1)
+        self.assertEqual(stats["root"], os.path.abspath(self.root))
+
+    def test_parser_version_change_invalidates_cache(self) -> None:
+        self._load()
+        original_stamp = RecipeCache.STAMP
+        RecipeCache.STAMP = (-1, -1)
+        try:
+            cache = self._load()
+        finally:
+            RecipeCache.STAMP = original_stamp
+
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_cookbook_uses_cache(self) -> None:
+        uncached = Cookbook((self.root,), ())
+        Cookbook((self.root,), (), cache_directory=self.cache_directory)
+        cached = Cookbook((self.root,), (), cache_directory=self.cache_directory)
+
+        self.assertEqual(
+            [r.document.paragraphs for r in cached.recipes],
+            [r.document.paragraphs for r in uncached.recipes],
+        )
+        self.assertEqual(RecipeCache.clear(self.cache_directory), 1)
+        self.assertEqual(RecipeCache.stats(self.cache_directory), [])
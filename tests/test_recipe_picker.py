@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from sous.cookbook import Cookbook
+from sous.document import Document
+from sous.recipe import Recipe
+from sous.recipe_picker import RecentRecipes, RecipePicker
+from sous.search_index import SearchIndex
+
+
+def recipe(name: str) -> Recipe:
+    return Recipe(f"{name}.sous", document=Document.from_string(f"# {name}\n"))
+
+
+class TestRecipePicker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.recipes = [
+            recipe(name)
+            for name in ["Chana masala", "Chicken soup", "Fried rice", "Chickpea stew"]
+        ]
+        self.terms = [["chickpeas", "williams"], ["chicken", "onion"], ["rice"], []]
+        self.picker = RecipePicker(self.recipes, self.terms)
+
+    def names(self, query: str) -> list[str | None]:
+        return [recipe.name for recipe in self.picker.filter(query)]
+
+    def test_filters_by_name_and_terms(self) -> None:
+        self.assertEqual(self.names(""), [r.name for r in self.recipes])
+        self.assertEqual(self.names("soup"), ["Chicken soup"])
+        self.assertEqual(self.names("williams"), ["Chana masala"])
+        # Matching the name ranks above nearly matching it, and above matching
+        # an ingredient.
+        self.assertEqual(
+            self.names("chickp"), ["Chickpea stew", "Chicken soup", "Chana masala"]
+        )
+
+    def test_matches_misspellings_and_prefixes(self) -> None:
+        self.assertEqual(self.names("chiken"), ["Chicken soup"])
+        self.assertEqual(self.names("f"), ["Fried rice"])
+        self.assertEqual(self.names("fr ri"), ["Fried rice"])
+
+    def test_ranks_recently_picked_recipes_first(self) -> None:
+        self.picker.pick(self.recipes[3])
+        self.assertEqual(self.names("")[0], "Chickpea stew")
+        self.assertEqual(self.names("chic")[:2], ["Chickpea stew", "Chicken soup"])
+
+    def test_typing_matches_like_a_fresh_query(self) -> None:
+        for query in ["c", "ch", "chic", "chick pe", "chi", "rice fr", "r", ""]:
+            fresh = RecipePicker(self.recipes, self.terms)
+            self.assertEqual(self.picker.filter(query), fresh.filter(query))
+
+    def test_indexes_a_cookbook_in_the_background(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            root = os.path.join(directory, "cookbook")
+            os.makedirs(root)
+            with open(os.path.join(root, "stew.sous"), "w") as fh:
+                fh.write("# Chickpea stew\n\n@author Williams\n\n{1 can}[tomatoes]\n")
+            cookbook = Cookbook((root,), (), Document.PROJECTION_NAME)
+            index_path = os.path.join(directory, "cookbook.index")
+
+            picker = RecipePicker.for_cookbook(cookbook, None, index_path)
+            picker.wait()
+
+            self.assertEqual(
+                [r.name for r in picker.filter("tomat")], ["Chickpea stew"]
+            )
+            self.assertEqual(
+                [r.name for r in picker.filter("willi")], ["Chickpea stew"]
+            )
+            self.assertEqual(len(SearchIndex.load(index_path)), 1)
+
+    def test_remembers_recent_recipes(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recent.json")
+            recent = RecentRecipes(path)
+            for name in ["Soup", "Stew", "Soup"]:
+                recent.use(name)
+
+            self.assertEqual(RecentRecipes(path).names, ["Soup", "Stew"])
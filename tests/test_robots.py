@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+import urllib.error
+
+from sous.robots import DISALLOW_ALL, RobotsCache
+
+
+class TestRobotsCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fetched: list[str] = []
+        self.files = {
+            "https://a.example/robots.txt": "User-agent: *\nCrawl-delay: 2\n",
+            "https://private.example/robots.txt": DISALLOW_ALL,
+        }
+        self.errors = {
+            "https://down.example/robots.txt": urllib.error.HTTPError(
+                "https://down.example/robots.txt", 503, "Unavailable", None, None
+            ),
+            "https://gone.example/robots.txt": urllib.error.URLError(
+                "Name or service not known"
+            ),
+        }
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def source(self, robots_url: str) -> str:
+        self.fetched.append(robots_url)
+        if robots_url in self.errors:
+            raise self.errors[robots_url]
+        return self.files[robots_url]
+
+    def cache(self, **kwargs: object) -> RobotsCache:
+        return RobotsCache(self.tmp.name, source=self.source, **kwargs)  # type: ignore
+
+    def test_fetches_each_site_once(self) -> None:
+        cache = self.cache()
+
+        self.assertEqual(cache.parser_for("https://a.example/1").crawl_delay("*"), 2)
+        self.assertEqual(cache.parser_for("https://A.example/2").crawl_delay("*"), 2)
+        self.assertFalse(
+            cache.parser_for("https://private.example/1").can_fetch("*", "/1")
+        )
+        self.assertEqual(
+            self.fetched,
+            ["https://a.example/robots.txt", "https://private.example/robots.txt"],
+        )
+
+    def test_persists_files_until_they_expire(self) -> None:
+        self.cache().parser_for("https://a.example/1")
+        self.cache().parser_for("https://a.example/1")
+        self.assertEqual(len(self.fetched), 1)
+
+        self.cache(ttl=-1).parser_for("https://a.example/1")
+        self.assertEqual(len(self.fetched), 2)
+
+    def test_offline_mode_never_fetches(self) -> None:
+        self.cache().parser_for("https://a.example/1")
+
+        offline = self.cache(ttl=-1, offline=True)
+        self.assertEqual(offline.parser_for("https://a.example/1").crawl_delay("*"), 2)
+        self.assertTrue(offline.parser_for("https://b.example/1").can_fetch("*", "/"))
+        self.assertEqual(len(self.fetched), 1)
+
+    def test_unreachable_files_disallow_everything_and_are_retried(self) -> None:
+        cache = self.cache()
+
+        for url in ["https://down.example/1", "https://gone.example/1"]:
+            with self.subTest(url=url):
+                self.assertFalse(cache.parser_for(url).can_fetch("*", "/1"))
+                self.assertFalse(cache.parser_for(url).can_fetch("*", "/1"))
+
+        self.assertEqual(len(self.fetched), 4)
+        self.assertEqual(RobotsCache.clear(self.tmp.name), 0)
@@ -0,0 +1,142 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from sous.cookbook import Cookbook
+from sous.search_index import SearchIndex, SearchQueryError
+
+RECIPES = {
+    "hummus.sous": """# Hummus
+
+@author Lérè Williams
+
+{1 can}[chickpeas]
+{2 cloves}[garlic]
+{}[tahini]
+""",
+    "chana-masala.sous": """# Chana masala
+
+{1 can}[chickpeas]
+{3 cloves}[garlic]
+{}[cilantro], chopped
+
+Simmer until thick.
+""",
+    "broccoli.sous": """# Roasted broccoli
+
+{2}[broccoli crowns]
+{} extra virgin [olive oil | avocado oil]
+
+Season with {}[garlic] and roast.
+""",
+}
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "cookbook")
+        os.makedirs(self.root)
+        for name, contents in RECIPES.items():
+            self._write(name, contents)
+        self.cookbook = Cookbook((self.root,), ())
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _write(self, name: str, contents: str) -> None:
+        with open(os.path.join(self.root, name), "w") as fh:
+            fh.write(contents)
+
+    def _search(self, query: str) -> list[str]:
+        return sorted(str(recipe.name) for recipe in self.cookbook.search(query))
+
+    def test_boolean_queries(self) -> None:
+        test_cases = [
+            ("garlic", ["Chana masala", "Hummus", "Roasted broccoli"]),
+            ("chickpeas garlic", ["Chana masala", "Hummus"]),
+            ("chickpeas AND garlic -cilantro", ["Hummus"]),
+            ("chickpeas NOT i:cilantro", ["Hummus"]),
+            ("tahini OR broccoli", ["Hummus", "Roasted broccoli"]),
+            ("(tahini OR cilantro) garlic", ["Chana masala", "Hummus"]),
+            ("NOT garlic", []),
+        ]
+
+        for query, expected in test_cases:
+            with self.subTest(query=query):
+                self.assertEqual(self._search(query), expected)
+
+    def test_field_queries(self) -> None:
+        test_cases = [
+            ('ingredient:"avocado oil"', ["Roasted broccoli"]),
+            ("i:oil", []),
+            ("author:williams", ["Hummus"]),
+            ("name:masala", ["Chana masala"]),
+            ("name:garlic", []),
+            ("simmer", ["Chana masala"]),
+        ]
+
+        for query, expected in test_cases:
+            with self.subTest(query=query):
+                self.assertEqual(self._search(query), expected)
+
+    def test_prefix_queries(self) -> None:
+        self.assertEqual(self._search("chick*"), ["Chana masala", "Hummus"])
+        self.assertEqual(self._search("i:broc*"), ["Roasted broccoli"])
+        self.assertEqual(self._search("i:oil*"), [])
+
+    def test_invalid_queries(self) -> None:
+        for query in ["", "garlic OR", "(garlic", "garlic)", "AND"]:
+            with self.subTest(query=query):
+                with self.assertRaises(SearchQueryError):
+                    self.cookbook.search(query)
+
+    def test_index_follows_refresh(self) -> None:
+        self.assertEqual(self._search("tahini"), ["Hummus"])
+
+        self._write("hummus.sous", RECIPES["hummus.sous"].replace("tahini", "cumin"))
+        os.utime(os.path.join(self.root, "hummus.sous"), ns=(0, 0))
+        self._write("baba-ganoush.sous", "# Baba ganoush\n\n{}[tahini]\n")
+        self.cookbook.refresh()
+
+        self.assertEqual(self._search("tahini"), ["Baba ganoush"])
+        self.assertEqual(self._search("cumin"), ["Hummus"])
+
+    def test_search_waits_for_a_refresh_in_progress(self) -> None:
+        results: list[list[str]] = []
+        thread = threading.Thread(target=lambda: results.append(self._search("tahini")))
+
+        with self.cookbook._lock:
+            thread.start()
+            thread.join(timeout=0.1)
+            self.assertTrue(thread.is_alive())
+
+        thread.join()
+        self.assertEqual(results, [["Hummus"]])
+
+    def test_saved_index_is_reused(self) -> None:
+        path = os.path.join(self.tmp.name, "cookbook.index")
+        self.cookbook.search_index.save(path)
+
+        index = SearchIndex.load(path)
+        cookbook = Cookbook((self.root,), ())
+        cookbook.use_search_index(index)
+
+        self.assertIs(cookbook.search_index, index)
+        self.assertEqual(
+            sorted(str(r.name) for r in cookbook.search("chickpeas -cilantro")),
+            ["Hummus"],
+        )
+        self.assertEqual(len(SearchIndex.load(path + ".missing")), 0)
+
+    def test_unchanged_index_is_not_saved_again(self) -> None:
+        path = os.path.join(self.tmp.name, "cookbook.index")
+        self.cookbook.search_index.save(path)
+        os.utime(path, ns=(0, 0))
+
+        cookbook = Cookbook((self.root,), ())
+        cookbook.use_search_index(SearchIndex.load(path))
+        cookbook.search_index.save(path)
+
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
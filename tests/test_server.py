@@ -0,0 +1,156 @@
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any
+from unittest import mock
+
+from sous.cookbook import Cookbook
+from sous.server import CookbookServer
+from sous.shopping_list_config import ShoppingListConfig
+
+
+class TestCookbookServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cookbook_path = os.path.join(self.tmp.name, "cookbook")
+        os.makedirs(self.cookbook_path)
+        self.write("soup.sous", "# Soup\n\n{1}[onion]\n{2 cups}[stock]\n")
+        self.write("rice.sous", "# Fried rice\n\n{2 cups}[rice]\n{1/2}[onion]\n")
+
+        config_path = os.path.join(self.tmp.name, "config.toml")
+        with open(config_path, "w") as fh:
+            fh.write('[produce]\nitems = ["onion"]\n')
+
+        self.server = CookbookServer(
+            Cookbook((self.cookbook_path,), ()),
+            port=0,
+            config=ShoppingListConfig(config_path),
+            reload_interval=0.05,
+            quiet=True,
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def write(self, name: str, text: str) -> None:
+        with open(os.path.join(self.cookbook_path, name), "w") as fh:
+            fh.write(text)
+
+    def request(self, path: str, body: Any = None) -> tuple[int, Any]:  # noqa: ANN401
+        data = None if body is None else json.dumps(body).encode()
+        try:
+            with urllib.request.urlopen(self.server.url + path, data) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    def test_lists_and_fetches_recipes(self) -> None:
+        status, body = self.request("/recipes")
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            sorted(recipe["name"] for recipe in body["recipes"]),
+            ["Fried rice", "Soup"],
+        )
+
+        _, body = self.request("/recipes?q=i:stock")
+        self.assertEqual([recipe["name"] for recipe in body["recipes"]], ["Soup"])
+
+        status, body = self.request("/recipes/" + urllib.parse.quote("Fried rice"))
+        self.assertEqual(status, 200)
+        self.assertEqual(body["ingredients"][0]["id"], "rice")
+        self.assertEqual(body["paragraphs"][0][0]["type"], "header")
+
+        status, body = self.request("/recipes/Stew")
+        self.assertEqual((status, body["error"]), (404, "Unknown recipe 'Stew'"))
+
+    def test_builds_shopping_lists(self) -> None:
+        status, body = self.request(
+            "/shopping-list",
+            {"recipes": ["Soup", {"name": "Fried rice", "ingredients": ["onion"]}]},
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            body["text"], "[produce]\nonion (1 1/2)\n\n[other]\nstock (2 cups)"
+        )
+
+        status, body = self.request("/shopping-list", {"recipes": ["Stew"]})
+        self.assertEqual(status, 404)
+        status, body = self.request("/shopping-list", {"format": "long"})
+        self.assertEqual(status, 400)
+
+    def test_rejects_malformed_shopping_list_requests(self) -> None:
+        for selection in [
+            {"name": ["Soup"]},
+            {"name": "Soup", "ingredients": 5},
+            {"name": "Soup", "ingredients": "onion"},
+            {"name": "Soup", "ingredients": [["onion"]]},
+        ]:
+            with self.subTest(selection=selection):
+                status, _ = self.request("/shopping-list", {"recipes": [selection]})
+                self.assertEqual(status, 400)
+
+        host, port = self.server.server_address[:2]
+        for length in ["many", "-1"]:
+            with self.subTest(length=length):
+                connection = http.client.HTTPConnection(str(host), port, timeout=5)
+                connection.putrequest("POST", "/shopping-list")
+                connection.putheader("Content-Length", length)
+                connection.endheaders()
+                self.assertEqual(connection.getresponse().status, 400)
+                connection.close()
+
+        _, body = self.request("/metrics")
+        self.assertEqual(body["routes"]["POST /shopping-list"]["errors"], 0)
+
+    def test_reloads_changed_recipes(self) -> None:
+        self.write("stew.sous", "# Stew\n\n{1}[onion]\n")
+        for _ in range(100):
+            _, body = self.request("/health")
+            if body["recipes"] == 3:
+                break
+            time.sleep(0.05)
+        self.assertEqual(body, {"status": "ok", "recipes": 3})
+
+    def test_reports_failed_reloads(self) -> None:
+        error = OSError("Stale file handle")
+        with (
+            self.assertLogs("sous.cookbook", level="ERROR"),
+            mock.patch.object(self.server.cookbook, "refresh", side_effect=error),
+        ):
+            for _ in range(100):
+                _, body = self.request("/health")
+                if body["status"] != "ok":
+                    break
+                time.sleep(0.05)
+
+        self.assertEqual(
+            body,
+            {
+                "status": "reload failed",
+                "recipes": 2,
+                "last_error": "OSError: Stale file handle",
+            },
+        )
+
+    def test_reports_latency_percentiles(self) -> None:
+        for _ in range(3):
+            self.request("/recipes")
+        self.request("/nowhere")
+
+        _, body = self.request("/metrics")
+        self.assertEqual(body["recipes"], 2)
+        self.assertEqual(body["routes"]["GET /recipes"]["requests"], 3)
+        self.assertGreater(body["routes"]["GET /recipes"]["p99_ms"], 0)
+        self.assertEqual(body["routes"]["GET (unknown)"]["requests"], 1)
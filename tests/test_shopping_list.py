@@ -2,7 +2,10 @@ import os
 import tempfile
 import unittest
 
+from sous.document import Document
 from sous.ingredient import Ingredient
+from sous.meal_plan import MealPlan
+from sous.recipe import Recipe
 from sous.shopping_list import ShoppingList
 from sous.shopping_list_config import ShoppingListConfig
 
@@ -103,6 +106,39 @@ items = ["potatoes", "onions"]
         # uncategorized items come last
         self.assertLess(config.sort_key("milk"), config.sort_key("garlic"))
 
+    def test_matches_aliases_and_plurals(self) -> None:
+        toml_content = b"""
+[produce]
+items = ["Broccoli crowns", "scallions", "potatoes", "cherries"]
+aliases = ["green onions"]
+
+[dairy]
+items = ["eggs", "scallion", "cheese"]
+
+[baking]
+items = ["cookies", "brownie"]
+"""
+        with tempfile.NamedTemporaryFile(suffix=".toml", delete=False) as f:
+            f.write(toml_content)
+            f.flush()
+
+            config = ShoppingListConfig(f.name)
+
+        os.unlink(f.name)
+
+        self.assertEqual(config.category_for("broccoli crown"), "produce")
+        self.assertEqual(config.category_for("broccoli  Crowns"), "produce")
+        self.assertEqual(config.category_for("green onion"), "produce")
+        self.assertEqual(config.category_for("potato"), "produce")
+        self.assertEqual(config.category_for("cherry"), "produce")
+        self.assertEqual(config.category_for("cheeses"), "dairy")
+        self.assertEqual(config.category_for("cookie"), "baking")
+        self.assertEqual(config.category_for("brownies"), "baking")
+        self.assertEqual(config.category_for("egg"), "dairy")
+        # The first category to list a name wins.
+        self.assertEqual(config.category_for("scallion"), "produce")
+        self.assertEqual(config.classify("garlic"), (3, None))
+
 
 class TestShoppingListGroupedFormat(unittest.TestCase):
     def _make_config(self, toml_content: bytes) -> ShoppingListConfig:
@@ -198,3 +234,115 @@ items = ["milk"]
             "garlic (3 cloves)",
             "olive oil",
         ])
+
+
+class TestShoppingListFromPlan(unittest.TestCase):
+    def setUp(self) -> None:
+        self.recipes_by_name = {
+            "Chana masala": Recipe(
+                "chana.sous",
+                document=Document.from_string(
+                    "# Chana masala\n\n"
+                    "{1 can}[chickpeas]\n{}[Kosher salt]\n{}[cilantro]\n"
+                ),
+            ),
+            "Fried rice": Recipe(
+                "rice.sous",
+                document=Document.from_string(
+                    "# Fried rice\n\n{2 cups}[rice]\n{2}[eggs]\n{}[kosher salt]\n"
+                ),
+            ),
+        }
+
+    def _make_plan(self, toml_content: bytes) -> MealPlan:
+        with tempfile.NamedTemporaryFile(suffix=".toml", delete=False) as f:
+            f.write(toml_content)
+            f.flush()
+        try:
+            return MealPlan(f.name)
+        finally:
+            os.unlink(f.name)
+
+    def test_selects_ingredients_from_plan(self) -> None:
+        plan = self._make_plan(b"""
+exclude = ["kosher salt"]
+
+[[recipe]]
+name = "Chana masala"
+exclude = ["Cilantro"]
+
+[[recipe]]
+name = "Fried rice"
+include = ["rice", "kosher salt"]
+""")
+
+        shopping_list = ShoppingList.from_plan(
+            plan, self.recipes_by_name, ShoppingList.FORMAT_EXPANDED
+        )
+
+        self.assertEqual(shopping_list._format(), [
+            "chickpeas (1 can)",
+            "rice (2 cups)",
+        ])
+
+    def test_to_dict_lists_items_in_order(self) -> None:
+        plan = self._make_plan(b"""
+[[recipe]]
+name = "Fried rice"
+""")
+
+        shopping_list = ShoppingList.from_plan(
+            plan, self.recipes_by_name, ShoppingList.FORMAT_COMPACT
+        )
+
+        self.assertEqual(shopping_list.to_dict()["items"], [
+            {"name": "eggs", "quantities": ["2"], "totals": ["2"], "category": None},
+            {"name": "kosher salt", "quantities": [], "totals": [], "category": None},
+            {
+                "name": "rice",
+                "quantities": ["2 cups"],
+                "totals": ["2 cups"],
+                "category": None,
+            },
+        ])
+
+    def test_rejects_unknown_recipes_and_ingredients(self) -> None:
+        for toml_content in [
+            b'[[recipe]]\nname = "Pad thai"\n',
+            b'[[recipe]]\nname = "Fried rice"\ninclude = ["tofu"]\n',
+        ]:
+            plan = self._make_plan(toml_content)
+            with self.assertRaises(ValueError):
+                ShoppingList.from_plan(
+                    plan, self.recipes_by_name, ShoppingList.FORMAT_EXPANDED
+                )
+
+    def test_rejects_invalid_plans(self) -> None:
+        for toml_content in [
+            b"",
+            b"[[recipe]]\n",
+            b'[[recipe]]\nname = "Fried rice"\ninclude = "rice"\n',
+            b'recipe = ["Fried rice"]\n',
+        ]:
+            with self.assertRaises(ValueError):
+                self._make_plan(toml_content)
+
+
+class TestShoppingListQuantities(unittest.TestCase):
+    def test_expanded_format_sums_compatible_quantities(self) -> None:
+        ingredients = [
+            Ingredient(id="garlic", quantity="3 cloves"),
+            Ingredient(id="garlic", quantity="1 clove"),
+            Ingredient(id="olive oil", quantity="1/4 cup"),
+            Ingredient(id="olive oil", quantity="2 tablespoons"),
+            Ingredient(id="olive oil", quantity="a drizzle"),
+        ]
+
+        expanded = ShoppingList(ingredients, ShoppingList.FORMAT_EXPANDED)
+        compact = ShoppingList(ingredients, ShoppingList.FORMAT_COMPACT)
+
+        self.assertEqual(expanded._format(), [
+            "garlic (4 cloves)",
+            "olive oil (6 tablespoons, a drizzle)",
+        ])
+        self.assertEqual(compact._format(), ["garlic (2)", "olive oil (3)"])
@@ -0,0 +1,72 @@
+import unittest
+
+from sous.document import Document
+from sous.recipe import Recipe
+from sous.shopping_list import ShoppingList
+from sous.shopping_list_aggregator import ShoppingListAggregator
+
+
+def recipe(text: str) -> Recipe:
+    return Recipe("recipe.sous", document=Document.from_string(text))
+
+
+CHANA_MASALA = recipe(
+    "# Chana masala\n\n{1 can}[chickpeas]\n{1}[onion]\n{}[salt]\n\n"
+    "Stir in {1 tsp}[salt] to taste.\n"
+)
+FRIED_RICE = recipe("# Fried rice\n\n{2 cups}[rice]\n{1/2}[onion]\n{}[salt]\n")
+
+
+class TestShoppingListAggregator(unittest.TestCase):
+    def format(self, aggregator: ShoppingListAggregator) -> list[str]:
+        return aggregator.snapshot(ShoppingList.FORMAT_EXPANDED)._format()
+
+    def test_matches_a_list_built_all_at_once(self) -> None:
+        aggregator = ShoppingListAggregator()
+        aggregator.add_recipe(CHANA_MASALA)
+        aggregator.add_recipe(FRIED_RICE, ["rice", "onion"])
+
+        ingredients = CHANA_MASALA.ingredients + FRIED_RICE.ingredients[:2]
+        self.assertEqual(
+            self.format(aggregator),
+            ShoppingList(ingredients, ShoppingList.FORMAT_EXPANDED)._format(),
+        )
+        self.assertEqual(aggregator.uses("onion"), 2)
+        self.assertEqual(aggregator.uses("salt"), 1)
+
+    def test_removes_recipes_and_toggles_ingredients(self) -> None:
+        aggregator = ShoppingListAggregator()
+        aggregator.add_recipe(CHANA_MASALA)
+        aggregator.add_recipe(FRIED_RICE)
+        self.format(aggregator)
+
+        aggregator.remove_recipe("Chana masala")
+        self.assertEqual(aggregator.recipes, ["Fried rice"])
+        self.assertEqual(
+            self.format(aggregator), ["onion (1/2)", "rice (2 cups)", "salt"]
+        )
+
+        self.assertFalse(aggregator.toggle_ingredient("Fried rice", "onion"))
+        self.assertEqual(aggregator.selected("Fried rice"), ["rice", "salt"])
+        self.assertEqual(self.format(aggregator), ["rice (2 cups)", "salt"])
+
+        self.assertTrue(aggregator.toggle_ingredient("Fried rice", "onion"))
+        self.assertIn("onion (1/2)", self.format(aggregator))
+
+    def test_adding_a_recipe_again_replaces_it(self) -> None:
+        aggregator = ShoppingListAggregator()
+        aggregator.add_recipe(FRIED_RICE)
+        aggregator.add_recipe(FRIED_RICE, ["rice"])
+
+        self.assertEqual(self.format(aggregator), ["rice (2 cups)"])
+
+    def test_rejects_unknown_recipes_and_ingredients(self) -> None:
+        aggregator = ShoppingListAggregator()
+        with self.assertRaisesRegex(ValueError, "Unknown ingredient 'tofu'"):
+            aggregator.add_recipe(FRIED_RICE, ["tofu"])
+        with self.assertRaisesRegex(ValueError, "isn't selected"):
+            aggregator.remove_recipe("Fried rice")
+
+        aggregator.add_recipe(FRIED_RICE)
+        with self.assertRaisesRegex(ValueError, "Unknown ingredient 'tofu'"):
+            aggregator.toggle_ingredient("Fried rice", "tofu")
@@ -0,0 +1,63 @@
+import json
+import os
+import re
+import tempfile
+import types
+import unittest
+
+from sous.document import Document
+from sous.timings import REGEX_CALLS_COUNTER, Timings
+
+TEXT = "# Soup\n\n@serves 2\n\n- {1 cup}[water]\n- {1}[onion]\n\nSimmer.\n"
+
+
+class TestTimings(unittest.TestCase):
+    def tearDown(self) -> None:
+        Timings.disable()
+
+    def test_records_nothing_when_disabled(self) -> None:
+        Timings.disable()
+        Timings.spans = []
+        Timings.counters.clear()
+
+        with Timings.span("parse"):
+            Timings.count("files")
+        _ = Document.from_string(TEXT).paragraphs
+
+        self.assertEqual(Timings.spans, [])
+        self.assertEqual(Timings.counters, {})
+
+    def test_records_spans_and_counters(self) -> None:
+        module = types.ModuleType("patterns")
+        module.WORD_RE = re.compile(r"\w+")  # type: ignore[attr-defined]
+        Timings.enable((module,))
+
+        with Timings.span("parse"):
+            _ = Document.from_string(TEXT).paragraphs
+            module.WORD_RE.findall("a b")  # type: ignore[attr-defined]
+
+        self.assertEqual([span.name for span in Timings.spans], ["parse"])
+        self.assertEqual(Timings.counters["lines"], 8)
+        self.assertEqual(Timings.counters["Header nodes"], 1)
+        self.assertEqual(Timings.counters["Attribute nodes"], 1)
+        self.assertEqual(Timings.counters[REGEX_CALLS_COUNTER], 1)
+
+        summary = Timings.summary()
+        self.assertRegex(summary, r"parse\s+1\s")
+        self.assertRegex(summary, r"Prose nodes\s+3")
+
+    def test_writes_chrome_traces(self) -> None:
+        Timings.enable()
+        with Timings.span("walk"):
+            Timings.count("files", 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            Timings.write_trace(path)
+            with open(path) as fh:
+                trace = json.load(fh)
+
+        spans, counters = trace["traceEvents"]
+        self.assertEqual((spans["name"], spans["ph"], spans["tid"]), ("walk", "X", 0))
+        self.assertGreaterEqual(spans["dur"], 0)
+        self.assertEqual((counters["ph"], counters["args"]), ("C", {"files": 2}))